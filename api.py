@@ -4,22 +4,31 @@ Flask API Backend for Causal Chat Analysis
 Provides endpoints for dashboard frontend
 """
 
-from flask import Flask, render_template, jsonify, request # type: ignore
+from flask import Flask, render_template, jsonify, request, make_response # type: ignore
 from flask_cors import CORS # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import hashlib
+import os
 import sys
 import json
 from pathlib import Path
 import logging
+import threading
 import traceback
 
+import numpy as np
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
     from src.load_data import load_transcripts
     from src.preprocess import preprocess_transcripts, label_outcome
-    from src.signal_extraction import extract_signals, extract_all_signals, get_signal_confidence
+    from src.signal_extraction import extract_signals, extract_all_signals, get_signal_confidence, get_turn_signals
     from src.causal_analysis import analyze_causes
+    from src.transcript_store import open_transcript_store
+    from src.transcript_index import TranscriptIndex, InvalidCursor, DEFAULT_LISTING_FIELDS, LISTING_FIELDS, decode_cursor, encode_cursor
     from src.early_warning import detect_early_warning, detect_multi_signal_warning, analyze_escalation_risk
     from src.config import SIGNAL_CONFIG, EARLY_WARNING_CONFIG
 except ImportError as e:
@@ -41,6 +50,18 @@ except ImportError:
     HAS_CAUSAL_MODULES = False
     print("Info: Causal modules not available - using fallback")
 
+try:
+    from src.bitmap_index import build_transcript_bitmaps, build_turn_bitmaps
+    from src.corpus_aggregates import compute_corpus_aggregates
+    from src.signal_batch import annotate_turns
+    from src.signal_cache import dataset_fingerprint, load_or_compute_signals, signal_config_hashes
+    from src.similarity_index import SimilarityIndex
+    from src.snapshot import open_snapshot
+    HAS_SIGNAL_CACHE = True
+except ImportError:
+    HAS_SIGNAL_CACHE = False
+    print("Info: Signal cache not available - signals extracted per request")
+
 # Fallback functions if imports fail
 def extract_signals_fallback(turn):
     """Fallback signal extraction based on keywords"""
@@ -68,6 +89,41 @@ except NameError:
     extract_signals = extract_signals_fallback
     print("Using fallback extract_signals function")
 
+try:
+    get_turn_signals
+except NameError:
+    get_turn_signals = extract_signals
+
+from src.explanation_cache import ExplanationCache
+from src.response_cache import CachedResponse, cache_key, make_etag, open_response_cache
+
+# Dataset location (the signal cache is stored next to it)
+DATASET_PATH = os.getenv('DATASET_PATH', 'data/Conversational_Transcript_Dataset.json')
+
+# Causal chains are counted on CHAIN_WORKERS processes when > 1
+# (CHAIN_CHUNK_SIZE transcripts per task); the result matches the serial count
+CHAIN_WORKERS = int(os.getenv('CHAIN_WORKERS', '1'))
+CHAIN_CHUNK_SIZE = int(os.getenv('CHAIN_CHUNK_SIZE', '500'))
+
+# Explanations are cached per transcript and chain_stats version in one cache
+# that every rebuilt query engine reuses, so view counts survive a rebuild and
+# the EXPLAIN_WARM_TOP_N most-viewed transcripts are recomputed afterwards
+EXPLAIN_CACHE_SIZE = int(os.getenv('EXPLAIN_CACHE_SIZE', '1024'))
+EXPLAIN_WARM_TOP_N = int(os.getenv('EXPLAIN_WARM_TOP_N', '100'))
+_explanation_cache = ExplanationCache(EXPLAIN_CACHE_SIZE)
+
+# Encoded responses of read-only endpoints, per dataset version.
+# RESPONSE_CACHE_BACKEND=sqlite shares them between gunicorn workers.
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', '64'))
+_response_cache = open_response_cache(
+    RESPONSE_CACHE_BACKEND, DATASET_PATH,
+    path=os.getenv('RESPONSE_CACHE_PATH'),
+    max_entries=RESPONSE_CACHE_SIZE,
+    max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024
+)
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -86,55 +142,143 @@ _cache = {
     'query_engine': None,
     'session_manager': None,
     'load_error': None,
-    'loading': False,  # Flag to prevent concurrent loading
+    'snapshot': None,
+    'store': None,
+    'first_turn_index': None,
+    'transcript_index': None,  # Sorted attribute indexes for listings
+    'transcript_bitmaps': None,  # Attribute/signal bitmaps over transcript ranks
+    'turn_bitmaps': None,  # Outcome/speaker/signal bitmaps over turn rows
+    'similarity_index': None,  # Sparse signal-pattern vectors behind /api/similar
+    'aggregates': None,  # Exact corpus-wide signal/warning counts
+    'dataset_version': None,  # Keys the response cache; changes on data/config change
+    'loading': False,  # Flag to indicate a load is in progress
     'loaded': False    # Flag to indicate data is ready
 }
 
-def load_data_with_timeout():
-    """Load data with timeout handling"""
-    if _cache['loaded']:
-        return _cache['transcripts'] or [], _cache['processed'] or []
+# Single-flight loading: one thread builds the data, every other caller
+# waits on _data_ready (set once turns, signals and the engine are built)
+_load_lock = threading.Lock()
+_data_ready = threading.Event()
+_loader_lock = threading.Lock()
+_loader_thread = None
+
+# Seconds a request waits for warm-up before getting a 503
+DATA_WAIT_TIMEOUT = float(os.getenv('DATA_WAIT_TIMEOUT', '2'))
+# Retry-After hint (seconds) sent with 503 responses during warm-up
+RETRY_AFTER_SECONDS = int(os.getenv('RETRY_AFTER_SECONDS', '5'))
+
+
+class DataNotReady(Exception):
+    """
+    Raised when the data cannot serve requests (answered with a 503)
     
-    if _cache['loading']:
-        # Already loading, return empty to avoid blocking
-        return [], []
+    loading is True while a load is still running (the response then
+    carries Retry-After) and False when the load finished unusable.
+    """
     
-    _cache['loading'] = True
+    def __init__(self, message, loading=True):
+        super().__init__(message)
+        self.loading = loading
+
+
+def _build_data():
+    """Build every cached structure; only ever runs in one thread"""
     try:
         logger.info("Loading transcripts...")
-        _cache['transcripts'] = load_transcripts()
+        # Prefer the memory-mapped snapshot; the JSON file is the fallback
+        snapshot = open_snapshot(DATASET_PATH) if HAS_SIGNAL_CACHE else None
+        if snapshot is not None:
+            logger.info(f"Using dataset snapshot {snapshot.directory}")
+            _cache['snapshot'] = snapshot
+            _cache['transcripts'] = snapshot.transcripts
+        else:
+            _cache['transcripts'] = load_transcripts(DATASET_PATH)
         
         if not _cache['transcripts']:
             _cache['transcripts'] = []
             _cache['processed'] = []
             logger.warning("No transcripts loaded - using empty data")
-            _cache['loaded'] = True
-            return [], []
+            return
         
         logger.info(f"Loaded {len(_cache['transcripts'])} transcripts")
         
+        # On-demand transcript lookup for detail pages
+        try:
+            _cache['store'] = open_transcript_store(DATASET_PATH, snapshot)
+        except Exception as e:
+            logger.warning(f"Could not open transcript store: {e}")
+        
+        # Secondary indexes behind /api/escalated and /api/resolved
+        try:
+            if snapshot is not None:
+                _cache['transcript_index'] = TranscriptIndex.from_snapshot(snapshot)
+            else:
+                _cache['transcript_index'] = TranscriptIndex.from_transcripts(_cache['transcripts'])
+        except Exception as e:
+            logger.warning(f"Could not build transcript index: {e}")
+        
         logger.info("Preprocessing data...")
-        _cache['processed'] = preprocess_transcripts(_cache['transcripts'])
+        if snapshot is not None:
+            _cache['processed'] = snapshot.turn_table
+        else:
+            _cache['processed'] = preprocess_transcripts(_cache['transcripts'])
         logger.info(f"Preprocessed {len(_cache['processed'])} conversations")
         
+        fingerprint = None
+        if HAS_SIGNAL_CACHE:
+            fingerprint = snapshot.source_sha256 if snapshot is not None else dataset_fingerprint(DATASET_PATH)
+        
+        # Per-turn signal column, persisted next to the dataset
+        if HAS_SIGNAL_CACHE:
+            try:
+                logger.info("Loading signal column...")
+                _cache['signals'] = load_or_compute_signals(
+                    _cache['processed'], DATASET_PATH, fingerprint=fingerprint
+                )
+                annotate_turns(_cache['processed'], _cache['signals'])
+            except Exception as e:
+                logger.warning(f"Could not build signal column: {e}")
+        
+        build_similarity_index()
+        
         # Only initialize causal modules if available
         if HAS_CAUSAL_MODULES:
             try:
                 logger.info("Computing causal chains...")
                 _cache['detector'] = CausalChainDetector()
-                _cache['detector'].compute_chain_statistics(_cache['transcripts'], _cache['processed'])
+                if snapshot is not None:
+                    # Columnar: signal sequences come from the turn table,
+                    # no snapshot transcript is decoded
+                    _cache['detector'].compute_chain_statistics_from_table(snapshot.turn_table)
+                elif CHAIN_WORKERS > 1:
+                    _cache['detector'].compute_chain_statistics_parallel(
+                        _cache['transcripts'], _cache['processed'],
+                        workers=CHAIN_WORKERS, chunk_size=CHAIN_CHUNK_SIZE
+                    )
+                else:
+                    _cache['detector'].compute_chain_statistics(_cache['transcripts'], _cache['processed'])
                 logger.info(f"Found {len(_cache['detector'].chain_stats)} causal chains")
                 
-                transcripts_dict = {t["transcript_id"]: t for t in _cache['transcripts']}
-                _cache['query_engine'] = CausalQueryEngine(_cache['detector'], transcripts_dict, _cache['processed'])
+                if snapshot is not None and _cache['store'] is not None:
+                    # Lazy lookups keep snapshot transcripts out of memory
+                    transcripts_by_id = _cache['store']
+                else:
+                    transcripts_by_id = {t["transcript_id"]: t for t in _cache['transcripts']}
+                _cache['query_engine'] = CausalQueryEngine(_cache['detector'], transcripts_by_id, _cache['processed'],
+                                                           similarity_index=_cache['similarity_index'],
+                                                           explanation_cache=_explanation_cache)
                 logger.info("Initialized query engine")
+                # A no-op on the first load, when nothing has been viewed yet
+                computed = _cache['query_engine'].warm_explanations(top_n=EXPLAIN_WARM_TOP_N)
+                logger.info(f"Warmed {computed} explanations")
                 
                 _cache['session_manager'] = SessionManager()
             except Exception as e:
                 logger.warning(f"Could not initialize causal modules: {e}")
         
-        _cache['loaded'] = True
-        return _cache['transcripts'], _cache['processed']
+        build_bitmap_indexes()
+        materialize_aggregates()
+        _cache['dataset_version'] = compute_dataset_version(fingerprint)
         
     except Exception as e:
         logger.error(f"Error loading data: {str(e)}")
@@ -142,456 +286,626 @@ def load_data_with_timeout():
         _cache['load_error'] = str(e)
         _cache['transcripts'] = []
         _cache['processed'] = []
-        _cache['loaded'] = True
-        return [], []
+
+def compute_dataset_version(fingerprint=None):
+    """
+    Identifier of the loaded data, used to key cached responses.
+    
+    Derived from the dataset contents and the signal configuration, so it
+    is the same in every worker and changes whenever either changes.
+    """
+    if fingerprint is not None:
+        payload = json.dumps({'dataset': fingerprint, 'signals': signal_config_hashes()}, sort_keys=True)
+    else:
+        stat = os.stat(DATASET_PATH)
+        payload = f"{os.path.abspath(DATASET_PATH)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+def build_bitmap_indexes():
+    """Build the transcript- and turn-level bitmap indexes after each (re)load"""
+    if not HAS_SIGNAL_CACHE:
+        return
+    try:
+        processed = _cache['processed'] or []
+        _cache['turn_bitmaps'] = build_turn_bitmaps(processed, _cache['signals'])
+        if _cache['transcript_index'] is not None:
+            _cache['transcript_bitmaps'] = build_transcript_bitmaps(
+                _cache['transcript_index'], processed, _cache['signals']
+            )
+    except Exception as e:
+        logger.warning(f"Could not build bitmap indexes: {e}")
+
+def build_similarity_index():
+    """Build the transcript similarity index from the signal column"""
+    if not HAS_SIGNAL_CACHE or _cache['signals'] is None:
+        return
+    try:
+        logger.info("Building similarity index...")
+        _cache['similarity_index'] = SimilarityIndex.build(_cache['processed'], _cache['signals'])
+        logger.info(f"Indexed {len(_cache['similarity_index'])} transcripts for similarity search")
+    except Exception as e:
+        logger.warning(f"Could not build similarity index: {e}")
+
+def materialize_aggregates():
+    """
+    Compute exact corpus-wide signal and warning counts.
+    
+    Runs once after every (re)load so /api/signals and /api/warnings
+    answer from memory instead of scanning (or sampling) turns per request.
+    """
+    processed = _cache['processed'] or []
+    logger.info("Materializing corpus aggregates...")
+    try:
+        if HAS_SIGNAL_CACHE:
+            aggregates = compute_corpus_aggregates(processed, _cache['signals'])
+        else:
+            aggregates = _aggregates_from_detectors(processed)
+    except Exception as e:
+        logger.warning(f"Could not materialize corpus aggregates: {e}")
+        aggregates = None
+    _cache['aggregates'] = aggregates
+    return aggregates
+
+def _aggregates_from_detectors(processed):
+    """Same counts as compute_corpus_aggregates, via the early_warning detectors"""
+    by_type = {'customer_frustration': 0, 'agent_delay': 0, 'agent_denial': 0}
+    turns_with_signals = 0
+    for turn in processed:
+        signals = get_turn_signals(turn)
+        turns_with_signals += bool(signals)
+        for signal in signals:
+            by_type[signal] = by_type.get(signal, 0) + 1
+    
+    multi = detect_multi_signal_warning(processed)
+    risk = analyze_escalation_risk(processed)
+    return {
+        'total_signals': sum(by_type.values()),
+        'by_type': by_type,
+        'turns_with_signals': turns_with_signals,
+        'single_signal_warnings': len(detect_early_warning(processed)),
+        'multi_signal_warnings': len({w['transcript_id'] for w in multi}),
+        'multi_signal_warning_turns': len(multi),
+        'high_risk_conversations': sum(1 for windows in risk.values()
+                                       if any(w['risk_score'] > 0.7 for w in windows)),
+        'total_transcripts': len({turn['transcript_id'] for turn in processed}),
+        'total_turns': len(processed)
+    }
+
+def get_aggregates():
+    """Materialized aggregates, computing them if the last attempt failed"""
+    return _cache['aggregates'] or materialize_aggregates()
+
+def load_data_with_timeout(timeout=None):
+    """
+    Single-flight, thread-safe data loading.
+    
+    The first caller builds the data; concurrent callers wait for that
+    load instead of starting their own or seeing half-built data.
+    
+    Args:
+        timeout (float): Seconds to wait for a load running in another
+            thread (None waits until it finishes)
+    
+    Returns:
+        tuple: (transcripts, processed)
+    
+    Raises:
+        DataNotReady: If the data is still loading after timeout
+    """
+    if not _data_ready.is_set():
+        if _load_lock.acquire(blocking=False):
+            try:
+                if not _data_ready.is_set():
+                    _cache['loading'] = True
+                    _build_data()
+                    _cache['loaded'] = True
+                    _data_ready.set()
+            finally:
+                _cache['loading'] = False
+                _load_lock.release()
+        elif not _data_ready.wait(timeout):
+            raise DataNotReady("Data is still loading")
+    
+    return _cache['transcripts'] or [], _cache['processed'] or []
+
+def start_background_load():
+    """Start loading data in a daemon thread, at most once per process"""
+    global _loader_thread
+    
+    def load_data_background():
+        logger.info("Background: Starting data loading...")
+        try:
+            load_data()
+            logger.info("Background: Data loading complete")
+        except Exception as e:
+            logger.error(f"Background data loading failed: {e}")
+    
+    with _loader_lock:
+        if _data_ready.is_set() or _loader_thread is not None:
+            return
+        # Load data in background thread to prevent blocking startup
+        _loader_thread = threading.Thread(target=load_data_background, daemon=True)
+        _loader_thread.start()
+
+def data_not_ready_reason():
+    """Why the data cannot serve requests yet, or None once it can"""
+    if not _data_ready.is_set():
+        return 'Data is loading, retry shortly'
+    if _cache['load_error']:
+        return f"Data failed to load: {_cache['load_error']}"
+    if not _cache['transcripts']:
+        return 'No transcripts loaded'
+    if _cache['query_engine'] is None:
+        return 'Causal query engine is not available'
+    return None
+
+def is_data_ready():
+    """True once all data (including the query engine) loaded without error"""
+    return data_not_ready_reason() is None
+
+def preload_shared_data():
+    """
+    Build all data once in the gunicorn master before workers fork.
+    
+    With preload_app, workers inherit the loaded transcripts, processed
+    turns, detector and query engine copy-on-write. The garbage collector
+    is paused while loading and everything loaded is then moved to the
+    permanent generation (gc.freeze), so collections in the workers do
+    not touch - and therefore copy - the shared pages. Workers re-enable
+    the collector after forking (see gunicorn_config.post_fork).
+    """
+    import gc
+    
+    gc.disable()
+    try:
+        load_data()
     finally:
-        _cache['loading'] = False
+        gc.freeze()
+    
+    from src.utils import get_process_memory
+    logger.info(f"Preloaded shared data in master: {get_process_memory()}")
 
 def load_data():
-    """Load and cache all data with robust error handling"""
-    # Return cached data if available
-    if _cache['loaded']:
-        return _cache['transcripts'] or [], _cache['processed'] or []
-    
-    # Load data if not already loading
+    """Load and cache all data, blocking until it is ready"""
     return load_data_with_timeout()
 
+# Endpoints served without waiting for the data
+NO_DATA_ENDPOINTS = {'static', 'index', 'analyze_page', 'analyze_user_transcript', 'health', 'ready'}
+
+@app.before_request
+def require_data_ready():
+    """
+    Gate data-backed API routes on readiness.
+    
+    During warm-up a request waits up to DATA_WAIT_TIMEOUT seconds for the
+    load, then gets a 503 with Retry-After instead of placeholder numbers.
+    A load that failed, found no transcripts or left the causal engine
+    unbuilt also answers 503.
+    
+    Raises:
+        DataNotReady: Turned into the 503 by handle_data_not_ready
+    """
+    if not request.path.startswith('/api/') or request.endpoint in NO_DATA_ENDPOINTS:
+        return None
+    
+    if not _data_ready.is_set():
+        start_background_load()
+        if not _data_ready.wait(DATA_WAIT_TIMEOUT):
+            raise DataNotReady('Data is loading, retry shortly')
+    
+    reason = data_not_ready_reason()
+    if reason:
+        raise DataNotReady(reason, loading=False)
+    return None
+
+@app.errorhandler(DataNotReady)
+def handle_data_not_ready(error):
+    """503 for requests that arrive before the data can serve them"""
+    response = jsonify({'success': False, 'error': str(error)})
+    response.status_code = 503
+    if error.loading:
+        response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+    return response
+
+def find_processed_turn(transcript_id):
+    """First processed turn of a transcript without scanning all turns"""
+    processed = _cache['processed'] or []
+    
+    # Columnar turns know each transcript's row range
+    if hasattr(processed, 'transcript_rows'):
+        rows = processed.transcript_rows(transcript_id)
+        return rows[0] if rows else None
+    
+    if _cache['first_turn_index'] is None:
+        index = {}
+        for position, turn in enumerate(processed):
+            index.setdefault(turn.get('transcript_id'), position)
+        _cache['first_turn_index'] = index
+    
+    position = _cache['first_turn_index'].get(transcript_id)
+    return processed[position] if position is not None else None
+
+def cached_response(view):
+    """
+    Serve a read-only endpoint from the response cache.
+    
+    The encoded JSON of a successful response is stored per endpoint, query
+    parameters and dataset version, and sent with a strong ETag; requests
+    whose If-None-Match matches get an empty 304. Responses are only cached
+    once the data is loaded, and stop matching when the version changes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = _cache['dataset_version']
+        if version is None or _cache['load_error']:
+            return view(*args, **kwargs)
+        
+        key = cache_key(request.endpoint, request.args, version, request.view_args)
+        entry = _response_cache.get(key)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            entry = CachedResponse(body, make_etag(body), response.mimetype)
+            _response_cache.put(key, entry)
+        
+        response = app.response_class(entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        # Let clients keep the body but revalidate on every poll
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    return wrapper
+
 @app.route('/')
 def index():
     """Serve the main dashboard page"""
     return render_template('index.html')
 
 @app.route('/api/stats', methods=['GET'])
+@cached_response
 def get_stats():
     """Get overall statistics"""
     try:
-        transcripts, processed = load_data()
-        
-        # Default stats if no data
-        if not transcripts or not processed:
-            return jsonify({'success': True, 'data': {
-                'total_transcripts': 5037,
-                'total_turns': 84465,
-                'escalated_conversations': 1561,
-                'resolved_conversations': 3476,
-                'escalation_rate': 31.0,
-                'avg_turns_per_conversation': 16.75
-            }})
-        
-        # Process is already a flattened list of turns, so calculate accordingly
-        # Count unique escalated transcripts
-        escalated_transcript_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'ESCALATED')
-        resolved_transcript_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'RESOLVED')
-        
-        escalated = len(escalated_transcript_ids)
-        resolved = len(resolved_transcript_ids)
-        total_turns = len(processed)
-        
-        stats = {
-            'total_transcripts': len(transcripts),
-            'total_turns': total_turns,
-            'escalated_conversations': escalated,
-            'resolved_conversations': resolved,
-            'escalation_rate': round(escalated / len(transcripts) * 100, 2) if transcripts else 0,
-            'avg_turns_per_conversation': round(total_turns / len(transcripts), 2) if transcripts else 0
-        }
-        
-        return jsonify({'success': True, 'data': stats})
+        return jsonify({'success': True, 'data': build_stats_panel()})
     except Exception as e:
         logger.error(f"Error in get_stats: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'total_transcripts': 5037,
-            'total_turns': 84465,
-            'escalated_conversations': 1561,
-            'resolved_conversations': 3476,
-            'escalation_rate': 31.0,
-            'avg_turns_per_conversation': 16.75
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def build_stats_panel():
+    """Overall statistics panel data"""
+    transcripts, processed = load_data()
+    if not transcripts or not processed:
+        raise RuntimeError('No transcripts loaded')
+    
+    # Process is already a flattened list of turns, so calculate accordingly
+    # Count unique escalated transcripts
+    escalated_transcript_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'ESCALATED')
+    resolved_transcript_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'RESOLVED')
+    
+    escalated = len(escalated_transcript_ids)
+    resolved = len(resolved_transcript_ids)
+    total_turns = len(processed)
+    
+    return {
+        'total_transcripts': len(transcripts),
+        'total_turns': total_turns,
+        'escalated_conversations': escalated,
+        'resolved_conversations': resolved,
+        'escalation_rate': round(escalated / len(transcripts) * 100, 2),
+        'avg_turns_per_conversation': round(total_turns / len(transcripts), 2)
+    }
 
 @app.route('/api/causes', methods=['GET'])
+@cached_response
 def get_causes():
     """Get causal analysis results"""
     try:
-        transcripts, processed = load_data()
-        
-        if not processed:
-            return jsonify({'success': True, 'data': {
-                'top_causes': {'customer_frustration': 45, 'agent_delay': 30, 'agent_denial': 25},
-                'evidence': {},
-                'total_signals': 100
-            }})
-        
-        logger.info("Analyzing causes...")
-        try:
-            causes, evidence = analyze_causes(processed)
-        except:
-            # Fallback if analyze_causes fails
-            causes = {
-                'customer_frustration': [i for i in range(450)],
-                'agent_delay': [i for i in range(300)],
-                'agent_denial': [i for i in range(250)]
-            }
-            evidence = {'customer_frustration': ['Sample evidence'], 'agent_delay': ['Sample evidence']}
-        
-        # Handle different data structures from analyze_causes
-        total_signals = 0
-        causes_safe = {}
-        if isinstance(causes, dict):
-            for key, val in causes.items():
-                if isinstance(val, (list, tuple)):
-                    causes_safe[key] = len(val)
-                    total_signals += len(val)
-                elif isinstance(val, int):
-                    causes_safe[key] = val
-                    total_signals += val
-                else:
-                    causes_safe[key] = 1
-                    total_signals += 1
-        
-        result = {
-            'top_causes': causes_safe,
-            'evidence': evidence or {},
-            'total_signals': total_signals
-        }
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, 'data': build_causes_panel()})
     except Exception as e:
         logger.error(f"Error in get_causes: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data instead of error
-        return jsonify({'success': True, 'data': {
-            'top_causes': {'customer_frustration': 45, 'agent_delay': 30, 'agent_denial': 25},
-            'evidence': {},
-            'total_signals': 100
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def build_causes_panel():
+    """Causal analysis panel data"""
+    transcripts, processed = load_data()
+    if not processed:
+        raise RuntimeError('No turns loaded')
+    
+    logger.info("Analyzing causes...")
+    # Only ESCALATED turns are scanned when the turn bitmaps are built
+    turn_bitmaps = _cache['turn_bitmaps']
+    rows = turn_bitmaps.get('outcome', 'ESCALATED').to_indices() if turn_bitmaps else None
+    causes, evidence = analyze_causes(processed, _cache['signals'], rows=rows)
+    
+    # Handle different data structures from analyze_causes
+    total_signals = 0
+    causes_safe = {}
+    if isinstance(causes, dict):
+        for key, val in causes.items():
+            if isinstance(val, (list, tuple)):
+                causes_safe[key] = len(val)
+                total_signals += len(val)
+            elif isinstance(val, int):
+                causes_safe[key] = val
+                total_signals += val
+            else:
+                causes_safe[key] = 1
+                total_signals += 1
+    
+    result = {
+        'top_causes': causes_safe,
+        'evidence': evidence or {},
+        'total_signals': total_signals
+    }
+    
+    return result
 
 @app.route('/api/signals', methods=['GET'])
+@cached_response
 def get_signals():
-    """Get signal extraction results"""
+    """Get signal extraction results (exact counts over every turn)"""
     try:
-        transcripts, processed = load_data()
-        
-        if not processed:
-            return jsonify({'success': True, 'data': {
-                'total_signals': 11892,
-                'by_type': {'customer_frustration': 5000, 'agent_delay': 4000, 'agent_denial': 2892},
-                'keywords': SIGNAL_CONFIG
-            }})
-        
-        logger.info("Extracting signals...")
-        
-        # Count signal types from processed turns (sample for performance)
-        signal_counts = {'customer_frustration': 0, 'agent_delay': 0, 'agent_denial': 0}
-        total_extracted = 0
-        
-        # Extract signals from sample of turns
-        try:
-            sample_size = min(1000, len(processed))
-            for turn in processed[:sample_size]:
-                try:
-                    signals = extract_signals(turn)
-                    if signals:
-                        for signal in signals:
-                            if isinstance(signal, dict):
-                                signal_type = signal.get('type', '')
-                            else:
-                                signal_type = str(signal)
-                            
-                            if signal_type in signal_counts:
-                                signal_counts[signal_type] += 1
-                            total_extracted += 1
-                except:
-                    continue
-            
-            # Scale to full dataset with fallback
-            total_signals = total_extracted
-            if sample_size > 0 and sample_size < len(processed):
-                scale = len(processed) / sample_size
-                for key in signal_counts:
-                    signal_counts[key] = int(signal_counts[key] * scale)
-                total_signals = int(total_extracted * scale)
-            
-            # Ensure we have non-zero values for display
-            if total_signals == 0:
-                total_signals = len(processed) * 2  # Fallback estimate
-                signal_counts = {'customer_frustration': len(processed), 'agent_delay': len(processed)//2, 'agent_denial': len(processed)//2}
-        except:
-            # Complete fallback
-            total_signals = 11892
-            signal_counts = {'customer_frustration': 5000, 'agent_delay': 4000, 'agent_denial': 2892}
-        
-        result = {
-            'total_signals': sum(signal_counts.values()),
-            'by_type': signal_counts,
-            'keywords': SIGNAL_CONFIG
-        }
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, 'data': build_signals_panel()})
     except Exception as e:
         logger.error(f"Error in get_signals: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'total_signals': 11892,
-            'by_type': {'customer_frustration': 5000, 'agent_delay': 4000, 'agent_denial': 2892},
-            'keywords': SIGNAL_CONFIG
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def build_signals_panel():
+    """Signal extraction panel data"""
+    load_data()
+    aggregates = get_aggregates()
+    if aggregates is None:
+        raise RuntimeError('Signal aggregates unavailable')
+    
+    return {
+        'total_signals': aggregates['total_signals'],
+        'by_type': aggregates['by_type'],
+        'turns_with_signals': aggregates['turns_with_signals'],
+        'keywords': SIGNAL_CONFIG
+    }
 
 @app.route('/api/warnings', methods=['GET'])
+@cached_response
 def get_warnings():
-    """Get early warning detection results"""
+    """Get early warning detection results (exact counts over every turn)"""
     try:
-        transcripts, processed = load_data()
-        
-        if not processed:
-            return jsonify({'success': True, 'data': {
-                'single_signal_warnings': 2000,
-                'multi_signal_warnings': 1500,
-                'high_risk_conversations': 500,
-                'total_analyzed': 5037,
-                'thresholds': EARLY_WARNING_CONFIG
-            }})
-        
-        logger.info("Detecting early warnings...")
-        
-        single_warnings = 0
-        multi_warnings = 0
-        high_risk = 0
-        
-        try:
-            for conv in processed[:1000]:  # Sample for performance
-                try:
-                    turns = conv.get('turns', [])
-                    if len(turns) > 0:
-                        try:
-                            signals = extract_signals(conv)
-                        except:
-                            signals = []
-                            
-                        if signals:
-                            try:
-                                warning, confidence = detect_early_warning(signals)
-                                if warning:
-                                    single_warnings += 1
-                                
-                                multi_warning, multi_conf = detect_multi_signal_warning(signals)
-                                if multi_warning:
-                                    multi_warnings += 1
-                            except:
-                                pass
-                        
-                        # Risk analysis
-                        if len(turns) > 3:
-                            try:
-                                risk_score, details = analyze_escalation_risk(turns, signals or [])
-                                if risk_score > 0.7:
-                                    high_risk += 1
-                            except:
-                                pass
-                except:
-                    continue
-            
-            # Scale results
-            sample_scale = len(processed) / min(1000, len(processed))
-            if min(1000, len(processed)) > 0:
-                single_warnings = int(single_warnings * sample_scale)
-                multi_warnings = int(multi_warnings * sample_scale)
-                high_risk = int(high_risk * sample_scale)
-            
-        except:
-            # Fallback values
-            single_warnings = 2000
-            multi_warnings = 1500
-            high_risk = 500
-        
-        result = {
-            'single_signal_warnings': single_warnings,
-            'multi_signal_warnings': multi_warnings,
-            'high_risk_conversations': high_risk,
-            'total_analyzed': len(processed),
-            'thresholds': EARLY_WARNING_CONFIG
-        }
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, 'data': build_warnings_panel()})
     except Exception as e:
         logger.error(f"Error in get_warnings: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'single_signal_warnings': 2000,
-            'multi_signal_warnings': 1500,
-            'high_risk_conversations': 500,
-            'total_analyzed': 5037,
-            'thresholds': EARLY_WARNING_CONFIG
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def build_warnings_panel():
+    """Early warning panel data"""
+    load_data()
+    aggregates = get_aggregates()
+    if aggregates is None:
+        raise RuntimeError('Warning aggregates unavailable')
+    
+    return {
+        'single_signal_warnings': aggregates['single_signal_warnings'],
+        'multi_signal_warnings': aggregates['multi_signal_warnings'],
+        'multi_signal_warning_turns': aggregates['multi_signal_warning_turns'],
+        'high_risk_conversations': aggregates['high_risk_conversations'],
+        'total_analyzed': aggregates['total_turns'],
+        'total_transcripts': aggregates['total_transcripts'],
+        'thresholds': EARLY_WARNING_CONFIG
+    }
 
 @app.route('/api/domains', methods=['GET'])
+@cached_response
 def get_domains():
     """Get data by domain"""
     try:
-        transcripts, processed = load_data()
-        
-        if not transcripts:
-            return jsonify({'success': True, 'data': {
-                'domains': {'Billing': 1200, 'Technical Support': 1100, 'Account': 900, 'Refund': 850},
-                'total_domains': 4
-            }})
-        
-        domains = {}
-        for transcript in transcripts:
-            domain = transcript.get('domain', 'Unknown')
-            domains[domain] = domains.get(domain, 0) + 1
-        
-        result = {
-            'domains': domains,
-            'total_domains': len(domains)
-        }
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, 'data': build_domains_panel()})
     except Exception as e:
         logger.error(f"Error in get_domains: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'domains': {'Billing': 1200, 'Technical Support': 1100, 'Account': 900, 'Refund': 850},
-            'total_domains': 4
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def build_domains_panel():
+    """Domain breakdown panel data"""
+    transcripts, processed = load_data()
+    if not transcripts:
+        raise RuntimeError('No transcripts loaded')
+    
+    domains = {}
+    for transcript in transcripts:
+        domain = transcript.get('domain', 'Unknown')
+        domains[domain] = domains.get(domain, 0) + 1
+    
+    return {
+        'domains': domains,
+        'total_domains': len(domains)
+    }
 
 @app.route('/api/intents', methods=['GET'])
+@cached_response
 def get_intents():
     """Get data by intent"""
     try:
-        transcripts, processed = load_data()
-        
-        if not transcripts:
-            return jsonify({'success': True, 'data': {
-                'intents': {'Complaint': 980, 'Request': 890, 'Inquiry': 850, 'Report': 650, 'Issue': 600},
-                'total_intents': 5
-            }})
-        
-        intents = {}
-        for transcript in transcripts:
-            intent = transcript.get('intent', 'Unknown')
-            intents[intent] = intents.get(intent, 0) + 1
-        
-        sorted_intents = dict(sorted(intents.items(), key=lambda x: x[1], reverse=True)[:10])
-        
-        result = {
-            'intents': sorted_intents,
-            'total_intents': len(intents)
-        }
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, 'data': build_intents_panel()})
     except Exception as e:
         logger.error(f"Error in get_intents: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'intents': {'Complaint': 980, 'Request': 890, 'Inquiry': 850, 'Report': 650, 'Issue': 600},
-            'total_intents': 5
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/escalated', methods=['GET'])
-def get_escalated():
-    """Get list of escalated conversations"""
+def build_intents_panel():
+    """Intent breakdown panel data"""
+    transcripts, processed = load_data()
+    if not transcripts:
+        raise RuntimeError('No transcripts loaded')
+    
+    intents = {}
+    for transcript in transcripts:
+        intent = transcript.get('intent', 'Unknown')
+        intents[intent] = intents.get(intent, 0) + 1
+    
+    sorted_intents = dict(sorted(intents.items(), key=lambda x: x[1], reverse=True)[:10])
+    
+    return {
+        'intents': sorted_intents,
+        'total_intents': len(intents)
+    }
+
+# Panels of the dashboard bundle, in display order
+DASHBOARD_PANELS = {
+    'stats': build_stats_panel,
+    'causes': build_causes_panel,
+    'signals': build_signals_panel,
+    'warnings': build_warnings_panel,
+    'domains': build_domains_panel,
+    'intents': build_intents_panel
+}
+
+def _get_panel_executor():
+    """Thread pool for dashboard panels (recreated in forked workers)"""
+    global _panel_executor, _panel_executor_pid
+    if _panel_executor is None or _panel_executor_pid != os.getpid():
+        _panel_executor = ThreadPoolExecutor(max_workers=len(DASHBOARD_PANELS),
+                                             thread_name_prefix='dashboard-panel')
+        _panel_executor_pid = os.getpid()
+    return _panel_executor
+
+_panel_executor = None
+_panel_executor_pid = None
+
+@app.route('/api/dashboard', methods=['GET'])
+@cached_response
+def get_dashboard():
+    """
+    Get every dashboard panel in one response.
+    
+    Panels are independent, so they are built concurrently on a thread
+    pool; the whole bundle is then cached as one response. A panel that
+    fails is reported under 'errors' and the bundle is answered with a
+    500, so it is never cached.
+    """
+    load_data()
+    
+    executor = _get_panel_executor()
+    futures = {name: executor.submit(build) for name, build in DASHBOARD_PANELS.items()}
+    
+    data = {}
+    errors = {}
+    for name, future in futures.items():
+        try:
+            data[name] = future.result()
+        except Exception as e:
+            logger.error(f"Error building dashboard panel {name}: {str(e)}")
+            errors[name] = str(e)
+    
+    payload = {'success': not errors, 'data': data}
+    if errors:
+        payload['errors'] = errors
+        return jsonify(payload), 500
+    return jsonify(payload)
+
+# Page size limits of the transcript listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def list_transcripts(outcome, list_key, total_key):
+    """
+    Cursor-paginated listing of the transcripts with an outcome.
+    
+    Query params:
+    - cursor: next_cursor of the previous page
+    - limit: Page size (default 100, max 1000)
+    - domain, intent: Exact-match filters
+    - min_length: Minimum number of turns
+    - signal: Comma-separated signal types every transcript must contain
+    - fields: Comma-separated fields to return (outcome is opt-in)
+    
+    Served from the transcript index: each page costs O(page size) plus
+    a binary search for the cursor. Filter combinations are resolved with
+    the transcript bitmaps.
+    """
     try:
-        transcripts, processed = load_data()
-        
-        if not transcripts or not processed:
-            return jsonify({'success': True, 'data': {
-                'escalated_list': [],
-                'total_escalated': 0,
-                'sample_count': 0
-            }})
-        
-        # Get unique escalated transcript IDs
-        escalated_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'ESCALATED')
-        
-        # Get escalated transcripts with details
-        escalated_transcripts = []
-        for transcript in transcripts:
-            if transcript.get('transcript_id') in escalated_ids:
-                escalated_transcripts.append({
-                    'transcript_id': transcript.get('transcript_id'),
-                    'domain': transcript.get('domain', 'Unknown'),
-                    'intent': transcript.get('intent', 'Unknown'),
-                    'reason_for_call': transcript.get('reason_for_call', ''),
-                    'conversation_length': len(transcript.get('conversation', [])),
-                })
-        
-        # Sort by transcript_id and limit to 100 for display
-        escalated_transcripts = sorted(escalated_transcripts, key=lambda x: x['transcript_id'])[:100]
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        min_length = int(request.args.get('min_length', 0))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit and min_length must be integers'}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    
+    fields = DEFAULT_LISTING_FIELDS
+    if request.args.get('fields'):
+        fields = tuple(f.strip() for f in request.args['fields'].split(',') if f.strip())
+        unknown = [f for f in fields if f not in LISTING_FIELDS]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown fields: {', '.join(unknown)}",
+                            'allowed_fields': list(LISTING_FIELDS)}), 400
+    
+    try:
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    signals = [s.strip() for s in request.args.get('signal', '').split(',') if s.strip()]
+    
+    try:
+        load_data()
+        index = _cache['transcript_index']
+        if index is None:
+            return jsonify({'success': False, 'error': 'Transcript index unavailable'}), 503
+        
+        filters = {'outcome': outcome}
+        for field in ('domain', 'intent'):
+            if request.args.get(field):
+                filters[field] = request.args[field]
+        
+        bitmaps = _cache['transcript_bitmaps']
+        if signals and bitmaps is None:
+            return jsonify({'success': False, 'error': 'Signal index unavailable'}), 503
+        unknown = [s for s in signals if s not in bitmaps.values('signal')] if signals else []
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown signals: {', '.join(unknown)}",
+                            'allowed_signals': bitmaps.values('signal')}), 400
+        
+        if bitmaps is not None and (signals or len(filters) > 1):
+            matching = bitmaps.select(filters, signals).to_indices()
+            if min_length:
+                matching = matching[index.lengths[matching] >= min_length]
+            page = index.page(matching, after=after, limit=limit, fields=fields)
+        else:
+            page = index.query(filters, min_length=min_length, after=after, limit=limit, fields=fields)
         
         result = {
-            'escalated_list': escalated_transcripts,
-            'total_escalated': len(escalated_ids),
-            'sample_count': len(escalated_transcripts),
-            'showing_sample': len(escalated_ids) > 100
+            list_key: page['items'],
+            total_key: index.count('outcome', outcome),
+            'total_matching': page['total'],
+            'sample_count': len(page['items']),
+            'showing_sample': page['next_cursor'] is not None,
+            'next_cursor': page['next_cursor'],
+            'filters_applied': {
+                'domain': filters.get('domain'),
+                'intent': filters.get('intent'),
+                'min_length': min_length,
+                'signals': signals
+            }
         }
         
         return jsonify({'success': True, 'data': result})
     except Exception as e:
-        logger.error(f"Error in get_escalated: {str(e)}")
+        logger.error(f"Error listing {outcome} transcripts: {str(e)}")
         logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'escalated_list': [],
-            'total_escalated': 972,
-            'sample_count': 0,
-            'error': 'Could not retrieve escalated data'
-        }})
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/escalated', methods=['GET'])
+def get_escalated():
+    """Get list of escalated conversations (cursor-paginated, filterable)"""
+    return list_transcripts('ESCALATED', 'escalated_list', 'total_escalated')
 
 @app.route('/api/resolved', methods=['GET'])
 def get_resolved():
-    """Get list of resolved conversations"""
-    try:
-        transcripts, processed = load_data()
-        
-        if not transcripts or not processed:
-            return jsonify({'success': True, 'data': {
-                'resolved_list': [],
-                'total_resolved': 0,
-                'sample_count': 0
-            }})
-        
-        # Get unique resolved transcript IDs
-        resolved_ids = set(t.get('transcript_id') for t in processed if t.get('outcome') == 'RESOLVED')
-        
-        # Get resolved transcripts with details
-        resolved_transcripts = []
-        for transcript in transcripts:
-            if transcript.get('transcript_id') in resolved_ids:
-                resolved_transcripts.append({
-                    'transcript_id': transcript.get('transcript_id'),
-                    'domain': transcript.get('domain', 'Unknown'),
-                    'intent': transcript.get('intent', 'Unknown'),
-                    'reason_for_call': transcript.get('reason_for_call', ''),
-                    'conversation_length': len(transcript.get('conversation', [])),
-                })
-        
-        # Sort by transcript_id and limit to 100 for display
-        resolved_transcripts = sorted(resolved_transcripts, key=lambda x: x['transcript_id'])[:100]
-        
-        result = {
-            'resolved_list': resolved_transcripts,
-            'total_resolved': len(resolved_ids),
-            'sample_count': len(resolved_transcripts),
-            'showing_sample': len(resolved_ids) > 100
-        }
-        
-        return jsonify({'success': True, 'data': result})
-    except Exception as e:
-        logger.error(f"Error in get_resolved: {str(e)}")
-        logger.error(traceback.format_exc())
-        # Return fallback data
-        return jsonify({'success': True, 'data': {
-            'resolved_list': [],
-            'total_resolved': 4065,
-            'sample_count': 0,
-            'error': 'Could not retrieve resolved data'
-        }})
+    """Get list of resolved conversations (cursor-paginated, filterable)"""
+    return list_transcripts('RESOLVED', 'resolved_list', 'total_resolved')
 
 @app.route('/api/transcript/<transcript_id>', methods=['GET'])
 def get_transcript(transcript_id):
@@ -599,19 +913,24 @@ def get_transcript(transcript_id):
     try:
         transcripts, processed = load_data()
         
-        transcript = next((t for t in transcripts if t.get('transcript_id') == transcript_id), None)
+        # Offset-indexed store decodes just this transcript (LRU cached)
+        store = _cache['store']
+        if store is not None:
+            transcript = store.get(transcript_id)
+        else:
+            transcript = next((t for t in transcripts if t.get('transcript_id') == transcript_id), None)
         
         if not transcript:
             return jsonify({'success': False, 'error': 'Transcript not found'}), 404
         
         # Find processed version
-        proc_transcript = next((t for t in processed if t.get('transcript_id') == transcript_id), None)
+        proc_transcript = find_processed_turn(transcript_id)
         
-        signals = extract_signals(proc_transcript) if proc_transcript else []
+        signals = get_turn_signals(proc_transcript) if proc_transcript else []
         
         result = {
             'transcript': transcript,
-            'processed': proc_transcript,
+            'processed': dict(proc_transcript) if proc_transcript else None,
             'signals': signals
         }
         
@@ -635,7 +954,7 @@ def explain_transcript(transcript_id):
         transcripts, processed = load_data()
         query_engine = _cache['query_engine']
         
-        # Get explanation
+        # Get explanation (cached by the query engine)
         explanation = query_engine.explain_escalation(transcript_id)
         if not explanation:
             return jsonify({
@@ -661,23 +980,79 @@ def explain_transcript(transcript_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/explain/warm', methods=['POST'])
+def warm_explain_cache():
+    """
+    Bulk warm-up of the explanation cache
+    
+    JSON body (optional):
+    - transcript_ids: Transcripts to precompute
+    - top_n: Otherwise warm this many most-viewed transcripts
+    """
+    try:
+        load_data()
+        if _cache['query_engine'] is None:
+            return jsonify({'success': False, 'error': 'Query engine unavailable'}), 503
+        
+        body = request.get_json(silent=True) or {}
+        transcript_ids = body.get('transcript_ids')
+        if transcript_ids is not None and not isinstance(transcript_ids, list):
+            return jsonify({'success': False, 'error': 'transcript_ids must be a list'}), 400
+        try:
+            top_n = int(body.get('top_n', EXPLAIN_WARM_TOP_N))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'top_n must be an integer'}), 400
+        
+        engine = _cache['query_engine']
+        computed = engine.warm_explanations(transcript_ids, top_n)
+        logger.info(f"Warmed {computed} explanations")
+        return jsonify({'success': True, 'data': {
+            'computed': computed,
+            'cache': engine.explanation_cache.cache_info()
+        }})
+    except Exception as e:
+        logger.error(f"Error in warm_explain_cache: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Neighbour count limits of /api/similar
+DEFAULT_SIMILAR_K = 10
+MAX_SIMILAR_K = 100
+SIMILARITY_MODES = ('exact', 'lsh')
+
 @app.route('/api/similar/<transcript_id>', methods=['GET'])
 def find_similar(transcript_id):
     """
     Find transcripts with similar causal patterns
+    
+    Query params:
+    - top_k: Number of neighbours (default 10, max 100)
+    - mode: 'exact' cosine ranking (default) or 'lsh' (approximate, for large corpora)
     """
+    try:
+        top_k = int(request.args.get('top_k', DEFAULT_SIMILAR_K))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'top_k must be an integer'}), 400
+    if not 1 <= top_k <= MAX_SIMILAR_K:
+        return jsonify({'success': False, 'error': f'top_k must be between 1 and {MAX_SIMILAR_K}'}), 400
+    mode = request.args.get('mode', 'exact')
+    if mode not in SIMILARITY_MODES:
+        return jsonify({'success': False, 'error': f'mode must be one of {list(SIMILARITY_MODES)}'}), 400
+    
     try:
         transcripts, processed = load_data()
         query_engine = _cache['query_engine']
         
-        # Get top N similar cases
-        similar_ids = query_engine.find_similar_cases(transcript_id, top_k=10)
-        
-        result = {
-            'reference_transcript': transcript_id,
-            'similar_cases': similar_ids,
-            'count': len(similar_ids)
-        }
+        result = {'reference_transcript': transcript_id}
+        if query_engine.similarity_index is not None:
+            neighbours = query_engine.find_similar_scored(transcript_id, top_k=top_k, mode=mode)
+            result['similar_cases'] = [tid for tid, _ in neighbours]
+            result['scores'] = [round(score, 4) for _, score in neighbours]
+            result['mode'] = mode
+        else:
+            # No signal column: fall back to the examples of the best chain
+            result['similar_cases'] = query_engine.find_similar_cases(transcript_id, top_k=top_k)
+        result['count'] = len(result['similar_cases'])
         
         return jsonify({'success': True, 'data': result})
     except Exception as e:
@@ -685,7 +1060,25 @@ def find_similar(transcript_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def format_chain(chain_key, stats):
+    """JSON form of one chain_stats entry"""
+    return {
+        'chain': list(chain_key),
+        'chain_string': ' → '.join(chain_key),
+        'confidence': round(stats['confidence'], 3),
+        'confidence_interval': [round(x, 3) for x in stats['confidence_interval']],
+        'occurrences': stats['occurrences'],
+        'escalated_count': stats['escalated_count'],
+        'resolved_count': stats['resolved_count'],
+        'support': stats['support']
+    }
+
+def format_chain_row(table, row):
+    """format_chain of one chain_table row"""
+    return format_chain(table.chain_key(row), table.entry(row))
+
 @app.route('/api/chain-stats', methods=['GET'])
+@cached_response
 def get_chain_stats():
     """
     Get statistics on all detected causal chains
@@ -702,31 +1095,20 @@ def get_chain_stats():
         min_confidence = float(request.args.get('min_confidence', 0.3))
         min_evidence = int(request.args.get('min_evidence', 5))
         
-        # Filter chains
-        chains = []
-        for chain_key, stats in detector.chain_stats.items():
-            if stats['confidence'] >= min_confidence and stats['occurrences'] >= min_evidence:
-                chains.append({
-                    'chain': list(chain_key),
-                    'chain_string': ' → '.join(chain_key),
-                    'confidence': round(stats['confidence'], 3),
-                    'confidence_interval': [round(x, 3) for x in stats['confidence_interval']],
-                    'occurrences': stats['occurrences'],
-                    'escalated_count': stats['escalated_count'],
-                    'resolved_count': stats['resolved_count']
-                })
-        
-        # Sort by confidence
-        chains.sort(key=lambda x: x['confidence'], reverse=True)
+        # Filter and sort (by displayed confidence, stable) on the table's
+        # arrays; only the top 50 are decoded into signal names
+        table = detector.chain_table
+        rows = table.select(min_confidence, min_evidence)
+        rows = rows[np.argsort(-np.round(table.confidence[rows], 3), kind='stable')]
         
         result = {
-            'total_chains': len(detector.chain_stats),
-            'filtered_chains': len(chains),
+            'total_chains': len(table),
+            'filtered_chains': len(rows),
             'filters_applied': {
                 'min_confidence': min_confidence,
                 'min_evidence': min_evidence
             },
-            'chains': chains[:50]  # Limit to top 50
+            'chains': [format_chain_row(table, row) for row in rows[:50]]  # Limit to top 50
         }
         
         return jsonify({'success': True, 'data': result})
@@ -735,6 +1117,186 @@ def get_chain_stats():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/chain-stats/prefix', methods=['GET'])
+@cached_response
+def get_chains_by_prefix():
+    """
+    Causal chains starting with a signal prefix, from the packed chain table
+    
+    Query params:
+    - prefix: Comma-separated signal types (empty for all chains)
+    - top_k: Number of chains, best confidence first (default 10, max 1000)
+    - min_evidence: Minimum occurrences (default 0)
+    - sequence: Optional comma-separated signal sequence; the response then
+      also contains the longest chain each position of it begins with
+    """
+    def split_signals(name):
+        return tuple(s.strip() for s in request.args.get(name, '').split(',') if s.strip())
+    
+    prefix = split_signals('prefix')
+    sequence = split_signals('sequence')
+    try:
+        top_k = int(request.args.get('top_k', 10))
+        min_evidence = int(request.args.get('min_evidence', 0))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'top_k and min_evidence must be integers'}), 400
+    if not 1 <= top_k <= MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'error': f'top_k must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    
+    try:
+        load_data()
+        detector = _cache['detector']
+        if detector is None:
+            return jsonify({'success': False, 'error': 'Causal chains are not available'}), 503
+        table = detector.chain_table
+        
+        result = {
+            'prefix': list(prefix),
+            'total_chains': table.count_prefix(prefix),
+            'chains': [format_chain_row(table, row) for row in table.top_k(prefix, top_k, min_evidence)]
+        }
+        if sequence:
+            matches = []
+            for start in range(len(sequence)):
+                row = table.longest_match(sequence, start)
+                matches.append({
+                    'start': start,
+                    'chain': format_chain_row(table, row) if row is not None else None
+                })
+            result['sequence'] = list(sequence)
+            result['longest_matches'] = matches
+        
+        return jsonify({'success': True, 'data': result})
+    except Exception as e:
+        logger.error(f"Error in get_chains_by_prefix: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Limits of /api/chain-stats/mined
+MAX_MINED_LENGTH = 8
+MAX_MINED_PATTERNS = 100000
+
+@app.route('/api/chain-stats/mined', methods=['GET'])
+@cached_response
+def get_mined_chains():
+    """
+    Longer signal patterns mined from the counted transcripts
+    
+    Query params:
+    - max_length: Longest pattern (default 6, max 8)
+    - min_length: Shortest pattern returned (default 4)
+    - max_gap: Signals allowed between pattern steps (default 0; 'any' for unbounded)
+    - min_evidence: Minimum transcripts containing a pattern (default: chain_stats threshold)
+    - top_k: Number of patterns, best confidence first (default 50, max 1000)
+    
+    Counts are per transcript (see CausalChainDetector.mine_chains).
+    """
+    try:
+        max_length = int(request.args.get('max_length', 6))
+        min_length = int(request.args.get('min_length', 4))
+        top_k = int(request.args.get('top_k', 50))
+        max_gap = request.args.get('max_gap', '0')
+        max_gap = None if max_gap == 'any' else int(max_gap)
+        min_evidence = request.args.get('min_evidence')
+        min_evidence = int(min_evidence) if min_evidence is not None else None
+    except ValueError:
+        return jsonify({'success': False, 'error': "max_length, min_length, top_k, min_evidence and max_gap must be integers (max_gap may be 'any')"}), 400
+    if not 1 <= max_length <= MAX_MINED_LENGTH:
+        return jsonify({'success': False, 'error': f'max_length must be between 1 and {MAX_MINED_LENGTH}'}), 400
+    if not 1 <= top_k <= MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'error': f'top_k must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if (max_gap is not None and max_gap < 0) or (min_evidence is not None and min_evidence < 1):
+        return jsonify({'success': False, 'error': 'max_gap must be >= 0 and min_evidence >= 1'}), 400
+    
+    try:
+        load_data()
+        detector = _cache['detector']
+        if detector is None:
+            return jsonify({'success': False, 'error': 'Causal chains are not available'}), 503
+        
+        mined = detector.mine_chains(min_evidence=min_evidence, max_length=max_length,
+                                     max_gap=max_gap, max_patterns=MAX_MINED_PATTERNS)
+        patterns = [(key, stats) for key, stats in mined.items() if len(key) >= min_length]
+        patterns.sort(key=lambda item: (-item[1]['confidence'], -item[1]['occurrences'], item[0]))
+        
+        result = {
+            'filters_applied': {
+                'max_length': max_length,
+                'min_length': min_length,
+                'max_gap': 'any' if max_gap is None else max_gap,
+                'min_evidence': min_evidence if min_evidence is not None else detector.min_evidence
+            },
+            'total_patterns': len(patterns),
+            'chains': [dict(format_chain(key, stats), examples=stats['examples'])
+                       for key, stats in patterns[:top_k]]
+        }
+        
+        return jsonify({'success': True, 'data': result})
+    except Exception as e:
+        logger.error(f"Error in get_mined_chains: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/chain-stats/transcripts', methods=['GET'])
+@cached_response
+def get_chain_transcripts():
+    """
+    Drill down into one causal chain: every supporting transcript, paginated
+    
+    Query params:
+    - chain: Comma-separated signal types, e.g. customer_frustration,agent_delay
+    - cursor: next_cursor of the previous page
+    - limit: Page size (default 100, max 1000)
+    
+    Pages are read from the chain's compressed posting list, in the order
+    transcripts were processed.
+    """
+    chain_key = tuple(s.strip() for s in request.args.get('chain', '').split(',') if s.strip())
+    if not chain_key:
+        return jsonify({'success': False, 'error': 'chain is required'}), 400
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    try:
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        load_data()
+        detector = _cache['detector']
+        stats = detector.chain_stats.get(chain_key) if detector is not None else None
+        if stats is None:
+            return jsonify({'success': False, 'error': f"Unknown chain: {' → '.join(chain_key)}"}), 404
+        
+        try:
+            transcript_ids = detector.chain_transcripts(chain_key, after=after, limit=limit + 1)
+        except KeyError:
+            return jsonify({'success': False, 'error': f"Invalid cursor: {request.args['cursor']!r}"}), 400
+        more = len(transcript_ids) > limit
+        transcript_ids = transcript_ids[:limit]
+        
+        result = {
+            'chain': list(chain_key),
+            'chain_string': ' → '.join(chain_key),
+            'support': stats['support'],
+            'occurrences': stats['occurrences'],
+            'confidence': round(stats['confidence'], 3),
+            'examples': stats['examples'],
+            'transcripts': transcript_ids,
+            'count': len(transcript_ids),
+            'next_cursor': encode_cursor(transcript_ids[-1]) if more else None
+        }
+        
+        return jsonify({'success': True, 'data': result})
+    except Exception as e:
+        logger.error(f"Error in get_chain_transcripts: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/query', methods=['POST'])
 def query_engine_endpoint():
     """
@@ -1096,12 +1658,45 @@ def health():
     return jsonify({'success': True, 'message': 'API is running'})
 
 
-def create_app(env='development'):
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """
+    Readiness probe for load balancers.
+    
+    200 only once transcripts, processed turns and the causal engine are
+    built; 503 otherwise (with Retry-After while still loading). Unlike
+    /api/health, which only reports that the process is up.
+    """
+    if is_data_ready():
+        return jsonify({
+            'success': True,
+            'ready': True,
+            'transcripts': len(_cache['transcripts'] or []),
+            'turns': len(_cache['processed'] or [])
+        })
+    
+    if _data_ready.is_set():
+        status = 'failed'
+    else:
+        status = 'loading'
+        start_background_load()
+    
+    response = jsonify({'success': False, 'ready': False, 'status': status,
+                        'error': data_not_ready_reason()})
+    response.status_code = 503
+    if status == 'loading':
+        response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+    return response
+
+
+def create_app(env='development', background_load=True):
     """
     Application factory for Flask app.
     
     Args:
         env (str): Environment name - 'development', 'production', or 'testing'
+        background_load (bool): Start loading data in a background thread.
+            Disabled when the data is preloaded in the gunicorn master.
     
     Returns:
         Flask: Configured Flask application instance
@@ -1138,27 +1733,13 @@ def create_app(env='development'):
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
     
     # Start background data loading if not in testing mode
-    if not app.config['TESTING']:
-        import threading
-        def load_data_background():
-            logger.info("Background: Starting data loading...")
-            try:
-                load_data()
-                logger.info("Background: Data loading complete")
-            except Exception as e:
-                logger.error(f"Background data loading failed: {e}")
-        
-        # Load data in background thread to prevent blocking startup
-        loader_thread = threading.Thread(target=load_data_background, daemon=True)
-        loader_thread.start()
+    if background_load and not app.config['TESTING']:
+        start_background_load()
     
     return app
 
 
 if __name__ == '__main__':
-    import os
-    import threading
-    
     logger.info("Starting Causal Chat Analysis API (Development Mode)...")
     
     # Load environment variables
@@ -1168,18 +1749,8 @@ if __name__ == '__main__':
     # Create and configure app
     app_instance = create_app('development')
     
-    # Start background data loading
-    def load_data_background():
-        logger.info("Background: Starting data loading...")
-        try:
-            load_data()
-            logger.info("Background: Data loading complete")
-        except Exception as e:
-            logger.error(f"Background data loading failed: {e}")
-    
-    # Load data in background thread to prevent blocking startup
-    loader_thread = threading.Thread(target=load_data_background, daemon=True)
-    loader_thread.start()
+    # Start background data loading (no-op if create_app already did)
+    start_background_load()
     
     # Run development server
     app_instance.run(
@@ -40,10 +40,25 @@ tmp_upload_dir = None
 # ssl_version = 'TLSv1_2'
 
 # Application defaults
-preload_app = False
+# PRELOAD_DATA=true loads the dataset and causal engine once in the master;
+# workers then share it copy-on-write instead of each building their own
+preload_app = os.environ.get('PRELOAD_DATA', 'false').lower() == 'true'
 raw_env = [
     'FLASK_ENV=production',
 ]
 
+
+def post_fork(server, worker):
+    """Re-enable garbage collection paused while preloading in the master"""
+    if preload_app:
+        import gc
+        gc.enable()
+
+
+def post_worker_init(worker):
+    """Report worker memory so shared vs private pages can be verified"""
+    from src.utils import get_process_memory
+    worker.log.info(f"Worker {worker.pid} memory: {get_process_memory()}")
+
 # Create logs directory if needed
 os.makedirs('logs', exist_ok=True)
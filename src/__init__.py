@@ -5,8 +5,8 @@ Causal Chat Analysis Source Package
 __version__ = "1.0.0"
 __author__ = "Causal Analysis Team"
 
-from .load_data import load_transcripts
-from .preprocess import preprocess_transcripts, label_outcome
+from .load_data import load_transcripts, iter_transcripts
+from .preprocess import preprocess_transcripts, iter_processed_turns, label_outcome
 from .causal_analysis import analyze_causes
 from .signal_extraction import extract_signals, extract_signals_advanced
 from .early_warning import detect_early_warning, detect_multi_signal_warning, analyze_escalation_risk
@@ -14,7 +14,9 @@ from .config import SIGNAL_CONFIG, ESCALATION_CONFIG, EARLY_WARNING_CONFIG
 
 __all__ = [
     'load_transcripts',
+    'iter_transcripts',
     'preprocess_transcripts',
+    'iter_processed_turns',
     'label_outcome',
     'analyze_causes',
     'extract_signals',
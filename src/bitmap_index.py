@@ -0,0 +1,226 @@
+"""
+Bitmap Index Module - Bitmaps over transcript/turn attributes and signal presence
+Arbitrary filter combinations reduce to word-wise AND/OR/NOT plus popcounts
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.signal_batch import SignalMatrix
+
+_WORD_BITS = 64
+_WORD_DTYPE = np.dtype("<u8")  # Little-endian, so bit i of the bytes is item i
+
+# Set bits of every byte value, for numpy versions without bitwise_count
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(_BYTE_POPCOUNT[words.view(np.uint8)].sum())
+
+
+class Bitmap:
+    """
+    Fixed-size bitset packed into uint64 words (1 bit per item)
+
+    Bit i set means item i (a transcript rank or a turn row) is in the set.
+    Bits past size are always zero.
+    """
+
+    __slots__ = ("words", "size")
+
+    def __init__(self, words: np.ndarray, size: int):
+        self.words = words
+        self.size = size
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Bitmap":
+        mask = np.asarray(mask, dtype=bool)
+        padded = np.zeros(-(-len(mask) // _WORD_BITS) * _WORD_BITS, dtype=bool)
+        padded[:len(mask)] = mask
+        words = np.packbits(padded, bitorder="little").view(_WORD_DTYPE)
+        return cls(words, len(mask))
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> "Bitmap":
+        mask = np.zeros(size, dtype=bool)
+        mask[np.fromiter(indices, dtype=np.int64)] = True
+        return cls.from_mask(mask)
+
+    @classmethod
+    def empty(cls, size: int) -> "Bitmap":
+        return cls(np.zeros(-(-size // _WORD_BITS), dtype=_WORD_DTYPE), size)
+
+    @classmethod
+    def full(cls, size: int) -> "Bitmap":
+        return ~cls.empty(size)
+
+    def _check(self, other: "Bitmap") -> None:
+        if other.size != self.size:
+            raise ValueError("bitmaps cover different numbers of items")
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        return Bitmap(self.words & other.words, self.size)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        self._check(other)
+        return Bitmap(self.words | other.words, self.size)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        """Items in self but not in other (AND NOT)"""
+        self._check(other)
+        return Bitmap(self.words & ~other.words, self.size)
+
+    def __invert__(self) -> "Bitmap":
+        words = ~self.words
+        tail = self.size % _WORD_BITS
+        if tail and len(words):
+            words[-1] &= np.uint64((1 << tail) - 1)
+        return Bitmap(words, self.size)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Bitmap) and other.size == self.size and np.array_equal(self.words, other.words)
+
+    def __contains__(self, item: int) -> bool:
+        if not 0 <= item < self.size:
+            return False
+        return bool((int(self.words[item // _WORD_BITS]) >> (item % _WORD_BITS)) & 1)
+
+    def cardinality(self) -> int:
+        """Number of set bits"""
+        return _popcount(self.words)
+
+    def to_mask(self) -> np.ndarray:
+        bits = np.unpackbits(self.words.view(np.uint8), bitorder="little")
+        return bits[:self.size].astype(bool)
+
+    def to_indices(self) -> np.ndarray:
+        """Set items in ascending order"""
+        return np.flatnonzero(self.to_mask())
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def __repr__(self):
+        return f"Bitmap({self.cardinality()}/{self.size})"
+
+
+class BitmapIndex:
+    """
+    One bitmap per (attribute, value) and per signal type over a fixed
+    item numbering (transcript ranks or turn rows)
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.bitmaps: Dict[Tuple[str, str], Bitmap] = {}
+
+    def add(self, field: str, value: str, mask: np.ndarray) -> None:
+        """Store the bitmap of items where field == value"""
+        if len(mask) != self.size:
+            raise ValueError("mask does not match index size")
+        self.bitmaps[(field, value)] = Bitmap.from_mask(mask)
+
+    def add_categorical(self, field: str, codes: np.ndarray, categories: Sequence[str]) -> None:
+        """Store one bitmap per category of a coded column"""
+        for code, value in enumerate(categories):
+            self.add(field, value, codes == code)
+
+    def get(self, field: str, value: str) -> Bitmap:
+        """Bitmap of a value (empty if the value never occurs)"""
+        bitmap = self.bitmaps.get((field, value))
+        return bitmap if bitmap is not None else Bitmap.empty(self.size)
+
+    def values(self, field: str) -> List[str]:
+        return [value for f, value in self.bitmaps if f == field]
+
+    def select(self, filters: Optional[Dict[str, str]] = None,
+               signals: Sequence[str] = (), exclude_signals: Sequence[str] = ()) -> Bitmap:
+        """
+        Items matching every equality filter, containing every signal in
+        signals and none in exclude_signals
+        """
+        result = Bitmap.full(self.size)
+        for field, value in (filters or {}).items():
+            result = result & self.get(field, value)
+        for signal in signals:
+            result = result & self.get("signal", signal)
+        for signal in exclude_signals:
+            result = result - self.get("signal", signal)
+        return result
+
+    def count(self, filters: Optional[Dict[str, str]] = None,
+              signals: Sequence[str] = (), exclude_signals: Sequence[str] = ()) -> int:
+        return self.select(filters, signals, exclude_signals).cardinality()
+
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self.bitmaps.values())
+
+    def __repr__(self):
+        return f"BitmapIndex({len(self.bitmaps)} bitmaps over {self.size} items)"
+
+
+def _turn_transcript_ids(turns) -> Iterable[str]:
+    from src.turn_table import TurnTable
+
+    if isinstance(turns, TurnTable):
+        ids = turns.transcript_ids
+        return (ids[position] for position in turns.transcript_codes)
+    return (turn["transcript_id"] for turn in turns)
+
+
+def build_transcript_bitmaps(transcript_index, turns=None,
+                             signal_matrix: Optional[SignalMatrix] = None) -> BitmapIndex:
+    """
+    Bitmaps over transcripts, numbered by TranscriptIndex rank
+
+    Attribute bitmaps mirror the index's posting lists (outcome, domain,
+    intent). With turns and their signal matrix, a "signal" bitmap per
+    signal type marks transcripts containing that signal in any turn.
+    """
+    index = BitmapIndex(len(transcript_index))
+    for (field, value), ranks in transcript_index.postings.items():
+        mask = np.zeros(len(transcript_index), dtype=bool)
+        mask[ranks] = True
+        index.add(field, value, mask)
+
+    if turns is not None and signal_matrix is not None:
+        rank_of = {tid: rank for rank, tid in enumerate(transcript_index.transcript_ids)}
+        ranks = np.fromiter((rank_of.get(tid, -1) for tid in _turn_transcript_ids(turns)),
+                            dtype=np.int64, count=len(signal_matrix))
+        known = ranks >= 0
+        for col, signal in enumerate(signal_matrix.signal_types):
+            counts = np.bincount(ranks[known], weights=signal_matrix.presence[known, col],
+                                 minlength=len(transcript_index))
+            index.add("signal", signal, counts > 0)
+    return index
+
+
+def build_turn_bitmaps(turns, signal_matrix: Optional[SignalMatrix] = None) -> BitmapIndex:
+    """
+    Bitmaps over turn rows: outcome and speaker values, plus one per
+    signal type when a signal matrix is given
+    """
+    from src.turn_table import TurnTable
+
+    index = BitmapIndex(len(turns))
+    if isinstance(turns, TurnTable):
+        index.add_categorical("outcome", turns.transcript_outcome[turns.transcript_codes],
+                              turns.categories["outcome"])
+        index.add_categorical("speaker", turns.speaker_codes, turns.categories["speaker"])
+    else:
+        for field in ("outcome", "speaker"):
+            lookup = {}
+            codes = np.fromiter((lookup.setdefault(turn[field], len(lookup)) for turn in turns),
+                                dtype=np.int64, count=len(turns))
+            index.add_categorical(field, codes, list(lookup))
+
+    if signal_matrix is not None:
+        for col, signal in enumerate(signal_matrix.signal_types):
+            index.add("signal", signal, signal_matrix.presence[:, col].astype(bool))
+    return index
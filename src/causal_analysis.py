@@ -1,16 +1,26 @@
 from collections import defaultdict
-from src.signal_extraction import extract_signals
+from src.signal_extraction import get_turn_signals
 
 
-def analyze_causes(processed_turns):
+def analyze_causes(processed_turns, signal_matrix=None, rows=None):
     cause_stats = defaultdict(int)
     evidence = defaultdict(list)
 
-    for turn in processed_turns:
+    # rows (ascending turn indices, e.g. the ESCALATED turn bitmap) limits the scan
+    if rows is None:
+        indexed_turns = enumerate(processed_turns)
+    else:
+        indexed_turns = ((int(idx), processed_turns[int(idx)]) for idx in rows)
+
+    for idx, turn in indexed_turns:
         if turn["outcome"] != "ESCALATED":
             continue
 
-        signals = extract_signals(turn)
+        # Use precomputed signals from extract_signals_batch when available
+        if signal_matrix is not None:
+            signals = signal_matrix.turn_signals(idx)
+        else:
+            signals = get_turn_signals(turn)
         for signal in signals:
             cause_stats[signal] += 1
 
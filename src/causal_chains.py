@@ -3,21 +3,56 @@ Causal Chains Module - Detect and analyze causal signal sequences
 Builds chains like: customer_frustration → agent_delay → escalation (78% confidence)
 """
 
-from collections import defaultdict
-from typing import List, Dict, Tuple, Optional
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Mapping, Set, Tuple, Optional
 import json
+import os
+
+import numpy as np
 
 from src.causal_model import CausalChain, TemporalSignalSequence, Outcome, Signal, DEFAULT_CAUSAL_PATTERNS
-from src.signal_extraction import extract_signals, get_signal_confidence
-from src.preprocess import label_outcome
+from src.signal_extraction import get_turn_signal_confidences, get_keyword_matcher
+from src.preprocess import label_outcome, transcript_turns
+from src.chain_counters import EXAMPLE_SAMPLE_SIZE, ChainCounter, example_priority
+from src.chain_miner import DEFAULT_MAX_PATTERN_LENGTH, mine_sequential_patterns
+from src.signal_batch import extract_signals_batch
+from src.turn_table import TurnTable
+from src.chain_table import ChainStatsTable, ChainStatsView, SignalAlphabet, pack_chain, packed_chain_counts
+
+# Longest chain (in signals) that is counted
+MAX_CHAIN_LENGTH = 3
+
+# Transcripts per task of compute_chain_statistics_parallel
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _count_chunk(chunk: List[Tuple[dict, List[dict]]], seed: int) -> dict:
+    """Worker task: partial counters of (transcript, turns) pairs"""
+    detector = CausalChainDetector(seed=seed)
+    for transcript, turns in chunk:
+        detector._record_sequence(detector.build_temporal_sequence(transcript, turns))
+    return detector.export_partial()
 
 
 class CausalChainDetector:
     """Detect and analyze causal signal chains"""
     
-    def __init__(self):
-        self.chain_stats = {}  # Computed chain statistics
+    def __init__(self, seed: int = 0, min_evidence: int = 5):
+        """
+        Args:
+            seed: Seed of the example sampling
+            min_evidence: Minimum occurrences for a chain to appear in chain_stats
+        """
+        self.alphabet = SignalAlphabet()  # Signal type codes of packed chain keys
+        self.chain_table = ChainStatsTable(self.alphabet)  # Reported chains, one row per chain
+        self.chain_stats = ChainStatsView(self.chain_table)  # {chain_key: stats} view of chain_table
+        self.stats_version = 0  # Bumped whenever chain_stats changes
         self.chain_examples = defaultdict(list)  # Examples for each chain
+        self.seed = seed
+        self.min_evidence = min_evidence
+        self._reset_counters()
         
     def build_temporal_sequence(self, transcript: dict, 
                                processed_turns: List[dict]) -> TemporalSignalSequence:
@@ -37,11 +72,9 @@ class CausalChainDetector:
         sequence = TemporalSignalSequence(transcript_id=transcript_id, outcome=outcome)
         
         # Extract signals with temporal info
+        matcher = get_keyword_matcher()
         for turn in processed_turns:
-            signals_list = extract_signals(turn)
-            
-            for signal_type in signals_list:
-                confidence = get_signal_confidence(turn, signal_type)
+            for signal_type, confidence in get_turn_signal_confidences(turn, matcher):
                 signal = Signal(
                     type=signal_type,
                     turn_number=turn["turn_number"],
@@ -54,7 +87,7 @@ class CausalChainDetector:
         return sequence
     
     def extract_chains_from_sequence(self, sequence: TemporalSignalSequence, 
-                                    max_chain_length: int = 3) -> List[CausalChain]:
+                                    max_chain_length: int = MAX_CHAIN_LENGTH) -> List[CausalChain]:
         """
         Extract all possible causal chains from a sequence
         
@@ -83,9 +116,25 @@ class CausalChainDetector:
         
         return chains
     
+    @staticmethod
+    def group_turns_by_transcript(processed_turns: List[dict]) -> Dict[str, List[dict]]:
+        """
+        Group processed turns by transcript_id, preserving turn order
+        
+        Args:
+            processed_turns: Flat list of processed turns
+        
+        Returns:
+            Dict mapping transcript_id → list of its turns
+        """
+        grouped = defaultdict(list)
+        for turn in processed_turns:
+            grouped[turn["transcript_id"]].append(turn)
+        return grouped
+    
     def compute_chain_statistics(self, all_transcripts: List[dict],
                                 all_processed_turns: List[dict],
-                                min_evidence: int = 5) -> Dict[Tuple[str, ...], dict]:
+                                min_evidence: int = 5) -> Mapping[Tuple[str, ...], dict]:
         """
         Compute statistics for all detected causal chains
         
@@ -107,71 +156,589 @@ class CausalChainDetector:
                     "escalated_count": 158,
                     "resolved_count": 85,
                     "confidence": 0.65,
-                    "examples": ["id1", "id2", ...],
+                    "support": 231,  # Distinct supporting transcripts
+                    "examples": ["id1", "id2", ...],  # Random sample of them
                     "confidence_interval": (0.59, 0.71)
                 },
                 ...
             }
+            
+            The mapping is a read-only view of chain_table, which keeps the
+            statistics in arrays with packed chain keys; entries are built
+            when accessed.
+            
+            Raw counters of every chain, including those below
+            min_evidence, stay in chain_counters so add_transcripts and
+            remove_transcripts can update chain_stats incrementally.
+            Every supporting transcript is kept (see chain_transcripts).
         """
-        chain_tracker = defaultdict(lambda: {
-            "occurrences": 0,
-            "escalated_count": 0,
-            "resolved_count": 0,
-            "examples": []
-        })
+        self._reset_counters()
+        
+        # Group turns by transcript in a single pass (O(turns) instead of
+        # re-scanning every turn for every transcript)
+        turns_by_transcript = self.group_turns_by_transcript(all_processed_turns)
         
         # Build sequences for each transcript
         for transcript in all_transcripts:
             transcript_id = transcript["transcript_id"]
             
             # Get turns for this transcript
-            transcript_turns = [t for t in all_processed_turns 
-                              if t["transcript_id"] == transcript_id]
+            transcript_turns = turns_by_transcript.get(transcript_id, [])
             
             if not transcript_turns:
                 continue
             
-            # Build temporal sequence
+            # Build temporal sequence and record its chains
             sequence = self.build_temporal_sequence(transcript, transcript_turns)
+            self._record_sequence(sequence)
+        
+        return self._finalize_chain_stats(min_evidence)
+    
+    def compute_chain_statistics_from_table(self, turn_table: TurnTable,
+                                            min_evidence: int = 5) -> Mapping[Tuple[str, ...], dict]:
+        """
+        compute_chain_statistics over a columnar TurnTable
+        
+        Signal sequences are read from the table's signal column (extracted
+        with extract_signals_batch if none is attached), so no transcript
+        dicts or per-turn rows are created. The result equals
+        compute_chain_statistics over the table's transcripts and turns.
+        
+        Args:
+            turn_table: Turns of every transcript, e.g. a snapshot's turn_table
+            min_evidence: Minimum transcripts needed for a chain to be reported
+        
+        Returns:
+            Chain statistics in the compute_chain_statistics format
+        """
+        signal_matrix = turn_table.signal_matrix
+        if signal_matrix is None:
+            signal_matrix = extract_signals_batch(turn_table)
+        
+        # Signal codes of all turns back to back, each turn in column order
+        # (the order extract_signals emits them)
+        rows, columns = np.nonzero(signal_matrix.presence)
+        column_codes = np.frombuffer(self.alphabet.encode(signal_matrix.signal_types), dtype=np.uint8)
+        codes = column_codes[columns].tobytes()
+        starts = turn_table.transcript_starts
+        bounds = np.searchsorted(rows, starts).tolist()
+        escalated_codes = [Outcome(label.lower()) == Outcome.ESCALATED
+                           for label in turn_table.categories["outcome"]]
+        
+        # A repeated id sees the signals of all its copies ordered by turn
+        # number, as build_temporal_sequence orders its grouped turns
+        positions_by_id = defaultdict(list)
+        for position, transcript_id in enumerate(turn_table.transcript_ids):
+            if starts[position] < starts[position + 1]:
+                positions_by_id[transcript_id].append(position)
+        
+        self._reset_counters()
+        for position, transcript_id in enumerate(turn_table.transcript_ids):
+            positions = positions_by_id.get(transcript_id)
+            if not positions:
+                continue  # No turns
+            if len(positions) == 1:
+                sequence = codes[bounds[positions[0]]:bounds[positions[0] + 1]]
+            else:
+                index = np.concatenate([np.arange(bounds[p], bounds[p + 1]) for p in positions])
+                index = index[np.argsort(turn_table.turn_numbers[rows[index]], kind="stable")]
+                sequence = column_codes[columns[index]].tobytes()
+            escalated = escalated_codes[turn_table.transcript_outcome[position]]
+            self._record_codes(transcript_id, sequence, escalated)
+        
+        return self._finalize_chain_stats(min_evidence)
+    
+    def compute_chain_statistics_streaming(self, transcripts: Iterable[dict],
+                                           min_evidence: int = 5) -> Mapping[Tuple[str, ...], dict]:
+        """
+        Same statistics as compute_chain_statistics, from a transcript stream
+        
+        Turns are derived per transcript as it arrives, so only the chain
+        counters (plus the signal turn numbers of each transcript) stay
+        resident. Pairs with load_data.iter_transcripts for exports that do
+        not fit in memory.
+        
+        A repeated transcript_id is grouped as in compute_chain_statistics:
+        when a copy arrives, the id is recounted under its first rank with
+        the signals of all its copies merged by turn number.
+        
+        Args:
+            transcripts: Any iterable of transcript dicts
+            min_evidence: Minimum transcripts needed for a chain to be reported
+        
+        Returns:
+            Chain statistics in the compute_chain_statistics format
+        """
+        self._reset_counters()
+        signal_turns: Dict[str, array] = {}  # Id → turn number of each of its signals
+        turnless: Dict[str, List[bool]] = {}  # Ids seen only without turns → outcome of each copy
+        
+        for transcript in transcripts:
+            transcript_id = transcript["transcript_id"]
+            turns = transcript_turns(transcript)
+            sequence = self.build_temporal_sequence(transcript, turns)
+            escalated = sequence.outcome == Outcome.ESCALATED
+            codes = self.alphabet.encode([s.type for s in sequence.signals])
+            numbers = array("I", [s.turn_number for s in sequence.signals])
             
-            # Extract chains
-            chains = self.extract_chains_from_sequence(sequence)
+            rank = self._rank_of.get(transcript_id)
+            if rank is None:
+                # Ranked at first sight; dropped at the end if no copy has turns
+                self._new_rank(transcript_id)
+                if turns:
+                    signal_turns[transcript_id] = numbers
+                    self._record_codes(transcript_id, codes, escalated)
+                else:
+                    turnless[transcript_id] = [escalated]
+                continue
             
-            # Record each chain
-            for chain in chains:
-                chain_key = tuple(chain.signals)
-                chain_tracker[chain_key]["occurrences"] += 1
-                
-                if sequence.outcome == Outcome.ESCALATED:
-                    chain_tracker[chain_key]["escalated_count"] += 1
+            if not turns:
+                if transcript_id in turnless:
+                    turnless[transcript_id].append(escalated)
                 else:
-                    chain_tracker[chain_key]["resolved_count"] += 1
-                
-                # Store example IDs (limit storage)
-                if len(chain_tracker[chain_key]["examples"]) < 10:
-                    chain_tracker[chain_key]["examples"].append(transcript_id)
-        
-        # Convert to final format with confidence scores
-        self.chain_stats = {}
-        for chain_key, stats in chain_tracker.items():
-            if stats["occurrences"] < min_evidence:
-                continue  # Skip chains with insufficient evidence
+                    self._record_codes(transcript_id, self._rank_sequences[rank][0][0], escalated)
+                continue
             
-            confidence = stats["escalated_count"] / stats["occurrences"]
-            confidence_interval = self._wilson_ci(stats["escalated_count"], 
-                                                  stats["occurrences"])
+            outcomes = turnless.pop(transcript_id, None)
+            if outcomes is None:
+                outcomes = [is_escalated for _, is_escalated in self._rank_sequences[rank]]
+                numbers = signal_turns[transcript_id] + numbers
+                codes = self._rank_sequences[rank][0][0] + codes
+            order = np.argsort(numbers, kind="stable")
+            signal_turns[transcript_id] = array("I", np.asarray(numbers)[order].tolist())
+            merged = np.frombuffer(codes, dtype=np.uint8)[order].tobytes()
+            self._recount_transcript(transcript_id, [(merged, is_escalated)
+                                                     for is_escalated in outcomes + [escalated]])
+        
+        for transcript_id in turnless:
+            self._forget_transcript(transcript_id)
+        
+        return self._finalize_chain_stats(min_evidence)
+    
+    def compute_chain_statistics_parallel(self, all_transcripts: List[dict],
+                                          all_processed_turns: List[dict],
+                                          min_evidence: int = 5,
+                                          workers: Optional[int] = None,
+                                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Mapping[Tuple[str, ...], dict]:
+        """
+        Same statistics as compute_chain_statistics, counted on a process pool
+        
+        Transcripts are split into consecutive chunks; each worker returns
+        the partial counters of its chunk (see export_partial) and they are
+        merged in chunk order, so the result is identical to the serial run.
+        
+        Args:
+            all_transcripts: All transcript dicts
+            all_processed_turns: All processed turns
+            min_evidence: Minimum transcripts needed for a chain to be reported
+            workers: Worker processes (default: one per CPU)
+            chunk_size: Transcripts per task
+        
+        Returns:
+            Chain statistics in the compute_chain_statistics format
+        """
+        turns_by_transcript = self.group_turns_by_transcript(all_processed_turns)
+        
+        def chunks() -> Iterator[List[Tuple[dict, List[dict]]]]:
+            chunk = []
+            for transcript in all_transcripts:
+                turns = turns_by_transcript.get(transcript["transcript_id"], [])
+                if not turns:
+                    continue
+                # Plain dicts pickle cheaply (TurnTable rows would drag their table along)
+                chunk.append((transcript, [{key: turn[key] for key in turn} for turn in turns]))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        workers = workers or os.cpu_count() or 1
+        self._reset_counters()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded number of chunks in flight, merging in submission order
+            window = 2 * workers
+            pending = deque()
+            for chunk in chunks():
+                pending.append(pool.submit(_count_chunk, chunk, self.seed))
+                if len(pending) >= window:
+                    self.merge_partial(pending.popleft().result())
+            while pending:
+                self.merge_partial(pending.popleft().result())
+        
+        return self._finalize_chain_stats(min_evidence)
+    
+    def export_partial(self) -> dict:
+        """
+        Raw counters of the transcripts counted so far, as plain data
+        
+        Removed transcripts are left out and the rest renumbered densely.
+        The result can be pickled or serialized and folded into another
+        detector with merge_partial.
+        
+        Returns:
+            dict with 'transcript_ids', per transcript 'sequences' (list of
+            [signal types, escalated]) and 'chains': one
+            (chain_key, occurrences, escalated_count, resolved_count,
+            ranks, examples) tuple per chain
+        """
+        count = len(self.transcript_ids)
+        live = np.flatnonzero(self._alive[:count])
+        renumber = np.full(count, -1, dtype=np.int64)
+        renumber[live] = np.arange(len(live))
+        
+        chains = []
+        for key, counter in self.chain_counters.items():
+            chains.append((
+                self.alphabet.unpack(key),
+                counter.occurrences,
+                counter.escalated_count,
+                counter.resolved_count,
+                renumber[counter.ranks(self._alive)],
+                [(priority, int(renumber[rank])) for priority, rank in counter.examples]
+            ))
+        return {
+            "transcript_ids": [self.transcript_ids[rank] for rank in live],
+            "sequences": [[(self.alphabet.decode(codes), escalated)
+                           for codes, escalated in self._rank_sequences[rank]]
+                          for rank in live],
+            "chains": chains
+        }
+    
+    def merge_partial(self, partial: dict) -> None:
+        """
+        Fold counters exported by export_partial into this detector
+        
+        Transcripts already counted here count twice, like a repeated id
+        in compute_chain_statistics. chain_stats is not refreshed; call
+        _finalize_chain_stats (or use merge_partials) afterwards.
+        """
+        ranks = np.empty(len(partial["transcript_ids"]), dtype=np.int64)
+        for local, transcript_id in enumerate(partial["transcript_ids"]):
+            rank = self._rank_of.get(transcript_id)
+            if rank is None:
+                rank = self._new_rank(transcript_id)
+            ranks[local] = rank
+            self._rank_sequences[rank].extend(
+                (self.alphabet.encode(signal_types), bool(escalated))
+                for signal_types, escalated in partial["sequences"][local]
+            )
+        
+        for chain_key, occurrences, escalated_count, resolved_count, chain_ranks, examples in partial["chains"]:
+            key = pack_chain(self.alphabet.encode(chain_key))
+            counter = self.chain_counters.get(key)
+            if counter is None:
+                counter = self.chain_counters[key] = ChainCounter()
+            counter.merge(occurrences, escalated_count, resolved_count,
+                          ranks[np.asarray(chain_ranks, dtype=np.int64)],
+                          [(int(priority), int(ranks[local])) for priority, local in examples],
+                          self._alive)
+    
+    def merge_partials(self, partials: Iterable[dict],
+                       min_evidence: int = 5) -> Mapping[Tuple[str, ...], dict]:
+        """
+        Statistics of several export_partial results, merged in order
+        
+        Replaces anything counted before. Merging contiguous slices of a
+        dataset in order gives exactly the compute_chain_statistics result.
+        
+        Returns:
+            Chain statistics in the compute_chain_statistics format
+        """
+        self._reset_counters()
+        for partial in partials:
+            self.merge_partial(partial)
+        return self._finalize_chain_stats(min_evidence)
+    
+    def _reset_counters(self):
+        """Forget every counted transcript"""
+        self.chain_counters: Dict[int, ChainCounter] = {}  # Packed chain key → raw counters, every chain
+        self.transcript_ids: List[Optional[str]] = []  # Rank → transcript_id (None once removed)
+        self._rank_of: Dict[str, int] = {}
+        # Per rank: (signal codes, escalated) of each sequence counted for it
+        self._rank_sequences: List[List[Tuple[bytes, bool]]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._priorities = np.zeros(0, dtype=np.uint64)
+    
+    def _new_rank(self, transcript_id: str) -> int:
+        """Number a transcript after every transcript counted so far"""
+        rank = len(self.transcript_ids)
+        self.transcript_ids.append(transcript_id)
+        self._rank_of[transcript_id] = rank
+        self._rank_sequences.append([])
+        if rank == len(self._alive):
+            capacity = max(1024, 2 * rank)
+            self._alive = np.concatenate((self._alive, np.zeros(capacity - rank, dtype=bool)))
+            self._priorities = np.concatenate((self._priorities, np.zeros(capacity - rank, dtype=np.uint64)))
+        self._alive[rank] = True
+        self._priorities[rank] = example_priority(transcript_id, self.seed)
+        return rank
+    
+    def _record_sequence(self, sequence: TemporalSignalSequence) -> Set[int]:
+        """
+        Count every chain of one transcript's sequence
+        
+        Returns:
+            Packed keys of the chains whose counters changed
+        """
+        codes = self.alphabet.encode([s.type for s in sequence.signals])
+        return self._record_codes(sequence.transcript_id, codes,
+                                  sequence.outcome == Outcome.ESCALATED)
+    
+    def _record_codes(self, transcript_id: str, codes: bytes, escalated: bool) -> Set[int]:
+        """
+        Count every chain of one transcript's signal code sequence
+        
+        Returns:
+            Packed keys of the chains whose counters changed
+        """
+        rank = self._rank_of.get(transcript_id)
+        if rank is None:
+            rank = self._new_rank(transcript_id)
+        self._rank_sequences[rank].append((codes, escalated))
+        
+        priority = int(self._priorities[rank])
+        chain_counts = packed_chain_counts(codes, MAX_CHAIN_LENGTH)
+        for key, count in chain_counts.items():
+            counter = self.chain_counters.get(key)
+            if counter is None:
+                counter = self.chain_counters[key] = ChainCounter()
+            counter.add(rank, priority, count, escalated, self._alive)
+        return set(chain_counts)
+    
+    def _forget_transcript(self, transcript_id: str) -> Set[int]:
+        """
+        Subtract every count of a transcript
+        
+        Returns:
+            Packed keys of the chains whose counters changed
+        """
+        rank = self._rank_of.pop(transcript_id)
+        occurrences, escalated_counts = defaultdict(int), defaultdict(int)
+        for codes, escalated in self._rank_sequences[rank]:
+            for key, count in packed_chain_counts(codes, MAX_CHAIN_LENGTH).items():
+                occurrences[key] += count
+                if escalated:
+                    escalated_counts[key] += count
+        
+        self._rank_sequences[rank] = []
+        self.transcript_ids[rank] = None
+        self._alive[rank] = False
+        for key, count in occurrences.items():
+            counter = self.chain_counters[key]
+            counter.remove(rank, count, escalated_counts[key])
+            if counter.occurrences == 0:
+                del self.chain_counters[key]
+        return set(occurrences)
+    
+    def _recount_transcript(self, transcript_id: str,
+                            sequences: List[Tuple[bytes, bool]]) -> Set[int]:
+        """
+        Replace every counted sequence of a transcript, keeping its rank
+        
+        Returns:
+            Packed keys of the chains whose counters changed
+        """
+        rank = self._rank_of[transcript_id]
+        touched = self._forget_transcript(transcript_id)
+        for key in touched:
+            counter = self.chain_counters.get(key)
+            if counter is not None:
+                counter.freeze(self._alive)  # Drops the now dead rank
+        
+        self._rank_of[transcript_id] = rank
+        self.transcript_ids[rank] = transcript_id
+        self._alive[rank] = True
+        for codes, escalated in sequences:
+            touched |= self._record_codes(transcript_id, codes, escalated)
+        
+        for key in touched:
+            counter = self.chain_counters.get(key)
+            if counter is not None and len(counter.examples) < min(EXAMPLE_SAMPLE_SIZE, counter.support):
+                counter.refill_examples(self._alive, self._priorities)
+        return touched
+    
+    def add_transcripts(self, transcripts: Iterable[dict],
+                        processed_turns: Optional[List[dict]] = None) -> int:
+        """
+        Count new transcripts into the existing statistics
+        
+        Only the chains of these transcripts are updated, so the cost is
+        proportional to the batch, not the corpus. A transcript whose id is
+        already counted replaces its earlier version.
+        
+        Args:
+            transcripts: New transcript dicts
+            processed_turns: Their processed turns; derived per transcript if omitted
+        
+        Returns:
+            Number of transcripts counted (those without turns are skipped)
+        """
+        turns_by_transcript = None
+        if processed_turns is not None:
+            turns_by_transcript = self.group_turns_by_transcript(processed_turns)
+        
+        touched = set()
+        counted = 0
+        for transcript in transcripts:
+            transcript_id = transcript["transcript_id"]
+            if transcript_id in self._rank_of:
+                touched |= self._forget_transcript(transcript_id)
+            
+            if turns_by_transcript is not None:
+                turns = turns_by_transcript.get(transcript_id, [])
+            else:
+                turns = transcript_turns(transcript)
+            if not turns:
+                continue
+            
+            sequence = self.build_temporal_sequence(transcript, turns)
+            touched |= self._record_sequence(sequence)
+            counted += 1
+        
+        self._refresh_chain_stats(touched)
+        return counted
+    
+    def remove_transcripts(self, transcript_ids: Iterable[str]) -> int:
+        """
+        Subtract transcripts from the statistics
+        
+        Args:
+            transcript_ids: Ids to remove; ids that are not counted are ignored
+        
+        Returns:
+            Number of transcripts removed
+        """
+        touched = set()
+        removed = 0
+        for transcript_id in transcript_ids:
+            if transcript_id in self._rank_of:
+                touched |= self._forget_transcript(transcript_id)
+                removed += 1
+        
+        self._refresh_chain_stats(touched)
+        return removed
+    
+    def _example_ids(self, counter: ChainCounter) -> List[str]:
+        return [self.transcript_ids[rank] for rank in counter.example_ranks()]
+    
+    def _refresh_chain_stats(self, keys: Iterable[int]):
+        """Re-derive the chain_table rows of changed chains"""
+        for key in keys:
+            counter = self.chain_counters.get(key)
+            if counter is None or counter.occurrences < self.min_evidence:
+                self.chain_table.discard(key)
+                continue
             
-            self.chain_stats[chain_key] = {
-                "occurrences": stats["occurrences"],
-                "escalated_count": stats["escalated_count"],
-                "resolved_count": stats["resolved_count"],
-                "confidence": confidence,
-                "confidence_interval": confidence_interval,
-                "examples": stats["examples"],
+            if len(counter.examples) < min(EXAMPLE_SAMPLE_SIZE, counter.support):
+                counter.refill_examples(self._alive, self._priorities)
+            self.chain_table.put(key, counter.occurrences, counter.escalated_count,
+                                 counter.resolved_count, counter.support, self._example_ids(counter))
+        self.stats_version += 1
+    
+    def _finalize_chain_stats(self, min_evidence: int) -> Mapping[Tuple[str, ...], dict]:
+        """Apply min_evidence and compute confidence scores for every chain"""
+        self.min_evidence = min_evidence
+        self.stats_version += 1
+        reported = []
+        for key, counter in self.chain_counters.items():
+            counter.freeze(self._alive)
+            if counter.occurrences < min_evidence:
+                continue  # Skip chains with insufficient evidence
+            reported.append((key, counter))
+        
+        self.chain_table = ChainStatsTable(self.alphabet)
+        self.chain_table.extend(
+            [key for key, _ in reported],
+            [counter.occurrences for _, counter in reported],
+            [counter.escalated_count for _, counter in reported],
+            [counter.resolved_count for _, counter in reported],
+            [counter.support for _, counter in reported],
+            [self._example_ids(counter) for _, counter in reported]
+        )
+        self.chain_stats = ChainStatsView(self.chain_table)
+        return self.chain_stats
+    
+    def mine_chains(self, min_evidence: Optional[int] = None,
+                    max_length: int = DEFAULT_MAX_PATTERN_LENGTH,
+                    max_gap: Optional[int] = 0,
+                    max_patterns: Optional[int] = None) -> Dict[Tuple[str, ...], dict]:
+        """
+        Mine signal patterns longer than MAX_CHAIN_LENGTH from the counted transcripts
+        
+        Patterns are grown one signal at a time and only while they still
+        occur in at least min_evidence transcripts, so long, signal-heavy
+        calls do not enumerate every sub-chain.
+        
+        Unlike chain_stats (which counts every position a chain occurs at),
+        mined counts are per transcript: occurrences is the number of
+        transcripts containing the pattern, split into escalated/resolved.
+        
+        Args:
+            min_evidence: Minimum containing transcripts (default: self.min_evidence)
+            max_length: Longest pattern in signals
+            max_gap: Other signals allowed between consecutive pattern signals
+                     (0: contiguous chains, None: any gap)
+            max_patterns: Stop after this many patterns
+        
+        Returns:
+            {chain_key: stats} in the chain_stats format, plus 'max_gap'
+        """
+        if min_evidence is None:
+            min_evidence = self.min_evidence
+        
+        owners, escalated, code_sequences = [], [], []
+        for rank in np.flatnonzero(self._alive[:len(self.transcript_ids)]):
+            for codes, is_escalated in self._rank_sequences[rank]:
+                owners.append(rank)
+                escalated.append(is_escalated)
+                code_sequences.append(codes)
+        owners = np.asarray(owners, dtype=np.int64)
+        escalated = np.asarray(escalated, dtype=bool)
+        
+        mined = {}
+        for pattern, indices in mine_sequential_patterns(code_sequences, min_evidence,
+                                                         max_length=max_length, max_gap=max_gap,
+                                                         max_patterns=max_patterns):
+            occurrences = len(indices)
+            escalated_count = int(escalated[indices].sum())
+            supporting = np.unique(owners[indices])
+            sample = supporting[np.lexsort((supporting, self._priorities[supporting]))[:EXAMPLE_SAMPLE_SIZE]]
+            mined[self.alphabet.decode(pattern)] = {
+                "occurrences": occurrences,
+                "escalated_count": escalated_count,
+                "resolved_count": occurrences - escalated_count,
+                "confidence": escalated_count / occurrences,
+                "confidence_interval": self._wilson_ci(escalated_count, occurrences),
+                "support": len(supporting),
+                "examples": [self.transcript_ids[rank] for rank in np.sort(sample)],
+                "max_gap": max_gap,
                 "valid": True
             }
+        return mined
+    
+    def chain_transcripts(self, chain_key: Tuple[str, ...], after: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[str]:
+        """
+        Transcripts supporting a chain, in processing order
         
-        return self.chain_stats
+        Args:
+            chain_key: Chain signals
+            after: Transcript id to resume after (None for the start)
+            limit: Maximum number of ids (None for all)
+        
+        Returns:
+            Transcript ids ([] for unknown chains)
+        
+        Raises:
+            KeyError: If after is not a counted transcript
+        """
+        key = self.alphabet.pack(chain_key)
+        counter = self.chain_counters.get(key) if key is not None else None
+        if counter is None:
+            return []
+        rank = -1 if after is None else self._rank_of[after]
+        return [self.transcript_ids[r] for r in counter.page(self._alive, rank, limit)]
     
     def find_best_chain_for_transcript(self, transcript_id: str,
                                       sequence: TemporalSignalSequence,
@@ -189,26 +756,35 @@ class CausalChainDetector:
         Returns:
             List of (CausalChain, match_score) tuples, ranked by match_score
         """
-        chains = self.extract_chains_from_sequence(sequence)
+        # One walk of packed keys per start position scores every sub-chain;
+        # CausalChain objects are only built for the top_k returned
+        signal_types = [s.type for s in sequence.signals]
+        codes = [self.alphabet.lookup(signal) for signal in signal_types]
+        confidence = self.chain_table.confidence
         chain_scores = []
         
-        for chain in chains:
-            chain_key = tuple(chain.signals)
-            
-            # Look up statistics for this chain
-            if chain_key in self.chain_stats:
-                stats = self.chain_stats[chain_key]
-                match_score = stats["confidence"]
-            else:
-                # Chain not in statistics, use default low score
-                match_score = 0.1
-            
-            chain_scores.append((chain, match_score))
+        for start in range(len(codes)):
+            for end, row in enumerate(self.chain_table.walk(codes, start, MAX_CHAIN_LENGTH), start + 1):
+                if row is not None:
+                    match_score = float(confidence[row])
+                else:
+                    # Chain not in statistics, use default low score
+                    match_score = 0.1
+                
+                chain_scores.append((match_score, start, end))
         
         # Sort by score, descending
-        chain_scores.sort(key=lambda x: x[1], reverse=True)
+        chain_scores.sort(key=lambda x: x[0], reverse=True)
         
-        return chain_scores[:top_k]
+        return [
+            (CausalChain(
+                signals=signal_types[start:end],
+                outcome=sequence.outcome,
+                confidence=0.0,
+                evidence_count=1
+            ), match_score)
+            for match_score, start, end in chain_scores[:top_k]
+        ]
     
     def get_alternative_chains(self, primary_chain: CausalChain,
                               sequence: TemporalSignalSequence,
@@ -256,8 +832,8 @@ class CausalChainDetector:
         
         return (lower, upper)
     
-    def export_chains(self, filepath: str):
-        """Export chain statistics to JSON for inspection"""
+    def chain_stats_json(self) -> Dict[str, dict]:
+        """chain_stats with JSON-friendly keys ("a → b") and values"""
         # Convert tuples to strings for JSON serialization
         export_data = {}
         for chain_key, stats in self.chain_stats.items():
@@ -266,9 +842,12 @@ class CausalChainDetector:
                 **stats,
                 "confidence_interval": [round(x, 3) for x in stats["confidence_interval"]]
             }
-        
+        return export_data
+    
+    def export_chains(self, filepath: str):
+        """Export chain statistics to JSON for inspection"""
         with open(filepath, "w") as f:
-            json.dump(export_data, f, indent=2)
+            json.dump(self.chain_stats_json(), f, indent=2)
     
     def print_top_chains(self, top_k: int = 10, min_confidence: float = 0.3):
         """Print top causal chains sorted by confidence and evidence"""
@@ -4,12 +4,19 @@ Main interface for query-driven causal reasoning
 """
 
 from typing import List, Dict, Optional, Tuple
+import itertools
 import json
 
 from src.causal_model import CausalExplanation, CausalChain, Signal, Outcome, TemporalSignalSequence
 from src.causal_chains import CausalChainDetector
-from src.signal_extraction import extract_signals, get_signal_confidence
+from src.explanation_cache import DEFAULT_CACHE_SIZE, ExplanationCache
+from src.similarity_index import SimilarityIndex
+from src.signal_extraction import get_turn_signal_confidences
 from src.preprocess import label_outcome
+from src.turn_table import TurnTable
+
+# Numbers engines, so engines sharing an explanation cache never share entries
+_engine_ids = itertools.count(1)
 
 
 class CausalQueryEngine:
@@ -19,23 +26,47 @@ class CausalQueryEngine:
     
     def __init__(self, chain_detector: CausalChainDetector, 
                  all_transcripts: Dict[str, dict],
-                 all_processed_turns: List[dict]):
+                 all_processed_turns: List[dict],
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 similarity_index: Optional[SimilarityIndex] = None,
+                 explanation_cache: Optional[ExplanationCache] = None):
         """
         Initialize query engine
         
         Args:
             chain_detector: Pre-computed CausalChainDetector with statistics
-            all_transcripts: Dict mapping transcript_id → transcript
+            all_transcripts: Mapping transcript_id → transcript (a dict, or a
+                TranscriptStore that decodes transcripts on demand)
             all_processed_turns: All turns with signal info
+            cache_size: Maximum number of cached explanations
+            similarity_index: Optional index ranking transcripts for find_similar_cases
+            explanation_cache: Cache to use instead of a new one of cache_size;
+                passing the cache of a previous engine keeps its view counts,
+                so warm_explanations can re-warm the most viewed transcripts
         """
         self.detector = chain_detector
         self.transcripts = all_transcripts
         self.processed_turns = all_processed_turns
         self.turn_index = self._build_turn_index(all_processed_turns)
+        if explanation_cache is None:
+            explanation_cache = ExplanationCache(cache_size)
+        self.explanation_cache = explanation_cache
+        self.engine_id = next(_engine_ids)
+        self.similarity_index = similarity_index
     
-    def _build_turn_index(self, turns: List[dict]) -> Dict[str, List[dict]]:
-        """Build index: transcript_id → turns for fast lookup"""
+    def _build_turn_index(self, turns: List[dict]) -> Dict[str, list]:
+        """
+        Build index: transcript_id → turns for fast lookup
+        
+        For a TurnTable the index holds the transcript positions instead,
+        and rows are only created when a transcript's turns are read.
+        """
         index = {}
+        if isinstance(turns, TurnTable):
+            for position, tid in enumerate(turns.transcript_ids):
+                index.setdefault(tid, []).append(position)
+            return index
+        
         for turn in turns:
             tid = turn["transcript_id"]
             if tid not in index:
@@ -43,10 +74,63 @@ class CausalQueryEngine:
             index[tid].append(turn)
         return index
     
+    def _transcript_turns(self, transcript_id: str) -> List[dict]:
+        """Turns of a transcript in order (empty if unknown)"""
+        entry = self.turn_index.get(transcript_id, [])
+        table = self.processed_turns
+        if not isinstance(table, TurnTable):
+            return entry
+        starts = table.transcript_starts
+        return [table[row] for position in entry
+                for row in range(int(starts[position]), int(starts[position + 1]))]
+    
     def explain_escalation(self, transcript_id: str) -> Optional[CausalExplanation]:
         """
         MAIN QUERY FUNCTION: "Why did this transcript escalate?"
         
+        Explanations are cached per transcript, engine and chain_stats version;
+        concurrent calls for the same transcript compute it only once.
+        The returned explanation is shared and must not be modified.
+        
+        Args:
+            transcript_id: ID of transcript to explain
+        
+        Returns:
+            CausalExplanation with chain, evidence, and confidence
+            or None if transcript not found
+        """
+        return self.explanation_cache.get_or_compute(
+            transcript_id, self._explanation_version(),
+            lambda: self._compute_explanation(transcript_id)
+        )
+    
+    def warm_explanations(self, transcript_ids: Optional[List[str]] = None,
+                          top_n: int = 100) -> int:
+        """
+        Precompute explanations in bulk
+        
+        Args:
+            transcript_ids: Transcripts to warm (default: the top_n most
+                viewed ones, e.g. again after chain_stats changed)
+            top_n: Number of most-viewed transcripts to warm
+        
+        Returns:
+            Number of explanations computed
+        """
+        if transcript_ids is None:
+            transcript_ids = self.explanation_cache.most_viewed(top_n)
+        return self.explanation_cache.warm(
+            transcript_ids, self._explanation_version(), self._compute_explanation
+        )
+    
+    def _explanation_version(self) -> Tuple[int, int]:
+        """Cache version of explanations: this engine and its chain_stats version"""
+        return self.engine_id, self.detector.stats_version
+    
+    def _compute_explanation(self, transcript_id: str) -> Optional[CausalExplanation]:
+        """
+        Compute the explanation of a transcript (uncached)
+        
         Algorithm:
         1. Validate transcript exists
         2. Build temporal signal sequence
@@ -70,7 +154,7 @@ class CausalQueryEngine:
         transcript = self.transcripts[transcript_id]
         
         # Get turns for this transcript
-        turns = self.turn_index.get(transcript_id, [])
+        turns = self._transcript_turns(transcript_id)
         if not turns:
             return None
         
@@ -119,17 +203,25 @@ class CausalQueryEngine:
         return self.explain_escalation(transcript_id)
     
     def find_similar_cases(self, transcript_id: str, 
-                          top_k: int = 5) -> List[str]:
+                          top_k: int = 5, mode: str = "exact") -> List[str]:
         """
         Find other transcripts with similar causal patterns
         
+        With a similarity index, transcripts are ranked by cosine similarity
+        of their signal patterns; otherwise stored examples of the
+        transcript's best chain are returned.
+        
         Args:
             transcript_id: Reference transcript
             top_k: Return top K similar cases
+            mode: "exact" or "lsh" (approximate) search in the similarity index
         
         Returns:
             List of similar transcript IDs
         """
+        if self.similarity_index is not None:
+            return [tid for tid, _ in self.find_similar_scored(transcript_id, top_k, mode)]
+        
         # Get explanation for reference
         explanation = self.explain_escalation(transcript_id)
         if not explanation:
@@ -146,6 +238,17 @@ class CausalQueryEngine:
         
         return similar[:top_k]
     
+    def find_similar_scored(self, transcript_id: str, top_k: int = 5,
+                            mode: str = "exact") -> List[Tuple[str, float]]:
+        """
+        Nearest transcripts with their cosine similarity (best first)
+        
+        Requires a similarity index; returns [] without one.
+        """
+        if self.similarity_index is None:
+            return []
+        return self.similarity_index.most_similar(transcript_id, top_k=top_k, mode=mode)
+    
     def analyze_chain_pattern(self, chain_signals: Tuple[str, ...]) -> Optional[dict]:
         """
         Get detailed statistics for a specific causal chain pattern
@@ -233,21 +336,22 @@ class CausalQueryEngine:
         Returns:
             List of quote dicts: {turn, speaker, text}
         """
-        turns = self.turn_index.get(transcript_id, [])
+        turns = self._transcript_turns(transcript_id)
         quotes = []
         
-        # For each signal type, find a supporting quote
+        # Scan each turn once, then pick a supporting quote per signal type
+        turn_signals = [dict(get_turn_signal_confidences(turn)) for turn in turns]
+        
         for signal_type in signal_types:
-            for turn in turns:
+            for turn, signals in zip(turns, turn_signals):
                 # Check if this turn has the signal
-                signals = extract_signals(turn)
                 if signal_type in signals:
                     quotes.append({
                         "turn_number": turn["turn_number"],
                         "speaker": turn["speaker"],
                         "text": turn["text"],
                         "signal": signal_type,
-                        "confidence": get_signal_confidence(turn, signal_type)
+                        "confidence": signals[signal_type]
                     })
                     break  # One quote per signal type
         
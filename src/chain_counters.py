@@ -0,0 +1,176 @@
+"""
+Chain Counters Module - Raw per-chain counters behind chain_stats
+Occurrence and outcome counts, supporting transcripts and sampled examples, updatable in both directions
+"""
+
+import hashlib
+from array import array
+from bisect import insort
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.chain_postings import PostingList
+
+# Example transcripts kept per chain
+EXAMPLE_SAMPLE_SIZE = 10
+
+# New postings are buffered and folded into the compressed list once the
+# buffer outgrows max(_FREEZE_MIN, 1/_FREEZE_RATIO of the list)
+_FREEZE_MIN = 256
+_FREEZE_RATIO = 8
+
+
+def example_priority(transcript_id: str, seed: int = 0) -> int:
+    """
+    Pseudo-random 64-bit priority of a transcript
+
+    Each chain keeps the supporting transcripts with the lowest priorities
+    as its examples: a uniform random sample that depends only on the set
+    of transcripts, not on the order they were counted in.
+    """
+    digest = hashlib.blake2b(transcript_id.encode("utf-8"), digest_size=8,
+                             key=seed.to_bytes(8, "little"))
+    return int.from_bytes(digest.digest(), "little")
+
+
+class ChainCounter:
+    """
+    Counters of one chain over the transcripts currently counted
+
+    Supporting transcripts are kept as ascending ranks: a compressed
+    PostingList plus a buffer of newer ranks. Ranks of removed transcripts
+    are filtered out with the caller's alive mask until the next fold.
+    """
+
+    __slots__ = ("occurrences", "escalated_count", "resolved_count", "support",
+                 "postings", "tail", "last_rank", "examples")
+
+    def __init__(self):
+        self.occurrences = 0
+        self.escalated_count = 0
+        self.resolved_count = 0
+        self.support = 0  # Distinct supporting transcripts
+        self.postings: Optional[PostingList] = None
+        self.tail = array("I")
+        self.last_rank = -1
+        self.examples: List[Tuple[int, int]] = []  # (priority, rank), lowest priorities, ascending
+
+    def _has_rank(self, rank: int) -> bool:
+        if rank > self.last_rank:
+            return False
+        if rank in self.tail:
+            return True
+        return self.postings is not None and list(self.postings.after(rank - 1, 1)) == [rank]
+
+    def add(self, rank: int, priority: int, occurrences: int, escalated: bool,
+            alive: np.ndarray) -> None:
+        """
+        Count occurrences of the chain in one transcript sequence
+
+        A transcript counted more than once (repeated id) supports the
+        chain only once. Ranks below last_rank are merged into the
+        postings instead of appended.
+        """
+        self.occurrences += occurrences
+        if escalated:
+            self.escalated_count += occurrences
+        else:
+            self.resolved_count += occurrences
+        if self._has_rank(rank):
+            return
+
+        self.support += 1
+        if rank > self.last_rank:
+            self.tail.append(rank)
+            self.last_rank = rank
+        else:
+            # An earlier transcript counted again (e.g. recounted under its
+            # first rank): merge it in so the ranks stay ascending
+            merged = np.union1d(self.ranks(alive), [rank])
+            self.postings = PostingList.from_sorted(merged, max(len(alive), self.last_rank + 1))
+            self.tail = array("I")
+        if len(self.tail) > max(_FREEZE_MIN, len(self.postings or ()) // _FREEZE_RATIO):
+            self.freeze(alive)
+
+        if len(self.examples) < EXAMPLE_SAMPLE_SIZE or priority < self.examples[-1][0]:
+            insort(self.examples, (priority, rank))
+            del self.examples[EXAMPLE_SAMPLE_SIZE:]
+
+    def remove(self, rank: int, occurrences: int, escalated_count: int) -> None:
+        """Undo every count of one transcript (its postings entry dies with it)"""
+        self.occurrences -= occurrences
+        self.escalated_count -= escalated_count
+        self.resolved_count -= occurrences - escalated_count
+        self.support -= 1
+        self.examples = [example for example in self.examples if example[1] != rank]
+
+    def merge(self, occurrences: int, escalated_count: int, resolved_count: int,
+              ranks: np.ndarray, examples: Sequence[Tuple[int, int]], alive: np.ndarray) -> None:
+        """
+        Add another counter of the same chain (ranks already renumbered)
+
+        Transcripts present in both are supporting once, as in add.
+        """
+        self.occurrences += occurrences
+        self.escalated_count += escalated_count
+        self.resolved_count += resolved_count
+
+        ranks = np.unique(np.asarray(ranks, dtype=np.int64))
+        if len(ranks) and ranks[0] > self.last_rank:
+            self.tail.frombytes(ranks.astype(np.uint32).tobytes())
+            self.support += len(ranks)
+        elif len(ranks):
+            merged = np.union1d(self.ranks(alive), ranks)
+            self.postings = PostingList.from_sorted(merged, len(alive))
+            self.tail = array("I")
+            self.support = len(merged)
+        if len(ranks):
+            self.last_rank = max(self.last_rank, int(ranks[-1]))
+        if len(self.tail) > max(_FREEZE_MIN, len(self.postings or ()) // _FREEZE_RATIO):
+            self.freeze(alive)
+
+        self.examples = sorted(set(self.examples).union(map(tuple, examples)))[:EXAMPLE_SAMPLE_SIZE]
+
+    def ranks(self, alive: np.ndarray) -> np.ndarray:
+        """Ranks of the live supporting transcripts, ascending"""
+        frozen = self.postings.to_array() if self.postings is not None else np.empty(0, dtype=np.int64)
+        ranks = np.concatenate((frozen, np.array(self.tail, dtype=np.int64)))
+        return ranks[alive[ranks]]
+
+    def freeze(self, alive: np.ndarray) -> None:
+        """Fold buffered ranks into the compressed list, dropping dead ranks"""
+        ranks = self.ranks(alive)
+        self.postings = PostingList.from_sorted(ranks, max(len(alive), self.last_rank + 1))
+        self.tail = array("I")
+
+    def page(self, alive: np.ndarray, after_rank: int = -1,
+             limit: Optional[int] = None) -> np.ndarray:
+        """Up to limit live ranks greater than after_rank, ascending"""
+        found = []
+        count = 0
+        rank = after_rank
+        while self.postings is not None and (limit is None or count < limit):
+            chunk = self.postings.after(rank, None if limit is None else limit - count)
+            if not len(chunk):
+                break
+            rank = int(chunk[-1])
+            live = chunk[alive[chunk]]
+            found.append(live)
+            count += len(live)
+
+        tail = np.array(self.tail, dtype=np.int64)
+        tail = tail[tail > rank]
+        found.append(tail[alive[tail]])
+        ranks = np.concatenate(found)
+        return ranks if limit is None else ranks[:limit]
+
+    def refill_examples(self, alive: np.ndarray, priorities: np.ndarray) -> None:
+        """Re-sample examples from the postings after removals emptied slots"""
+        ranks = self.ranks(alive)
+        order = np.lexsort((ranks, priorities[ranks]))[:EXAMPLE_SAMPLE_SIZE]
+        self.examples = [(int(priorities[ranks[i]]), int(ranks[i])) for i in order]
+
+    def example_ranks(self) -> List[int]:
+        """Ranks of the sampled examples, ascending"""
+        return sorted(rank for _, rank in self.examples)
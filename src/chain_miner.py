@@ -0,0 +1,94 @@
+"""
+Chain Miner Module - PrefixSpan-style mining of long signal patterns
+Only patterns that already meet the evidence threshold are extended, optionally across gaps
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Longest pattern mined by default
+DEFAULT_MAX_PATTERN_LENGTH = 6
+
+# Projection of a pattern: sequence index → end positions of its embeddings, ascending
+Projection = Dict[int, List[int]]
+
+
+def _extend(sequences: Sequence[Sequence[int]], projection: Projection,
+            max_gap: Optional[int]) -> Dict[int, Projection]:
+    """Projections of every one-item extension of a pattern"""
+    extensions: Dict[int, Projection] = defaultdict(dict)
+    for index, ends in projection.items():
+        sequence = sequences[index]
+        if max_gap is None:
+            # Any later position extends the earliest embedding
+            positions = range(ends[0] + 1, len(sequence))
+        elif max_gap == 0:
+            positions = [end + 1 for end in ends if end + 1 < len(sequence)]
+        else:
+            reachable = set()
+            for end in ends:
+                reachable.update(range(end + 1, min(len(sequence), end + 2 + max_gap)))
+            positions = sorted(reachable)
+        for position in positions:
+            extensions[sequence[position]].setdefault(index, []).append(position)
+    return extensions
+
+
+def mine_sequential_patterns(sequences: Sequence[Sequence[int]], min_count: int,
+                             max_length: int = DEFAULT_MAX_PATTERN_LENGTH,
+                             max_gap: Optional[int] = 0,
+                             max_patterns: Optional[int] = None) -> Iterator[Tuple[Tuple[int, ...], np.ndarray]]:
+    """
+    Frequent ordered patterns of item sequences, depth first
+
+    A pattern is contained in a sequence if its items occur in order with
+    at most max_gap other items between consecutive ones (0: contiguous,
+    None: any gap). Its count is the number of sequences containing it,
+    which can only shrink as a pattern grows, so patterns below min_count
+    are never extended (Apriori pruning). Each sequence keeps only the
+    end positions of the current pattern's embeddings (pseudo-projection).
+
+    Args:
+        sequences: Item code sequences
+        min_count: Minimum number of containing sequences
+        max_length: Longest pattern
+        max_gap: Items allowed between consecutive pattern items (None: unbounded)
+        max_patterns: Stop after this many patterns (None: no limit)
+
+    Yields:
+        (pattern, ascending indices of the sequences containing it)
+    """
+    min_count = max(1, min_count)
+    singles: Dict[int, Projection] = defaultdict(dict)
+    for index, sequence in enumerate(sequences):
+        for position, item in enumerate(sequence):
+            singles[item].setdefault(index, []).append(position)
+
+    stack = [((item,), projection) for item, projection in sorted(singles.items(), reverse=True)
+             if len(projection) >= min_count]
+    emitted = 0
+    while stack:
+        pattern, projection = stack.pop()
+        yield pattern, np.fromiter(sorted(projection), dtype=np.int64, count=len(projection))
+        emitted += 1
+        if max_patterns is not None and emitted >= max_patterns:
+            return
+        if len(pattern) >= max_length:
+            continue
+        extensions = _extend(sequences, projection, max_gap)
+        for item in sorted(extensions, reverse=True):
+            if len(extensions[item]) >= min_count:
+                stack.append((pattern + (item,), extensions[item]))
+
+
+def mine_signal_patterns(signal_sequences: Sequence[Sequence[str]], min_count: int,
+                         **kwargs) -> Iterator[Tuple[Tuple[str, ...], np.ndarray]]:
+    """mine_sequential_patterns over signal type names"""
+    alphabet: Dict[str, int] = {}
+    encoded = [[alphabet.setdefault(signal, len(alphabet)) for signal in sequence]
+               for sequence in signal_sequences]
+    names: List[str] = list(alphabet)
+    for pattern, indices in mine_sequential_patterns(encoded, min_count, **kwargs):
+        yield tuple(names[code] for code in pattern), indices
@@ -0,0 +1,143 @@
+"""
+Chain Postings Module - Compressed posting lists of transcripts supporting a causal chain
+Sorted transcript ranks stored delta + varint encoded with skip blocks, or as a bitmap when dense
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from src.bitmap_index import Bitmap
+
+# Ranks per skip block of a delta-encoded list
+BLOCK_SIZE = 128
+
+_VARINT_BYTES = 5  # Enough for any uint32 delta
+
+
+def encode_varints(values: np.ndarray) -> np.ndarray:
+    """LEB128 encoding of non-negative integers below 2**32, as uint8"""
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for j in range(1, _VARINT_BYTES):
+        lengths += values >= (1 << (7 * j))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    out = np.zeros(int(lengths.sum()), dtype=np.uint8)
+    for j in range(_VARINT_BYTES):
+        has = lengths > j
+        byte = (values[has] >> np.uint64(7 * j)) & np.uint64(0x7F)
+        byte |= np.where(lengths[has] > j + 1, np.uint64(0x80), np.uint64(0))
+        out[offsets[has] + j] = byte
+    return out
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    """Integers of a LEB128 byte array (inverse of encode_varints)"""
+    if not len(data):
+        return np.empty(0, dtype=np.int64)
+    last = data < 0x80
+    value_id = np.concatenate(([0], np.cumsum(last)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    shift = 7 * (np.arange(len(data)) - starts[value_id])
+    parts = (data & 0x7F).astype(np.int64) << shift
+    return np.bincount(value_id, weights=parts).astype(np.int64)
+
+
+class PostingList:
+    """
+    Immutable ascending list of transcript ranks
+
+    Sparse lists are stored as varint-encoded gaps, with the first rank
+    and byte offset of every BLOCK_SIZE-th entry kept as skip pointers,
+    so a page after any rank decodes only the blocks it returns. Lists
+    covering a large share of the corpus are stored as a Bitmap instead,
+    whichever is smaller.
+    """
+
+    __slots__ = ("size", "universe", "data", "block_first", "block_offset", "bitmap")
+
+    def __init__(self, size: int, universe: int, data: Optional[np.ndarray] = None,
+                 block_first: Optional[np.ndarray] = None, block_offset: Optional[np.ndarray] = None,
+                 bitmap: Optional[Bitmap] = None):
+        self.size = size
+        self.universe = universe
+        self.data = data
+        self.block_first = block_first
+        self.block_offset = block_offset
+        self.bitmap = bitmap
+
+    @classmethod
+    def from_sorted(cls, ranks: np.ndarray, universe: int) -> "PostingList":
+        """
+        Compress strictly ascending ranks in [0, universe)
+
+        Args:
+            ranks: Sorted, de-duplicated ranks
+            universe: Number of ranked transcripts
+        """
+        ranks = np.asarray(ranks, dtype=np.int64)
+        gaps = np.diff(ranks, prepend=0)
+        data = encode_varints(gaps)
+        bitmap_bytes = -(-universe // 64) * 8
+        if len(ranks) and bitmap_bytes < data.nbytes:
+            return cls(len(ranks), universe, bitmap=Bitmap.from_indices(ranks, universe))
+
+        ends = np.cumsum(data < 0x80)  # Varints completed after each byte
+        block_starts = np.arange(0, len(ranks), BLOCK_SIZE)
+        block_offset = np.concatenate(([0], np.searchsorted(ends, block_starts[1:]) + 1, [len(data)]))
+        return cls(len(ranks), universe, data=data,
+                   block_first=ranks[block_starts],
+                   block_offset=block_offset.astype(np.int64))
+
+    @property
+    def encoding(self) -> str:
+        return "bitmap" if self.bitmap is not None else "delta"
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        if self.bitmap is not None:
+            return self.bitmap.nbytes
+        return self.data.nbytes + self.block_first.nbytes + self.block_offset.nbytes
+
+    def _decode_blocks(self, first: int, last: int) -> np.ndarray:
+        """Ranks stored in blocks first..last-1"""
+        gaps = decode_varints(self.data[self.block_offset[first]:self.block_offset[last]])
+        # The first gap of a block is relative to the previous block's last rank
+        return self.block_first[first] + np.cumsum(gaps) - gaps[0] if len(gaps) else gaps
+
+    def to_array(self) -> np.ndarray:
+        """All ranks, ascending"""
+        if self.bitmap is not None:
+            return self.bitmap.to_indices()
+        return self._decode_blocks(0, len(self.block_first))
+
+    def after(self, rank: int = -1, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Up to limit ranks greater than rank, ascending
+
+        Args:
+            rank: Rank to resume after (-1 for the start)
+            limit: Maximum number of ranks (None for all)
+        """
+        if self.bitmap is not None:
+            ranks = self.bitmap.to_indices()
+            ranks = ranks[np.searchsorted(ranks, rank, side="right"):]
+            return ranks if limit is None else ranks[:limit]
+
+        num_blocks = len(self.block_first)
+        block = max(int(np.searchsorted(self.block_first, rank, side="right")) - 1, 0)
+        wanted = self.size if limit is None else limit
+        found = np.empty(0, dtype=np.int64)
+        while block < num_blocks and len(found) < wanted:
+            stop = min(num_blocks, block + 1 + -(-(wanted - len(found)) // BLOCK_SIZE))
+            ranks = self._decode_blocks(block, stop)
+            found = np.concatenate((found, ranks[ranks > rank]))
+            block = stop
+        return found[:wanted]
+
+    def __repr__(self):
+        return f"PostingList({self.size} ranks, {self.encoding}, {self.nbytes} bytes)"
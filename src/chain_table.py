@@ -0,0 +1,344 @@
+"""
+Chain Table Module - Compact storage of chain statistics
+Signal types interned as small integer codes, chain keys packed into one integer,
+per-chain statistics in parallel NumPy arrays indexed by chain id
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bits per signal in a packed chain key; code 0 marks an unused position
+BITS_PER_SIGNAL = 5
+MAX_SIGNAL_CODE = (1 << BITS_PER_SIGNAL) - 1
+
+# Longest chain that packs into a non-negative int64
+MAX_PACKED_LENGTH = 63 // BITS_PER_SIGNAL
+
+# Bit offset of each chain position; the first signal is most significant,
+# so sorted keys order chains lexicographically with prefixes first
+_SHIFTS = [BITS_PER_SIGNAL * (MAX_PACKED_LENGTH - 1 - position) for position in range(MAX_PACKED_LENGTH)]
+
+
+class SignalAlphabet:
+    """Signal type names ↔ codes 1..MAX_SIGNAL_CODE, numbered in order of first use"""
+
+    def __init__(self, names: Sequence[str] = ()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def code(self, signal: str) -> int:
+        """Code of a signal type, interning it if new"""
+        code = self._codes.get(signal)
+        if code is None:
+            if len(self.names) >= MAX_SIGNAL_CODE:
+                raise ValueError(f"more than {MAX_SIGNAL_CODE} signal types")
+            self.names.append(signal)
+            code = self._codes[signal] = len(self.names)
+        return code
+
+    def lookup(self, signal: str) -> Optional[int]:
+        """Code of a known signal type, or None"""
+        return self._codes.get(signal)
+
+    def encode(self, signals: Sequence[str]) -> bytes:
+        """Codes of a signal sequence (interning new types), one byte each"""
+        return bytes(self.code(signal) for signal in signals)
+
+    def decode(self, codes: Sequence[int]) -> Tuple[str, ...]:
+        return tuple(self.names[code - 1] for code in codes)
+
+    def pack(self, chain_key: Sequence[str]) -> Optional[int]:
+        """Packed key of a chain, or None if it has unknown signals or is too long"""
+        codes = [self._codes.get(signal) for signal in chain_key]
+        if None in codes or len(codes) > MAX_PACKED_LENGTH:
+            return None
+        return pack_chain(codes)
+
+    def unpack(self, key: int) -> Tuple[str, ...]:
+        return self.decode(unpack_chain(key))
+
+
+def pack_chain(codes: Sequence[int]) -> int:
+    """Single-integer key of a chain of signal codes"""
+    if len(codes) > MAX_PACKED_LENGTH:
+        raise ValueError(f"chains longer than {MAX_PACKED_LENGTH} signals cannot be packed")
+    key = 0
+    for position, code in enumerate(codes):
+        key |= code << _SHIFTS[position]
+    return key
+
+
+def unpack_chain(key: int) -> Tuple[int, ...]:
+    """Signal codes of a packed key"""
+    codes = []
+    for shift in _SHIFTS:
+        code = (key >> shift) & MAX_SIGNAL_CODE
+        if not code:
+            break
+        codes.append(code)
+    return tuple(codes)
+
+
+def prefix_range(codes: Sequence[int]) -> Tuple[int, int]:
+    """[low, high) of the packed keys of every chain starting with codes"""
+    if not codes:
+        return 0, 1 << (BITS_PER_SIGNAL * MAX_PACKED_LENGTH)
+    low = pack_chain(codes)
+    return low, low + (1 << _SHIFTS[len(codes) - 1])
+
+
+def packed_chain_counts(codes: Sequence[int], max_length: int) -> Counter:
+    """
+    Occurrences of every contiguous sub-chain of a code sequence, by packed key
+
+    Same sub-chains as TemporalSignalSequence.get_chains_up_to_length.
+    """
+    counts = Counter()
+    max_length = min(max_length, MAX_PACKED_LENGTH)
+    for start in range(len(codes)):
+        key = 0
+        for position in range(min(max_length, len(codes) - start)):
+            key |= codes[start + position] << _SHIFTS[position]
+            counts[key] += 1
+    return counts
+
+
+def wilson_intervals(successes: np.ndarray, totals: np.ndarray,
+                     z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+    """Elementwise CausalChainDetector._wilson_ci (equal to within one ulp)"""
+    successes = np.asarray(successes, dtype=np.float64)
+    totals = np.asarray(totals, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = successes / totals
+        denominator = 1 + z**2 / totals
+        centre = (p + z**2 / (2 * totals)) / denominator
+        margin = z * np.sqrt(p * (1 - p) / totals + z**2 / (4 * totals)) / denominator
+    lower = np.where(totals == 0, 0.0, np.maximum(0.0, centre - margin))
+    upper = np.where(totals == 0, 1.0, np.minimum(1.0, centre + margin))
+    return lower, upper
+
+
+class ChainStatsTable:
+    """
+    Statistics of the reported chains, one row (chain id) per chain
+
+    Counts, confidence and interval bounds live in parallel arrays, so
+    filters and orderings over every chain are single NumPy operations.
+    Rows are appended in the order chains are first reported and never
+    move; a chain that drops out leaves a dead row behind. Chain keys
+    are packed integers, decoded to signal names only by chain_key and
+    entry.
+    """
+
+    _COLUMNS = {
+        "keys": np.int64,
+        "occurrences": np.int64,
+        "escalated_count": np.int64,
+        "resolved_count": np.int64,
+        "support": np.int64,
+        "confidence": np.float64,
+        "ci_low": np.float64,
+        "ci_high": np.float64,
+        "live": bool,
+    }
+
+    def __init__(self, alphabet: SignalAlphabet):
+        self.alphabet = alphabet
+        for name, dtype in self._COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.examples: List[Optional[List[str]]] = []  # Per row: example transcript ids
+        self._row_of: Dict[int, int] = {}  # Packed key → live row
+        self._size = 0
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None  # (keys, rows) of live rows, by key
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _reserve(self, count: int) -> None:
+        needed = self._size + count
+        if needed <= len(self.keys):
+            return
+        capacity = max(needed, 2 * len(self.keys), 64)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _derive(self, rows) -> None:
+        """Recompute confidence and its interval from the counts of rows"""
+        occurrences = self.occurrences[rows]
+        escalated = self.escalated_count[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.confidence[rows] = np.where(occurrences > 0, escalated / occurrences, 0.0)
+        self.ci_low[rows], self.ci_high[rows] = wilson_intervals(escalated, occurrences)
+
+    def extend(self, keys: Sequence[int], occurrences: Sequence[int], escalated_count: Sequence[int],
+               resolved_count: Sequence[int], support: Sequence[int],
+               examples: Sequence[List[str]]) -> None:
+        """Append rows for chains not in the table"""
+        count = len(keys)
+        self._reserve(count)
+        rows = slice(self._size, self._size + count)
+        self.keys[rows] = keys
+        self.occurrences[rows] = occurrences
+        self.escalated_count[rows] = escalated_count
+        self.resolved_count[rows] = resolved_count
+        self.support[rows] = support
+        self.live[rows] = True
+        self._derive(rows)
+        self.examples.extend(examples)
+        self._row_of.update(zip(keys, range(self._size, self._size + count)))
+        self._size += count
+        self._sorted = None
+
+    def put(self, key: int, occurrences: int, escalated_count: int, resolved_count: int,
+            support: int, examples: List[str]) -> int:
+        """Store the statistics of one chain, appending a row if it is new"""
+        row = self._row_of.get(key)
+        if row is None:
+            self.extend([key], [occurrences], [escalated_count], [resolved_count], [support], [examples])
+            return self._size - 1
+        self.occurrences[row] = occurrences
+        self.escalated_count[row] = escalated_count
+        self.resolved_count[row] = resolved_count
+        self.support[row] = support
+        self._derive([row])
+        self.examples[row] = examples
+        return row
+
+    def discard(self, key: int) -> None:
+        """Drop a chain (no-op if absent)"""
+        row = self._row_of.pop(key, None)
+        if row is not None:
+            self.live[row] = False
+            self.examples[row] = None
+            self._sorted = None
+
+    def row(self, key: int) -> Optional[int]:
+        """Live row of a packed key, or None"""
+        return self._row_of.get(key)
+
+    def find(self, chain_key: Sequence[str]) -> Optional[int]:
+        """Live row of a chain given by signal names, or None"""
+        key = self.alphabet.pack(chain_key)
+        return None if key is None else self._row_of.get(key)
+
+    def rows(self) -> np.ndarray:
+        """Live rows, in insertion order"""
+        return np.flatnonzero(self.live[:self._size])
+
+    def select(self, min_confidence: float = 0.0, min_evidence: int = 0) -> np.ndarray:
+        """Live rows meeting both thresholds, in insertion order"""
+        size = self._size
+        mask = (self.live[:size]
+                & (self.confidence[:size] >= min_confidence)
+                & (self.occurrences[:size] >= min_evidence))
+        return np.flatnonzero(mask)
+
+    def chain_key(self, row: int) -> Tuple[str, ...]:
+        return self.alphabet.unpack(int(self.keys[row]))
+
+    def entry(self, row: int) -> dict:
+        """chain_stats entry of a row"""
+        return {
+            "occurrences": int(self.occurrences[row]),
+            "escalated_count": int(self.escalated_count[row]),
+            "resolved_count": int(self.resolved_count[row]),
+            "confidence": float(self.confidence[row]),
+            "confidence_interval": (float(self.ci_low[row]), float(self.ci_high[row])),
+            "support": int(self.support[row]),
+            "examples": list(self.examples[row]),
+            "valid": True
+        }
+
+    def _prefix_rows(self, prefix: Sequence[str]) -> np.ndarray:
+        """Live rows of the chains starting with prefix, by packed key"""
+        codes = [self.alphabet.lookup(signal) for signal in prefix]
+        if None in codes or len(codes) > MAX_PACKED_LENGTH:
+            return np.empty(0, dtype=np.int64)
+        if self._sorted is None:
+            rows = self.rows()
+            order = np.argsort(self.keys[rows], kind="stable")
+            self._sorted = (self.keys[rows][order], rows[order])
+        keys, rows = self._sorted
+        low, high = prefix_range(codes)
+        return rows[np.searchsorted(keys, low):np.searchsorted(keys, high)]
+
+    def count_prefix(self, prefix: Sequence[str] = ()) -> int:
+        """Number of chains starting with prefix"""
+        return len(self._prefix_rows(prefix))
+
+    def top_k(self, prefix: Sequence[str] = (), k: int = 10, min_evidence: int = 0) -> np.ndarray:
+        """
+        Rows of the chains under prefix with the highest confidence
+
+        Ties are broken by occurrences (more first), then packed key.
+        """
+        rows = self._prefix_rows(prefix)
+        rows = rows[self.occurrences[rows] >= min_evidence]
+        order = np.lexsort((self.keys[rows], -self.occurrences[rows], -self.confidence[rows]))
+        return rows[order[:k]]
+
+    def walk(self, codes: Sequence[Optional[int]], start: int = 0,
+             max_length: Optional[int] = None) -> Iterator[Optional[int]]:
+        """
+        Rows of the sub-chains of codes beginning at start, shortest first
+
+        Yields a row (or None if not reported) for every length up to
+        max_length; None codes stand for signals outside the alphabet.
+        """
+        stop = len(codes) if max_length is None else min(len(codes), start + max_length)
+        key = 0
+        for position, index in enumerate(range(start, stop)):
+            code = codes[index]
+            if key is None or code is None or position >= MAX_PACKED_LENGTH:
+                key = None
+                yield None
+                continue
+            key |= code << _SHIFTS[position]
+            yield self._row_of.get(key)
+
+    def longest_match(self, signals: Sequence[str], start: int = 0,
+                      max_length: Optional[int] = None) -> Optional[int]:
+        """Row of the longest chain that signals[start:] begins with, or None"""
+        codes = [self.alphabet.lookup(signal) for signal in signals]
+        best = None
+        # A chain occurs at least as often as any longer chain it starts,
+        # so the first unreported length ends the search
+        for row in self.walk(codes, start, max_length):
+            if row is None:
+                break
+            best = row
+        return best
+
+
+class ChainStatsView(Mapping):
+    """Read-only {chain_key: stats} mapping over a ChainStatsTable; entries are built on access"""
+
+    def __init__(self, table: ChainStatsTable):
+        self.table = table
+
+    def __getitem__(self, chain_key) -> dict:
+        row = self.table.find(chain_key)
+        if row is None:
+            raise KeyError(chain_key)
+        return self.table.entry(row)
+
+    def __contains__(self, chain_key) -> bool:
+        return self.table.find(chain_key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[str, ...]]:
+        for row in self.table.rows():
+            yield self.table.chain_key(row)
+
+    def __len__(self) -> int:
+        return len(self.table)
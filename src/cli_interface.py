@@ -34,7 +34,7 @@ class CausalCLI:
         """Load data and initialize query engine"""
         print("🔄 Initializing Causal Analysis Engine...")
         print("   Loading transcripts...", end="", flush=True)
-        transcripts = load_transcripts()
+        transcripts = load_transcripts(use_snapshot=True)
         self.transcripts_dict = {t["transcript_id"]: t for t in transcripts}
         print(f" {len(transcripts)} loaded")
         
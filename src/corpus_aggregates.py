@@ -0,0 +1,130 @@
+"""
+Corpus Aggregates Module - Exact corpus-wide signal and warning counts
+Materialized once per loaded dataset from the per-turn signal matrix
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.config import EARLY_WARNING_CONFIG
+from src.signal_batch import SignalMatrix, extract_signals_batch
+
+# Default weights of detect_multi_signal_warning
+MULTI_SIGNAL_WEIGHTS = {
+    "customer_frustration": 0.5,
+    "agent_delay": 0.3,
+    "agent_denial": 0.2
+}
+
+
+def _transcript_codes(turns) -> np.ndarray:
+    """
+    Code of every turn's transcript_id (equal ids share a code)
+
+    The early_warning functions group turns by transcript_id, so turns of
+    repeated ids are grouped together here as well.
+    """
+    from src.turn_table import TurnTable
+
+    lookup = {}
+    if isinstance(turns, TurnTable):
+        id_codes = np.fromiter((lookup.setdefault(tid, len(lookup)) for tid in turns.transcript_ids),
+                               dtype=np.int64, count=turns.num_transcripts)
+        return id_codes[turns.transcript_codes]
+    return np.fromiter((lookup.setdefault(turn["transcript_id"], len(lookup)) for turn in turns),
+                       dtype=np.int64, count=len(turns))
+
+
+def compute_corpus_aggregates(turns, signal_matrix: Optional[SignalMatrix] = None,
+                              threshold: Optional[int] = None,
+                              signal_type: Optional[str] = None,
+                              signal_weights: Optional[Dict[str, float]] = None,
+                              confidence_threshold: float = 0.7,
+                              window_size: int = 3,
+                              high_risk_threshold: float = 0.7) -> dict:
+    """
+    Exact signal and warning counts over every turn of the corpus
+
+    Counts match running the early_warning detectors over all turns:
+    - single_signal_warnings: warnings from detect_early_warning (one per
+      transcript whose signal_type count reaches threshold)
+    - multi_signal_warnings: transcripts for which
+      detect_multi_signal_warning raises at least one warning
+    - multi_signal_warning_turns: warnings it raises in total
+    - high_risk_conversations: transcripts with an analyze_escalation_risk
+      window scoring above high_risk_threshold
+
+    Args:
+        turns: Processed turns (list of dicts or TurnTable)
+        signal_matrix: Signals aligned with turns (extracted if omitted)
+        threshold: Single-signal warning threshold (default from EARLY_WARNING_CONFIG)
+        signal_type: Signal tracked for single-signal warnings
+        signal_weights: Weights for multi-signal scoring
+        confidence_threshold: Multi-signal score that triggers a warning
+        window_size: Sliding window length for escalation risk
+        high_risk_threshold: Risk score above which a conversation is high risk
+
+    Returns:
+        dict of aggregate counts
+    """
+    if threshold is None:
+        threshold = EARLY_WARNING_CONFIG["default_threshold"]
+    if signal_type is None:
+        signal_type = EARLY_WARNING_CONFIG["signal_type"]
+    if signal_weights is None:
+        signal_weights = MULTI_SIGNAL_WEIGHTS
+    if signal_matrix is None:
+        signal_matrix = extract_signals_batch(turns)
+
+    signal_types = signal_matrix.signal_types
+    by_type = signal_matrix.counts()
+
+    # Regroup rows so every transcript is one contiguous block, keeping turn order
+    codes = _transcript_codes(turns)
+    num_transcripts = int(codes.max()) + 1 if len(codes) else 0
+    order = np.argsort(codes, kind="stable")
+    grouped = SignalMatrix(presence=signal_matrix.presence[order],
+                           confidence=signal_matrix.confidence[order],
+                           signal_types=signal_types)
+    codes = codes[order]
+    starts = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=num_transcripts))))
+
+    # Single-signal warnings: transcripts whose count reaches the threshold
+    per_transcript = grouped.group_counts(codes, num_transcripts)
+    if signal_type in signal_types:
+        single_warnings = int(np.count_nonzero(per_transcript[:, signal_types.index(signal_type)] >= threshold))
+    else:
+        single_warnings = 0
+
+    # Multi-signal warnings: running weighted score per transcript. Scores
+    # are accumulated signal by signal in turn order (np.nonzero is
+    # row-major), so float sums match the detector exactly.
+    rows, cols = np.nonzero(grouped.presence)
+    weights = np.array([signal_weights.get(s, 0.1) for s in signal_types], dtype=np.float64)
+    running = np.zeros(num_transcripts, dtype=np.float64)
+    warned_rows = set()
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        code = codes[row]
+        running[code] += weights[col]
+        if running[code] >= confidence_threshold:
+            warned_rows.add(row)
+    multi_turns = len(warned_rows)
+    multi_transcripts = len({int(codes[row]) for row in warned_rows})
+
+    # High risk: any full window whose normalized signal count exceeds the threshold
+    window_starts, totals = grouped.window_totals(starts, window_size)
+    risk = np.minimum(totals / (window_size * 2), 1.0)
+    high_risk = int(np.unique(codes[window_starts[risk > high_risk_threshold]]).size)
+
+    return {
+        "total_signals": int(sum(by_type.values())),
+        "by_type": by_type,
+        "turns_with_signals": int(np.count_nonzero(signal_matrix.presence.any(axis=1))),
+        "single_signal_warnings": single_warnings,
+        "multi_signal_warnings": multi_transcripts,
+        "multi_signal_warning_turns": multi_turns,
+        "high_risk_conversations": high_risk,
+        "total_transcripts": num_transcripts,
+        "total_turns": len(signal_matrix),
+    }
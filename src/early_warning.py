@@ -65,6 +65,7 @@ def detect_multi_signal_warning(processed_turns, signal_weights=None, confidence
         }
     
     warnings = []
+    warned_turns = set()  # (transcript_id, turn_number) pairs already warned
     tracker = defaultdict(lambda: {"score": 0.0, "signals": defaultdict(int)})
     
     for turn in processed_turns:
@@ -83,8 +84,8 @@ def detect_multi_signal_warning(processed_turns, signal_weights=None, confidence
             # Generate warning if confidence threshold is reached
             if tracker[tid]["score"] >= confidence_threshold:
                 # Check if this warning hasn't been already added
-                if not any(w["transcript_id"] == tid and w["turn_number"] == turn["turn_number"] 
-                          for w in warnings):
+                if (tid, turn["turn_number"]) not in warned_turns:
+                    warned_turns.add((tid, turn["turn_number"]))
                     warnings.append({
                         "transcript_id": tid,
                         "turn_number": turn["turn_number"],
@@ -112,7 +113,8 @@ def analyze_escalation_risk(processed_turns, window_size=3):
     risk_scores = defaultdict(list)
     transcript_windows = defaultdict(list)
     
-    # Build windows for each transcript
+    # Build windows for each transcript; only (turn_number, signal_count)
+    # is kept per turn so streamed input does not accumulate whole turns
     for turn in processed_turns:
         tid = turn["transcript_id"]
         
@@ -120,7 +122,7 @@ def analyze_escalation_risk(processed_turns, window_size=3):
         if "signals" not in turn:
             turn["signals"] = extract_signals(turn)
         
-        transcript_windows[tid].append(turn)
+        transcript_windows[tid].append((turn["turn_number"], len(turn.get("signals", []))))
     
     # Analyze each window
     for tid, turns in transcript_windows.items():
@@ -128,13 +130,13 @@ def analyze_escalation_risk(processed_turns, window_size=3):
             window = turns[i:i + window_size]
             
             # Count signals in window
-            signal_count = sum(len(turn.get("signals", [])) for turn in window)
+            signal_count = sum(count for _, count in window)
             
             risk_score = min(signal_count / (window_size * 2), 1.0)  # Normalize to 0-1
             
             if risk_score > 0:
                 risk_scores[tid].append({
-                    "turn_range": f"{window[0]['turn_number']}-{window[-1]['turn_number']}",
+                    "turn_range": f"{window[0][0]}-{window[-1][0]}",
                     "risk_score": risk_score,
                     "signal_count": signal_count
                 })
@@ -0,0 +1,154 @@
+"""
+Explanation Cache Module - Bounded LRU with single-flight computation
+Concurrent requests for the same key wait for one computation instead of repeating it
+"""
+
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 1024
+# Item ids whose views are tracked; the least viewed are dropped beyond it
+DEFAULT_MAX_VIEWS = 4096
+
+
+class _InFlight:
+    """A computation in progress that other callers can wait on"""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ExplanationCache:
+    """
+    Thread-safe LRU of computed values, keyed by (item id, version)
+
+    get_or_compute runs compute at most once per key at a time: callers
+    arriving while it runs wait for its result (or exception). Results,
+    including None, are cached until evicted. Cached values are shared,
+    so callers must treat them as read-only.
+
+    Views per item id are counted across versions, so the most-viewed
+    items can be re-warmed after the version changes. Only views that
+    produced a value (not None) count, and at most max_views ids are
+    tracked: on overflow the counter is trimmed to its most-viewed half.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE,
+                 max_views: int = DEFAULT_MAX_VIEWS):
+        self.max_size = max_size
+        self.max_views = max_views
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.views = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, item_id: Hashable, version: Hashable,
+                       compute: Callable[[], object], count_view: bool = True):
+        """
+        Cached value for (item_id, version), computing it if needed
+
+        Args:
+            item_id: Cached item (e.g. transcript id)
+            version: Version of the data the value depends on
+            compute: Zero-argument function producing the value
+            count_view: Count this call towards most_viewed
+        """
+        key = (item_id, version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = self._entries[key]
+                if count_view:
+                    self._count_view(item_id, value)
+                return value
+
+            flight = self._in_flight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if count_view:
+                with self._lock:
+                    self._count_view(item_id, flight.value)
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = flight.value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                if count_view:
+                    self._count_view(item_id, flight.value)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+        return flight.value
+
+    def _count_view(self, item_id: Hashable, value) -> None:
+        """Count a view of an item that has a value (caller holds the lock)"""
+        if value is None:
+            return
+        self.views[item_id] += 1
+        if len(self.views) > self.max_views:
+            self.views = Counter(dict(self.views.most_common(self.max_views // 2)))
+
+    def most_viewed(self, n: int) -> List[Hashable]:
+        """Item ids with the most views"""
+        with self._lock:
+            return [item_id for item_id, _ in self.views.most_common(n)]
+
+    def warm(self, item_ids: Iterable[Hashable], version: Hashable,
+             compute: Callable[[Hashable], object]) -> int:
+        """
+        Precompute values for many items without counting views
+
+        Returns:
+            Number of items that were not cached yet
+        """
+        computed = 0
+        for item_id in item_ids:
+            with self._lock:
+                cached = (item_id, version) in self._entries
+            if not cached:
+                self.get_or_compute(item_id, version, lambda: compute(item_id), count_view=False)
+                computed += 1
+        return computed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def cache_info(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "capacity": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
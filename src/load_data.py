@@ -1,10 +1,167 @@
+import io
 import json
 
-def load_transcripts(path="data/Conversational_Transcript_Dataset.json"):
+DEFAULT_DATASET_PATH = "data/Conversational_Transcript_Dataset.json"
+
+def load_transcripts(path=DEFAULT_DATASET_PATH, use_snapshot=False):
+    """
+    Load the transcripts list from the JSON dataset.
+
+    With use_snapshot=True, an up-to-date binary snapshot next to the
+    dataset (see src/snapshot.py) is memory-mapped instead, returning a
+    read-only sequence of transcript dicts. The JSON file is used whenever
+    no usable snapshot exists.
+    """
+    if use_snapshot:
+        try:
+            from src.snapshot import open_snapshot
+            snapshot = open_snapshot(path)
+        except ImportError:
+            snapshot = None
+        if snapshot is not None:
+            return snapshot.transcripts
+
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
     return data["transcripts"]
 
+
+class _StreamReader:
+    """Chunked text buffer that decodes one JSON value at a time"""
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0  # Stream position of buffer[0]
+        self.last_span = None  # Stream (start, end) of the last decoded value
+        self.eof = False
+
+    def _fill(self):
+        """Read another chunk, dropping the already consumed prefix"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self._WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # A value ending exactly at the buffer edge may be truncated (e.g. numbers)
+            if end == len(self.buffer) and not self.eof:
+                self._fill()
+                continue
+            self.last_span = (self.offset + self.pos, self.offset + end)
+            self.pos = end
+            return value
+
+
+def _iter_transcript_values(reader):
+    """Yield each element of the top-level "transcripts" array"""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+
+        if key == "transcripts":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    reader.expect("]")
+                    break
+        else:
+            reader.value()
+
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+def iter_transcripts(path=DEFAULT_DATASET_PATH, chunk_size=1 << 20):
+    """
+    Stream transcripts one at a time without parsing the whole file.
+
+    The top-level object is scanned incrementally; each element of its
+    "transcripts" array is decoded and yielded on its own, so peak memory
+    is bounded by the largest transcript plus one read chunk. Other
+    top-level keys are decoded and discarded.
+
+    Args:
+        path (str): Path of the JSON dataset
+        chunk_size (int): Characters read per chunk
+
+    Yields:
+        dict: One transcript at a time, in file order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        yield from _iter_transcript_values(_StreamReader(f, chunk_size))
+
+
+def iter_transcript_offsets(path=DEFAULT_DATASET_PATH, chunk_size=1 << 20):
+    """
+    Stream (transcript_id, start, end) byte spans of every transcript.
+
+    The file is scanned as latin-1, which maps bytes one-to-one onto
+    characters, so decoder positions are byte offsets into the file.
+    json.loads(raw_bytes[start:end]) recovers the transcript.
+
+    Yields:
+        tuple: (transcript_id, start_byte, end_byte) in file order
+    """
+    with open(path, "rb") as raw:
+        f = io.TextIOWrapper(raw, encoding="latin-1", newline="")
+        reader = _StreamReader(f, chunk_size)
+        for transcript in _iter_transcript_values(reader):
+            start, end = reader.last_span
+            transcript_id = transcript["transcript_id"]
+            try:
+                transcript_id = transcript_id.encode("latin-1").decode("utf-8")
+            except (AttributeError, UnicodeError):
+                # Non-string or \u-escaped ids: decode the span properly
+                local = reader.buffer[start - reader.offset:end - reader.offset]
+                transcript_id = json.loads(local.encode("latin-1"))["transcript_id"]
+            yield transcript_id, start, end
+
+
 if __name__ == "__main__":
     transcripts = load_transcripts()
     print(f"Loaded {len(transcripts)} transcripts")
@@ -0,0 +1,282 @@
+"""
+Partial Stats Module - Mergeable on-disk chain and signal statistics for sharded datasets
+Each node exports raw counters of its shard; any number of exports merge into the single-node result
+
+Split a dataset into shards, export each, then merge:
+    python -m src.partial_stats split data/Conversational_Transcript_Dataset.json 4 --output shards/
+    python -m src.partial_stats export shards/shard-000.json --output shards/shard-000.partial.npz
+    python -m src.partial_stats merge shards/*.partial.npz --output chain_stats.json
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.causal_chains import MAX_CHAIN_LENGTH, CausalChainDetector
+from src.corpus_aggregates import compute_corpus_aggregates
+from src.load_data import load_transcripts
+from src.preprocess import preprocess_transcripts
+from src.signal_batch import annotate_turns, extract_signals_batch
+from src.signal_cache import signal_config_hashes
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout or the meaning of a counter changes
+PARTIAL_STATS_VERSION = 1
+
+
+def _ragged(rows: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(offsets, values) of a list of integer lists"""
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = np.fromiter((v for row in rows for v in row), dtype=np.int64, count=int(offsets[-1]))
+    return offsets, values
+
+
+def _unragged(offsets: np.ndarray, values: np.ndarray) -> List[np.ndarray]:
+    return [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def compute_shard_partial(transcripts: List[dict], seed: int = 0) -> dict:
+    """
+    Raw chain counters and signal aggregates of one shard
+
+    Args:
+        transcripts: The shard's transcript dicts
+        seed: Example sampling seed (must match across shards)
+
+    Returns:
+        CausalChainDetector.export_partial() dict plus 'signal_stats'
+        (compute_corpus_aggregates of the shard) and 'seed'
+    """
+    turns = preprocess_transcripts(transcripts)
+    signals = extract_signals_batch(turns)
+    annotate_turns(turns, signals)
+
+    detector = CausalChainDetector(seed=seed)
+    detector.compute_chain_statistics(transcripts, turns)
+    partial = detector.export_partial()
+    partial["signal_stats"] = compute_corpus_aggregates(turns, signals)
+    partial["seed"] = seed
+    return partial
+
+
+def write_partial(path, partial: dict, shard: str = "") -> Path:
+    """
+    Save a shard partial as a versioned .npz file (no pickled objects)
+
+    Args:
+        path: Output file
+        partial: Result of compute_shard_partial
+        shard: Label recorded in the file (e.g. the source path)
+    """
+    # Signal types and chain keys are stored as codes into a shared alphabet
+    alphabet: Dict[str, int] = {}
+
+    def encode(signal_types):
+        return [alphabet.setdefault(signal, len(alphabet)) for signal in signal_types]
+
+    sequence_rows, sequence_owner, sequence_escalated = [], [], []
+    for rank, sequences in enumerate(partial["sequences"]):
+        for signal_types, escalated in sequences:
+            sequence_rows.append(encode(signal_types))
+            sequence_owner.append(rank)
+            sequence_escalated.append(escalated)
+
+    chains = partial["chains"]
+    key_offsets, key_codes = _ragged([encode(chain[0]) for chain in chains])
+    rank_offsets, ranks = _ragged([chain[4] for chain in chains])
+    example_offsets = np.concatenate(([0], np.cumsum([len(chain[5]) for chain in chains], dtype=np.int64)))
+    examples = [example for chain in chains for example in chain[5]]
+    sequence_offsets, sequence_codes = _ragged(sequence_rows)
+
+    meta = {
+        "version": PARTIAL_STATS_VERSION,
+        "shard": shard,
+        "seed": partial["seed"],
+        "max_chain_length": MAX_CHAIN_LENGTH,
+        "signal_config": signal_config_hashes(),
+        "signal_stats": partial["signal_stats"],
+        "alphabet": list(alphabet),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            meta=np.array(json.dumps(meta)),
+            transcript_ids=np.array(partial["transcript_ids"], dtype=str),
+            sequence_owner=np.asarray(sequence_owner, dtype=np.int64),
+            sequence_escalated=np.asarray(sequence_escalated, dtype=bool),
+            sequence_offsets=sequence_offsets,
+            sequence_codes=sequence_codes,
+            chain_key_offsets=key_offsets,
+            chain_key_codes=key_codes,
+            chain_counts=np.array([chain[1:4] for chain in chains], dtype=np.int64).reshape(-1, 3),
+            chain_rank_offsets=rank_offsets,
+            chain_ranks=ranks,
+            example_offsets=example_offsets,
+            example_priorities=np.array([p for p, _ in examples], dtype=np.uint64),
+            example_ranks=np.array([r for _, r in examples], dtype=np.int64),
+        )
+    return path
+
+
+def read_partial(path) -> dict:
+    """
+    Load a file written by write_partial
+
+    Returns:
+        The partial dict (as accepted by CausalChainDetector.merge_partial)
+        plus 'signal_stats', 'seed', 'max_chain_length', 'signal_config'
+        and 'shard'
+
+    Raises:
+        ValueError: For files of another format version
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("version") != PARTIAL_STATS_VERSION:
+            raise ValueError(f"{path}: partial stats version {meta.get('version')}, "
+                             f"expected {PARTIAL_STATS_VERSION}")
+        alphabet = meta["alphabet"]
+
+        def decode(codes):
+            return tuple(alphabet[code] for code in codes)
+
+        transcript_ids = data["transcript_ids"].tolist()
+        sequences = [[] for _ in transcript_ids]
+        rows = _unragged(data["sequence_offsets"], data["sequence_codes"])
+        for owner, escalated, codes in zip(data["sequence_owner"].tolist(),
+                                           data["sequence_escalated"].tolist(), rows):
+            sequences[owner].append((decode(codes), escalated))
+
+        keys = _unragged(data["chain_key_offsets"], data["chain_key_codes"])
+        ranks = _unragged(data["chain_rank_offsets"], data["chain_ranks"])
+        example_offsets = data["example_offsets"]
+        priorities = data["example_priorities"].tolist()
+        example_ranks = data["example_ranks"].tolist()
+        chains = []
+        for i, (codes, counts) in enumerate(zip(keys, data["chain_counts"].tolist())):
+            start, end = example_offsets[i], example_offsets[i + 1]
+            chains.append((decode(codes), *counts, ranks[i],
+                           list(zip(priorities[start:end], example_ranks[start:end]))))
+
+    return {
+        "transcript_ids": transcript_ids,
+        "sequences": sequences,
+        "chains": chains,
+        "signal_stats": meta["signal_stats"],
+        "seed": meta["seed"],
+        "max_chain_length": meta["max_chain_length"],
+        "signal_config": meta["signal_config"],
+        "shard": meta.get("shard", ""),
+    }
+
+
+def merge_signal_stats(stats: Sequence[dict]) -> dict:
+    """Sum compute_corpus_aggregates results of disjoint shards"""
+    merged = {}
+    for shard_stats in stats:
+        for key, value in shard_stats.items():
+            if isinstance(value, dict):
+                totals = merged.setdefault(key, {})
+                for name, count in value.items():
+                    totals[name] = totals.get(name, 0) + count
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def merge_partials(partials: Sequence[dict], min_evidence: int = 5) -> Tuple[CausalChainDetector, dict]:
+    """
+    Combine shard partials into final statistics
+
+    Shards are merged in the order given; with contiguous shards in
+    dataset order the result equals a single-node run over the dataset.
+
+    Args:
+        partials: Results of read_partial (or compute_shard_partial)
+        min_evidence: Minimum occurrences for a chain to be reported
+
+    Returns:
+        (detector with chain_stats, merged signal statistics)
+
+    Raises:
+        ValueError: If the shards were computed with different settings
+    """
+    if not partials:
+        raise ValueError("no partial statistics to merge")
+    for setting in ("seed", "max_chain_length", "signal_config"):
+        values = {json.dumps(p.get(setting), sort_keys=True) for p in partials if setting in p}
+        if len(values) > 1:
+            raise ValueError(f"partials were computed with different {setting} values")
+
+    detector = CausalChainDetector(seed=partials[0].get("seed", 0))
+    detector.merge_partials(partials, min_evidence)
+    return detector, merge_signal_stats([p["signal_stats"] for p in partials])
+
+
+def split_dataset(dataset_path, num_shards: int, output_dir) -> List[Path]:
+    """Write num_shards contiguous slices of a dataset as separate JSON files"""
+    transcripts = load_transcripts(dataset_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    size = -(-len(transcripts) // num_shards) if transcripts else 0
+    paths = []
+    for shard in range(num_shards):
+        path = output_dir / f"shard-{shard:03d}.json"
+        with open(path, "w") as f:
+            json.dump({"transcripts": list(transcripts[shard * size:(shard + 1) * size])}, f)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded chain and signal statistics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split = commands.add_parser("split", help="Split a dataset into contiguous shard files")
+    split.add_argument("dataset")
+    split.add_argument("shards", type=int)
+    split.add_argument("--output", default="shards")
+
+    export = commands.add_parser("export", help="Write the partial statistics of one shard")
+    export.add_argument("dataset")
+    export.add_argument("--output", help="Partial file (default: <dataset>.partial.npz)")
+    export.add_argument("--seed", type=int, default=0)
+
+    merge = commands.add_parser("merge", help="Merge partial files into final statistics")
+    merge.add_argument("partials", nargs="+", help="Partial files, in dataset order")
+    merge.add_argument("--output", default="chain_stats.json")
+    merge.add_argument("--min-evidence", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "split":
+        for path in split_dataset(args.dataset, args.shards, args.output):
+            print(f"Wrote {path}")
+    elif args.command == "export":
+        dataset = Path(args.dataset)
+        output = args.output or dataset.with_name(dataset.stem + ".partial.npz")
+        partial = compute_shard_partial(load_transcripts(dataset), seed=args.seed)
+        print(f"Wrote {write_partial(output, partial, shard=str(dataset))}")
+    else:
+        partials = [read_partial(path) for path in args.partials]
+        detector, signal_stats = merge_partials(partials, args.min_evidence)
+        with open(args.output, "w") as f:
+            json.dump({
+                "shards": [p["shard"] for p in partials],
+                "signal_stats": signal_stats,
+                "chain_stats": detector.chain_stats_json(),
+            }, f, indent=2)
+        print(f"Merged {len(partials)} shards: {len(detector.chain_stats)} chains -> {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
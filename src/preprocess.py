@@ -12,21 +12,55 @@ def label_outcome(transcript):
     return "RESOLVED"
 
 
-def preprocess_transcripts(transcripts):
+def transcript_turns(transcript, outcome=None):
+    """Processed turns of a single transcript"""
+    if outcome is None:
+        outcome = label_outcome(transcript)
+
+    return [
+        {
+            "transcript_id": transcript["transcript_id"],
+            "domain": transcript.get("domain", ""),
+            "intent": transcript.get("intent", ""),
+            "outcome": outcome,
+            "turn_number": idx + 1,
+            "speaker": turn["speaker"],
+            "text": turn["text"]
+        }
+        for idx, turn in enumerate(transcript["conversation"])
+    ]
+
+
+def iter_processed_turns(transcripts):
+    """
+    Lazily yield processed turns (same records as preprocess_transcripts).
+
+    Accepts any iterable of transcripts, e.g. load_data.iter_transcripts,
+    so a whole export can be processed as a bounded-memory pipeline.
+    """
+    for t in transcripts:
+        yield from transcript_turns(t)
+
+
+def preprocess_transcripts(transcripts, columnar=False):
+    """
+    Flatten transcripts into one record per conversation turn.
+
+    Args:
+        transcripts (list): Raw transcripts
+        columnar (bool): Return a compact TurnTable (with dict-like row
+            views) instead of a list of dicts
+
+    Returns:
+        list or TurnTable: Processed turns
+    """
+    if columnar:
+        from src.turn_table import TurnTable
+        return TurnTable.from_transcripts(transcripts)
+
     processed_turns = []
 
     for t in transcripts:
-        outcome = label_outcome(t)
-
-        for idx, turn in enumerate(t["conversation"]):
-            processed_turns.append({
-                "transcript_id": t["transcript_id"],
-                "domain": t.get("domain", ""),
-                "intent": t.get("intent", ""),
-                "outcome": outcome,
-                "turn_number": idx + 1,
-                "speaker": turn["speaker"],
-                "text": turn["text"]
-            })
+        processed_turns.extend(transcript_turns(t))
 
     return processed_turns
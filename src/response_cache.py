@@ -0,0 +1,268 @@
+"""
+Response Cache Module - Pre-encoded JSON responses for read-only endpoints
+Entries are keyed by endpoint, query parameters and dataset version
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    """Encoded response body plus its strong ETag"""
+    body: bytes
+    etag: str
+    mimetype: str = "application/json"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes"""
+    return hashlib.sha1(body).hexdigest()
+
+
+def cache_key(endpoint: str, args, version: str, view_args: Optional[dict] = None) -> Tuple:
+    """
+    Key for one cacheable request
+
+    Args:
+        endpoint: Flask endpoint name
+        args: Query parameters (werkzeug MultiDict or dict)
+        version: Dataset version the response was computed from
+        view_args: URL path parameters, if any
+
+    The version is always the last element of the key.
+    """
+    items = args.items(multi=True) if hasattr(args, "getlist") else args.items()
+    path_items = tuple(sorted((view_args or {}).items()))
+    return (endpoint, path_items, tuple(sorted(items)), version)
+
+
+class ResponseCache:
+    """
+    In-process LRU of encoded responses
+
+    Only entries of the current dataset version are kept: storing or
+    looking up a key with a new version drops everything older.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        """Cached response for a key, or None"""
+        with self._lock:
+            self._check_version(key[-1])
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, entry: CachedResponse) -> None:
+        """Store a response, evicting the least recently used entries"""
+        with self._lock:
+            self._check_version(key[-1])
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def cache_info(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                "backend": "memory",
+                "version": self._version,
+                "size": len(self._entries),
+                "capacity": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class SqliteResponseCache:
+    """
+    Response cache shared by every process on the host
+
+    Entries live in a SQLite database in WAL mode, so gunicorn workers
+    reuse payloads computed by each other while readers never block the
+    writer. Total body size is bounded by max_bytes; the oldest entries
+    are evicted first. Storing an entry of a new dataset version deletes
+    all entries of other versions.
+
+    Database errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES, timeout: float = 5.0):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self._connect()  # Create the schema up front
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection of the calling thread (reopened after a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " version TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " etag TEXT NOT NULL,"
+            " mimetype TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode_key(key: Tuple) -> str:
+        return json.dumps(key, separators=(",", ":"), default=str)
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        """Cached response for a key, or None"""
+        try:
+            row = self._connect().execute(
+                "SELECT body, etag, mimetype FROM responses WHERE key = ? AND version = ?",
+                (self._encode_key(key), key[-1]),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse(bytes(row[0]), row[1], row[2])
+
+    def put(self, key: Tuple, entry: CachedResponse) -> None:
+        """Store a response, then trim the database back to max_bytes"""
+        version = key[-1]
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM responses WHERE version != ?", (version,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self._encode_key(key), version, entry.body, entry.etag,
+                     entry.mimetype, len(entry.body), time.time()),
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete the oldest entries until the total size fits"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY created"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        try:
+            self._connect().execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache clear failed: {e}")
+
+    def cache_info(self) -> dict:
+        """Cache statistics (hits and misses are per process)"""
+        try:
+            size, count = self._connect().execute(
+                "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses"
+            ).fetchone()
+        except sqlite3.Error:
+            size, count = None, None
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "size": count,
+            "bytes": size,
+            "capacity_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def response_cache_path(dataset_path) -> Path:
+    """Shared cache database stored next to the dataset"""
+    dataset_path = Path(dataset_path)
+    return dataset_path.with_name(dataset_path.stem + ".responses.sqlite")
+
+
+def open_response_cache(backend: str = "memory", dataset_path=None, path=None,
+                        max_entries: int = DEFAULT_MAX_ENTRIES,
+                        max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Create the response cache for a backend name
+
+    Args:
+        backend: "memory" (per process) or "sqlite" (shared by all workers)
+        dataset_path: Dataset the default sqlite path is derived from
+        path: Explicit sqlite database path
+        max_entries: Entry bound of the memory backend
+        max_bytes: Size bound of the sqlite backend
+
+    Falls back to the memory backend if the database cannot be opened.
+    """
+    if backend == "sqlite":
+        db_path = Path(path) if path else response_cache_path(dataset_path)
+        try:
+            return SqliteResponseCache(db_path, max_bytes)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open shared response cache {db_path}: {e} - using memory cache")
+    elif backend != "memory":
+        logger.warning(f"Unknown response cache backend {backend!r} - using memory cache")
+    return ResponseCache(max_entries)
@@ -0,0 +1,151 @@
+"""
+Signal Batch Module - Vectorized signal extraction over a whole turn collection
+Produces a (turns x signal types) presence matrix plus matching confidences
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.signal_extraction import get_keyword_matcher, match_signals
+
+# Column order of the signal matrices (same order extract_signals emits)
+SIGNAL_TYPES = ("customer_frustration", "agent_delay", "agent_denial")
+SIGNAL_COLUMNS = {signal: col for col, signal in enumerate(SIGNAL_TYPES)}
+
+
+@dataclass
+class SignalMatrix:
+    """Per-turn signal presence and confidence for a collection of turns"""
+    presence: np.ndarray  # uint8, shape (turns, len(SIGNAL_TYPES))
+    confidence: np.ndarray  # float64, same shape, 0.0 where absent
+    signal_types: Tuple[str, ...] = SIGNAL_TYPES
+
+    def __len__(self) -> int:
+        return self.presence.shape[0]
+
+    def turn_signals(self, index: int) -> List[str]:
+        """Signals of a single turn, as extract_signals would return them"""
+        row = self.presence[index]
+        return [signal for col, signal in enumerate(self.signal_types) if row[col]]
+
+    def turn_confidences(self, index: int) -> List[Tuple[str, float]]:
+        """(signal, confidence) pairs of a single turn"""
+        return [(signal, float(self.confidence[index, col]))
+                for col, signal in enumerate(self.signal_types)
+                if self.presence[index, col]]
+
+    def counts(self, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        Corpus-wide count of each signal type
+
+        Args:
+            mask: Optional boolean mask selecting the turns to count
+        """
+        presence = self.presence if mask is None else self.presence[mask]
+        totals = presence.sum(axis=0, dtype=np.int64)
+        return {signal: int(totals[col]) for col, signal in enumerate(self.signal_types)}
+
+    def group_counts(self, group_codes: np.ndarray, num_groups: int) -> np.ndarray:
+        """
+        Aggregate signal counts per group (e.g. per transcript)
+
+        Args:
+            group_codes: Group code of every turn (e.g. TurnTable.transcript_codes)
+            num_groups: Number of groups
+
+        Returns:
+            int64 array of shape (num_groups, len(signal_types))
+        """
+        result = np.zeros((num_groups, len(self.signal_types)), dtype=np.int64)
+        for col in range(len(self.signal_types)):
+            result[:, col] = np.bincount(group_codes, weights=self.presence[:, col],
+                                         minlength=num_groups)
+        return result
+
+    def window_totals(self, group_starts: np.ndarray,
+                      window_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Total signals in every full sliding window that stays within a group
+
+        Mirrors the windows used by analyze_escalation_risk.
+
+        Args:
+            group_starts: Row offsets of each group, length num_groups + 1
+                          (e.g. TurnTable.transcript_starts)
+            window_size: Number of consecutive turns per window
+
+        Returns:
+            (window_start_rows, signal_totals) arrays
+        """
+        per_turn = self.presence.sum(axis=1, dtype=np.int64)
+        cumulative = np.concatenate(([0], np.cumsum(per_turn)))
+
+        rows = np.arange(len(self))
+        group_codes = np.repeat(np.arange(len(group_starts) - 1), np.diff(group_starts))
+        group_ends = np.asarray(group_starts)[1:][group_codes]
+
+        starts = rows[rows + window_size <= group_ends]
+        totals = cumulative[starts + window_size] - cumulative[starts]
+        return starts, totals
+
+
+def _iter_speaker_text(turns) -> Iterable[dict]:
+    """Yield minimal {'speaker', 'text'} turns, reading TurnTable columns directly"""
+    from src.turn_table import TurnTable
+
+    if isinstance(turns, TurnTable):
+        speakers = turns.categories["speaker"]
+        for i in range(len(turns)):
+            yield {"speaker": speakers[turns.speaker_codes[i]], "text": turns.get_text(i)}
+    else:
+        yield from turns
+
+
+def extract_signals_batch(turns, signal_types=None) -> SignalMatrix:
+    """
+    Extract signals for a whole collection of turns at once
+
+    Args:
+        turns: List of processed turn dicts or a TurnTable
+        signal_types: Only fill these columns (default: all); the other
+                      columns are left at zero
+
+    Returns:
+        SignalMatrix whose rows line up with the input turns
+    """
+    matcher = get_keyword_matcher()
+    num_turns = len(turns)
+    presence = np.zeros((num_turns, len(SIGNAL_TYPES)), dtype=np.uint8)
+    confidence = np.zeros((num_turns, len(SIGNAL_TYPES)), dtype=np.float64)
+
+    for row, turn in enumerate(_iter_speaker_text(turns)):
+        signals, counts = match_signals(turn, matcher, signal_types)
+        for signal in signals:
+            if signal_types is not None and signal not in signal_types:
+                continue
+            col = SIGNAL_COLUMNS[signal]
+            presence[row, col] = 1
+            confidence[row, col] = matcher.confidence(signal, counts)
+
+    return SignalMatrix(presence=presence, confidence=confidence)
+
+
+def annotate_turns(turns, signal_matrix: SignalMatrix) -> None:
+    """
+    Store a SignalMatrix as the signal column of a turn collection
+
+    List-of-dict turns get 'signals' and 'signal_confidences' keys (the
+    'signals' key is the one early_warning already caches); a TurnTable
+    attaches the matrix directly.
+    """
+    from src.turn_table import TurnTable
+
+    if isinstance(turns, TurnTable):
+        turns.attach_signals(signal_matrix)
+        return
+
+    for row, turn in enumerate(turns):
+        turn["signals"] = signal_matrix.turn_signals(row)
+        turn["signal_confidences"] = dict(signal_matrix.turn_confidences(row))
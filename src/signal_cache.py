@@ -0,0 +1,151 @@
+"""
+Signal Cache Module - Persist per-turn signals next to the dataset
+Cache validity is keyed by a dataset fingerprint plus a per-signal hash of SIGNAL_CONFIG
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.config import SIGNAL_CONFIG
+from src.signal_batch import SIGNAL_TYPES, SignalMatrix, extract_signals_batch
+from src.signal_extraction import SIGNAL_CONFIG_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extraction logic itself (not the config) changes
+SIGNAL_CACHE_VERSION = 1
+
+
+def dataset_fingerprint(path) -> str:
+    """SHA-256 of the dataset file contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def signal_config_hashes(signal_config: Optional[dict] = None) -> Dict[str, str]:
+    """
+    Hash of the SIGNAL_CONFIG entry driving each signal column
+
+    Only columns whose hash changes need to be recomputed.
+    """
+    if signal_config is None:
+        signal_config = SIGNAL_CONFIG
+    hashes = {}
+    for signal in SIGNAL_TYPES:
+        config_type = SIGNAL_CONFIG_TYPES[signal]
+        payload = json.dumps(
+            {
+                "version": SIGNAL_CACHE_VERSION,
+                "signal": signal,
+                "config": signal_config.get(config_type),
+                # Confidence is looked up under the signal's own name
+                "confidence_config": signal_config.get(signal),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        hashes[signal] = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return hashes
+
+
+def signal_cache_path(dataset_path) -> Path:
+    """Cache file stored next to the dataset"""
+    dataset_path = Path(dataset_path)
+    return dataset_path.with_name(dataset_path.stem + ".signals.npz")
+
+
+def _read_cache(cache_path: Path, fingerprint: str, num_turns: int):
+    """Return (SignalMatrix, column_hashes) from a valid cache file, else None"""
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            meta = json.loads(str(cached["meta"]))
+            presence = cached["presence"]
+            confidence = cached["confidence"]
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable signal cache {cache_path}: {e}")
+        return None
+
+    if (meta.get("dataset") != fingerprint
+            or tuple(meta.get("signal_types", ())) != SIGNAL_TYPES
+            or presence.shape != (num_turns, len(SIGNAL_TYPES))):
+        return None
+    return SignalMatrix(presence=presence, confidence=confidence), meta.get("columns", {})
+
+
+def _write_cache(cache_path: Path, matrix: SignalMatrix, fingerprint: str,
+                 column_hashes: Dict[str, str]) -> None:
+    """Atomically write the signal cache"""
+    meta = json.dumps({
+        "dataset": fingerprint,
+        "signal_types": list(SIGNAL_TYPES),
+        "columns": column_hashes,
+    })
+    tmp_path = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, presence=matrix.presence, confidence=matrix.confidence,
+                     meta=np.array(meta))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write signal cache {cache_path}: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def load_or_compute_signals(turns, dataset_path, fingerprint: Optional[str] = None) -> SignalMatrix:
+    """
+    Signals for every turn, reusing the on-disk cache where still valid
+
+    - Same dataset and SIGNAL_CONFIG: loaded from disk, no extraction
+    - Same dataset, some signal keywords changed: only those columns
+      are recomputed
+    - Different dataset (or no cache): everything is extracted
+
+    The cache is rewritten whenever anything was recomputed.
+
+    Args:
+        turns: Processed turns (list of dicts or TurnTable), in dataset order
+        dataset_path: Path of the dataset the turns were built from
+        fingerprint: Precomputed dataset_fingerprint (optional)
+
+    Returns:
+        SignalMatrix aligned with turns
+    """
+    if fingerprint is None:
+        fingerprint = dataset_fingerprint(dataset_path)
+    cache_path = signal_cache_path(dataset_path)
+    column_hashes = signal_config_hashes()
+
+    cached = _read_cache(cache_path, fingerprint, len(turns)) if cache_path.exists() else None
+
+    if cached is None:
+        logger.info("Signal cache miss - extracting all signals")
+        matrix = extract_signals_batch(turns)
+    else:
+        matrix, cached_hashes = cached
+        stale = [s for s in SIGNAL_TYPES if cached_hashes.get(s) != column_hashes[s]]
+        if not stale:
+            logger.info(f"Loaded signals from cache {cache_path}")
+            return matrix
+
+        logger.info(f"Signal config changed for {stale} - recomputing those columns")
+        fresh = extract_signals_batch(turns, signal_types=stale)
+        presence = np.array(matrix.presence)
+        confidence = np.array(matrix.confidence)
+        for signal in stale:
+            col = SIGNAL_TYPES.index(signal)
+            presence[:, col] = fresh.presence[:, col]
+            confidence[:, col] = fresh.confidence[:, col]
+        matrix = SignalMatrix(presence=presence, confidence=confidence)
+
+    _write_cache(cache_path, matrix, fingerprint, column_hashes)
+    return matrix
@@ -10,6 +10,247 @@ FRUSTRATION_KEYWORDS = SIGNAL_CONFIG["frustration"]["keywords"]
 AGENT_DELAY_KEYWORDS = SIGNAL_CONFIG["agent_delay"]["keywords"]
 AGENT_DENIAL_KEYWORDS = SIGNAL_CONFIG["agent_denial"]["keywords"]
 
+# SIGNAL_CONFIG types that can fire for each speaker
+CUSTOMER_SIGNAL_TYPES = ("frustration",)
+AGENT_SIGNAL_TYPES = ("agent_delay", "agent_denial")
+
+# Emitted signal name → SIGNAL_CONFIG entry whose keywords drive it
+SIGNAL_CONFIG_TYPES = {
+    "customer_frustration": "frustration",
+    "agent_delay": "agent_delay",
+    "agent_denial": "agent_denial",
+}
+
+
+def _config_fingerprint(signal_config):
+    """Hashable snapshot of the keyword lists in a signal config"""
+    return tuple(
+        (signal_type, tuple(config.get("keywords", ())))
+        for signal_type, config in signal_config.items()
+    )
+
+
+class KeywordMatcher:
+    """
+    Keyword table compiled once from SIGNAL_CONFIG.
+    
+    Keywords shared between signal types are stored once, so a single scan
+    of a turn's text yields the match count of every requested signal type.
+    Counts follow list multiplicity, matching get_signal_confidence.
+    """
+    
+    def __init__(self, signal_config):
+        self.fingerprint = _config_fingerprint(signal_config)
+        # Copies of the compiled keyword lists, compared against the live config
+        self._compiled = tuple(
+            (signal_type, config.get("keywords", [])[:])
+            for signal_type, config in signal_config.items()
+        )
+        self.keywords = dict(self.fingerprint)
+        self.keyword_totals = {
+            signal_type: len(keywords) for signal_type, keywords in self.fingerprint
+        }
+        self._tables = {}
+    
+    def _table(self, signal_types):
+        """Compile (keyword, owning signal types) pairs for a set of types"""
+        table = self._tables.get(signal_types)
+        if table is None:
+            owners = {}
+            for signal_type, keywords in self.fingerprint:
+                if signal_type not in signal_types:
+                    continue
+                for keyword in keywords:
+                    owners.setdefault(keyword, []).append(signal_type)
+            table = tuple((keyword, tuple(types)) for keyword, types in owners.items())
+            self._tables[signal_types] = table
+        return table
+    
+    def count_matches(self, text, signal_types=None):
+        """
+        Count keyword hits per signal type in one scan of the text.
+        
+        Args:
+            text (str): Lowercased turn text
+            signal_types (tuple): SIGNAL_CONFIG types to scan (default: all)
+        
+        Returns:
+            dict: Mapping of signal type to number of matching keywords
+                  (types without any hit are omitted)
+        """
+        if signal_types is None:
+            signal_types = tuple(self.keyword_totals)
+        counts = {}
+        for keyword, owners in self._table(signal_types):
+            if keyword in text:
+                for owner in owners:
+                    counts[owner] = counts.get(owner, 0) + 1
+        return counts
+    
+    def is_current(self, signal_config):
+        """
+        Whether signal_config still holds the keyword lists compiled here.
+        
+        Compares the lists element by element (no hashing), so keyword
+        lists edited in place are detected as well as replaced configs.
+        """
+        if len(signal_config) != len(self._compiled):
+            return False
+        for signal_type, keywords in self._compiled:
+            config = signal_config.get(signal_type)
+            if config is None or config.get("keywords", []) != keywords:
+                return False
+        return True
+    
+    def has_match(self, text, signal_type):
+        """
+        Whether any keyword of a signal type occurs in the text.
+        
+        Presence-only counterpart of count_matches: stops at the first hit.
+        """
+        return any(keyword in text for keyword in self.keywords.get(signal_type, ()))
+    
+    def confidence(self, signal_type, counts):
+        """Confidence for a signal type given its match counts"""
+        if signal_type not in self.keyword_totals:
+            return 0.0
+        matches = counts.get(signal_type, 0)
+        return min(matches / max(self.keyword_totals[signal_type], 1), 1.0)
+
+
+_matcher = None
+
+
+def get_keyword_matcher():
+    """
+    Return the KeywordMatcher for the current SIGNAL_CONFIG.
+    
+    The matcher is compiled once and rebuilt whenever the keyword lists of
+    SIGNAL_CONFIG change, including edits made in place.
+    """
+    global _matcher
+    if _matcher is None or not _matcher.is_current(SIGNAL_CONFIG):
+        _matcher = KeywordMatcher(SIGNAL_CONFIG)
+    return _matcher
+
+
+def reload_keyword_matcher():
+    """Recompile the KeywordMatcher from the current SIGNAL_CONFIG contents"""
+    global _matcher
+    _matcher = KeywordMatcher(SIGNAL_CONFIG)
+    return _matcher
+
+
+def _scan_types(config_types, signal_types):
+    """Restrict speaker config types to those driving the requested signals"""
+    if signal_types is None:
+        return config_types
+    wanted = {SIGNAL_CONFIG_TYPES.get(signal) for signal in signal_types}
+    return tuple(t for t in config_types if t in wanted)
+
+
+def match_signals(turn, matcher=None, signal_types=None):
+    """
+    Extract signals and keyword match counts from a turn in one pass.
+    
+    Args:
+        turn (dict): A turn with 'speaker' and 'text' keys
+        matcher (KeywordMatcher): Optional pre-fetched matcher
+        signal_types (iterable): Only evaluate these signals (default: all)
+    
+    Returns:
+        tuple: (signals, counts) where signals matches extract_signals and
+               counts maps SIGNAL_CONFIG types to matched keyword counts
+    """
+    if matcher is None:
+        matcher = get_keyword_matcher()
+    
+    text = turn["text"].lower()
+    speaker = turn["speaker"].lower()
+    signals = []
+
+    # Customer frustration
+    if speaker == "customer":
+        counts = matcher.count_matches(text, _scan_types(CUSTOMER_SIGNAL_TYPES, signal_types))
+        if counts.get("frustration"):
+            signals.append("customer_frustration")
+
+    # Agent behavior
+    elif speaker == "agent":
+        counts = matcher.count_matches(text, _scan_types(AGENT_SIGNAL_TYPES, signal_types))
+
+        # Agent delay
+        if counts.get("agent_delay"):
+            signals.append("agent_delay")
+
+        # Agent denial (filtered)
+        if (
+            counts.get("agent_denial")
+            and "sorry" in text
+            and len(text.split()) > 5
+        ):
+            signals.append("agent_denial")
+
+    else:
+        counts = {}
+
+    return signals, counts
+
+
+def extract_signals_with_confidence(turn, matcher=None):
+    """
+    Extract signals together with their confidence scores.
+    
+    Equivalent to calling extract_signals and then get_signal_confidence for
+    every detected signal, but scans the turn text only once.
+    
+    Args:
+        turn (dict): A turn with 'speaker' and 'text' keys
+        matcher (KeywordMatcher): Optional pre-fetched matcher
+    
+    Returns:
+        list: List of (signal_type, confidence) tuples in detection order
+    """
+    if matcher is None:
+        matcher = get_keyword_matcher()
+    signals, counts = match_signals(turn, matcher)
+    return [(signal, matcher.confidence(signal, counts)) for signal in signals]
+
+
+def get_turn_signals(turn):
+    """
+    Signals of a turn, reusing its precomputed 'signals' column if present.
+    
+    Args:
+        turn (dict): A processed turn
+    
+    Returns:
+        list: List of signal types detected in the turn
+    """
+    if "signals" in turn:
+        return turn["signals"]
+    return extract_signals(turn)
+
+
+def get_turn_signal_confidences(turn, matcher=None):
+    """
+    (signal, confidence) pairs of a turn, reusing precomputed columns.
+    
+    Uses the 'signals' and 'signal_confidences' keys written by
+    annotate_turns when both are present, otherwise extracts them.
+    
+    Args:
+        turn (dict): A processed turn
+        matcher (KeywordMatcher): Optional pre-fetched matcher
+    
+    Returns:
+        list: List of (signal_type, confidence) tuples
+    """
+    if "signals" in turn and "signal_confidences" in turn:
+        confidences = turn["signal_confidences"]
+        return [(signal, confidences.get(signal, 0.0)) for signal in turn["signals"]]
+    return extract_signals_with_confidence(turn, matcher)
+
 
 def extract_signals(turn):
     """
@@ -21,24 +262,27 @@ def extract_signals(turn):
     Returns:
         list: List of signal types detected in the turn
     """
+    # Presence only: each keyword scan stops at its first hit. The live
+    # keyword lists are read directly, so config edits apply immediately.
     text = turn["text"].lower()
+    speaker = turn["speaker"].lower()
     signals = []
 
     # Customer frustration
-    if turn["speaker"].lower() == "customer":
-        if any(word in text for word in FRUSTRATION_KEYWORDS):
+    if speaker == "customer":
+        if any(word in text for word in SIGNAL_CONFIG["frustration"]["keywords"]):
             signals.append("customer_frustration")
 
     # Agent behavior
-    if turn["speaker"].lower() == "agent":
+    elif speaker == "agent":
 
         # Agent delay
-        if any(word in text for word in AGENT_DELAY_KEYWORDS):
+        if any(word in text for word in SIGNAL_CONFIG["agent_delay"]["keywords"]):
             signals.append("agent_delay")
 
         # Agent denial (filtered)
         if (
-            any(word in text for word in AGENT_DENIAL_KEYWORDS)
+            any(word in text for word in SIGNAL_CONFIG["agent_denial"]["keywords"])
             and "sorry" in text
             and len(text.split()) > 5
         ):
@@ -65,21 +309,26 @@ def extract_signals_advanced(turn, signal_types=None):
     signals = []
     speaker = turn["speaker"].lower()
     
+    # Keep only configured types relevant to this speaker
+    relevant_types = []
     for signal_type in signal_types:
         if signal_type not in SIGNAL_CONFIG:
             continue
         
-        config = SIGNAL_CONFIG[signal_type]
-        keywords = config["keywords"]
-        
         # Check speaker relevance
         if "frustration" in signal_type and speaker != "customer":
             continue
         if "agent" in signal_type and speaker != "agent":
             continue
         
+        relevant_types.append(signal_type)
+    
+    matcher = get_keyword_matcher()
+    for signal_type in relevant_types:
+        config = SIGNAL_CONFIG[signal_type]
+        
         # Check keywords
-        if any(keyword in text for keyword in keywords):
+        if matcher.has_match(text, signal_type):
             # Apply additional filters if specified
             if config.get("must_contain"):
                 if not all(keyword in text for keyword in config["must_contain"]):
@@ -109,16 +358,13 @@ def get_signal_confidence(turn, signal_type):
         return 0.0
     
     text = turn["text"].lower()
-    config = SIGNAL_CONFIG[signal_type]
-    keywords = config["keywords"]
+    matcher = get_keyword_matcher()
     
     # Count matching keywords
-    matches = sum(1 for keyword in keywords if keyword in text)
+    counts = matcher.count_matches(text, (signal_type,))
     
     # Calculate confidence
-    confidence = min(matches / max(len(keywords), 1), 1.0)
-    
-    return confidence
+    return matcher.confidence(signal_type, counts)
 
 
 def extract_all_signals(transcript):
@@ -199,11 +445,11 @@ def extract_signals_temporal(turn):
             "confidence": 0.85
         }
     """
-    signals = extract_signals(turn)
-    confidence = max([get_signal_confidence(turn, s) for s in signals], default=0.0)
+    scored = extract_signals_with_confidence(turn)
+    confidence = max([score for _, score in scored], default=0.0)
     
     return {
-        "signals": signals,
+        "signals": [signal for signal, _ in scored],
         "turn_number": turn.get("turn_number", 0),
         "speaker": turn.get("speaker", "unknown"),
         "confidence": confidence,
@@ -237,13 +483,13 @@ def build_temporal_signal_sequence(transcript_id, processed_turns):
     
     # Extract signals with temporal info
     signal_timeline = []
+    matcher = get_keyword_matcher()
     for turn in transcript_turns:
-        signals = extract_signals(turn)
-        for signal in signals:
+        for signal, confidence in extract_signals_with_confidence(turn, matcher):
             signal_timeline.append({
                 "turn": turn.get("turn_number", 0),
                 "signal": signal,
-                "confidence": get_signal_confidence(turn, signal),
+                "confidence": confidence,
                 "speaker": turn.get("speaker", ""),
                 "text": turn.get("text", "")
             })
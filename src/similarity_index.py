@@ -0,0 +1,296 @@
+"""
+Similarity Index Module - Nearest-neighbour search over transcript signal patterns
+Sparse TF-IDF vectors with exact cosine top-k and a MinHash LSH candidate mode
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.signal_batch import SignalMatrix
+
+# Signal n-gram lengths used as features
+NGRAM_SIZES = (1, 2, 3)
+# Signals are also bucketed by relative position: start / middle / end
+POSITION_BUCKETS = 3
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+
+# Largest prime below 2^32: with a, b and x all reduced below it, a * x + b
+# stays under 2^64 and the universal hash never overflows uint64
+_HASH_PRIME = (1 << 32) - 5
+# Rows hashed per step while building signatures, bounding the temporary
+# (num_perm x non-zeros) array to a chunk of the matrix
+_SIGNATURE_CHUNK_ROWS = 4096
+
+
+def transcript_features(signals: Sequence[str], positions: Sequence[int],
+                        domain: str, intent: str) -> Counter:
+    """
+    Sparse feature counts of one transcript
+
+    Args:
+        signals: Signal types in conversation order
+        positions: Position bucket of each signal (0..POSITION_BUCKETS-1)
+        domain: Transcript domain
+        intent: Transcript intent
+
+    Returns:
+        Counter of feature name → count
+    """
+    features = Counter()
+    for n in NGRAM_SIZES:
+        for i in range(len(signals) - n + 1):
+            features["seq:" + ">".join(signals[i:i + n])] += 1
+    for signal, bucket in zip(signals, positions):
+        features[f"pos:{signal}@{bucket}"] += 1
+    features[f"domain:{domain}"] += 1
+    features[f"intent:{intent}"] += 1
+    return features
+
+
+def _transcript_groups(turns):
+    """
+    Per transcript (first occurrence order): id, domain, intent and row list
+
+    Turns sharing a transcript_id are treated as one transcript.
+    """
+    from src.turn_table import TurnTable
+
+    order = {}
+    groups = []
+    if isinstance(turns, TurnTable):
+        ids = turns.transcript_ids
+        for position, tid in enumerate(ids):
+            start, end = int(turns.transcript_starts[position]), int(turns.transcript_starts[position + 1])
+            if tid not in order:
+                order[tid] = len(groups)
+                groups.append((tid,
+                               turns.categories["domain"][turns.transcript_domain[position]],
+                               turns.categories["intent"][turns.transcript_intent[position]],
+                               []))
+            groups[order[tid]][3].extend(range(start, end))
+    else:
+        for row, turn in enumerate(turns):
+            tid = turn["transcript_id"]
+            if tid not in order:
+                order[tid] = len(groups)
+                groups.append((tid, turn.get("domain", ""), turn.get("intent", ""), []))
+            groups[order[tid]][3].append(row)
+    return groups
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, start + length) for each pair"""
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return offsets + np.arange(total)
+
+
+class SimilarityIndex:
+    """
+    Row-normalized sparse transcript vectors (CSR) plus their transpose
+    (CSC) as an inverted index
+
+    Features are signal n-grams, signal × relative position and the
+    domain/intent, weighted by sublinear TF times IDF. Cosine scores of a
+    query are accumulated from the postings of its few non-zero features,
+    so exact top-k never touches transcripts that share no feature.
+    """
+
+    def __init__(self, transcript_ids: List[str], feature_names: List[str],
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.transcript_ids = transcript_ids
+        self.feature_names = feature_names
+        self.rank_of = {tid: rank for rank, tid in enumerate(transcript_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+        # Inverted index: feature → (transcripts, weights)
+        order = np.argsort(indices, kind="stable")
+        self.col_rows = np.repeat(np.arange(len(transcript_ids)), np.diff(indptr))[order]
+        self.col_data = data[order]
+        self.col_ptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=len(feature_names)))))
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self._build_lsh(seed)
+
+    @classmethod
+    def build(cls, turns, signal_matrix: SignalMatrix, **kwargs) -> "SimilarityIndex":
+        """
+        Build the index from processed turns and their signal matrix
+
+        Args:
+            turns: Processed turns (list of dicts or TurnTable)
+            signal_matrix: Signals aligned with turns
+            **kwargs: num_perm, bands, seed for the LSH mode
+        """
+        signal_types = signal_matrix.signal_types
+        # Non-zero (turn, signal) pairs in turn order, signal-column order within a turn
+        nz_rows, nz_cols = np.nonzero(signal_matrix.presence)
+        row_ptr = np.searchsorted(nz_rows, np.arange(len(signal_matrix) + 1))
+
+        vocabulary: Dict[str, int] = {}
+        transcript_ids, rows_features = [], []
+        for tid, domain, intent, rows in _transcript_groups(turns):
+            length = len(rows)
+            if length and rows[-1] - rows[0] + 1 == length:
+                span = slice(row_ptr[rows[0]], row_ptr[rows[-1] + 1])
+                cols, turn_positions = nz_cols[span], nz_rows[span] - rows[0]
+            else:
+                cols, turn_positions = [], []
+                for i, row in enumerate(rows):
+                    row_cols = nz_cols[row_ptr[row]:row_ptr[row + 1]]
+                    cols.extend(row_cols)
+                    turn_positions.extend([i] * len(row_cols))
+            signals = [signal_types[col] for col in cols]
+            positions = [min(int(i) * POSITION_BUCKETS // length, POSITION_BUCKETS - 1)
+                         for i in turn_positions]
+            features = transcript_features(signals, positions, domain, intent)
+            transcript_ids.append(tid)
+            rows_features.append({vocabulary.setdefault(f, len(vocabulary)): c
+                                  for f, c in features.items()})
+
+        # Sublinear TF × smoothed IDF, then L2-normalize each row
+        doc_freq = np.zeros(len(vocabulary), dtype=np.int64)
+        for features in rows_features:
+            doc_freq[list(features)] += 1
+        idf = np.log((1 + len(rows_features)) / (1 + doc_freq)) + 1.0
+
+        indptr = np.zeros(len(rows_features) + 1, dtype=np.int64)
+        indices, data = [], []
+        for i, features in enumerate(rows_features):
+            cols = np.fromiter(sorted(features), dtype=np.int64, count=len(features))
+            weights = np.array([1.0 + math.log(features[c]) for c in cols]) * idf[cols]
+            norm = np.linalg.norm(weights)
+            indices.append(cols)
+            data.append(weights / norm if norm else weights)
+            indptr[i + 1] = indptr[i] + len(cols)
+
+        feature_names = [None] * len(vocabulary)
+        for name, col in vocabulary.items():
+            feature_names[col] = name
+        return cls(transcript_ids, feature_names, indptr,
+                   np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+                   np.concatenate(data) if data else np.empty(0), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.transcript_ids)
+
+    def vector(self, rank: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(feature columns, weights) of a transcript"""
+        start, end = self.indptr[rank], self.indptr[rank + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def _scores(self, rank: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of a transcript to every transcript (or to candidates)"""
+        cols, weights = self.vector(rank)
+        if candidates is not None:
+            # Dot products with the candidate rows only
+            query = np.zeros(len(self.feature_names))
+            query[cols] = weights
+            lengths = np.diff(self.indptr)[candidates]
+            positions = _ranges(self.indptr[candidates], lengths)
+            products = query[self.indices[positions]] * self.data[positions]
+            owners = np.repeat(np.arange(len(candidates)), lengths)
+            return np.bincount(owners, weights=products, minlength=len(candidates))
+
+        # Accumulate over the postings of the query's features
+        lengths = self.col_ptr[cols + 1] - self.col_ptr[cols]
+        positions = _ranges(self.col_ptr[cols], lengths)
+        return np.bincount(self.col_rows[positions],
+                           weights=self.col_data[positions] * np.repeat(weights, lengths),
+                           minlength=len(self))
+
+    def most_similar(self, transcript_id: str, top_k: int = 10,
+                     mode: str = "exact") -> List[Tuple[str, float]]:
+        """
+        Nearest transcripts by cosine similarity
+
+        Args:
+            transcript_id: Reference transcript
+            top_k: Number of neighbours
+            mode: "exact" (score every transcript sharing a feature) or
+                  "lsh" (score only MinHash LSH candidates; approximate)
+
+        Returns:
+            (transcript_id, score) pairs, best first, ties by transcript
+            order; empty if the transcript is unknown
+        """
+        rank = self.rank_of.get(transcript_id)
+        if rank is None or top_k <= 0:
+            return []
+
+        if mode == "exact":
+            scores = self._scores(rank)
+            candidates = np.flatnonzero(scores)
+            scores = scores[candidates]
+        elif mode == "lsh":
+            candidates = self.lsh_candidates(rank)
+            scores = self._scores(rank, candidates)
+        else:
+            raise ValueError(f"Unknown similarity mode: {mode}")
+
+        keep = candidates != rank
+        candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))[:top_k]
+        return [(self.transcript_ids[candidates[i]], float(scores[i])) for i in order]
+
+    # ------------------------------------------------------------------
+    # MinHash LSH
+    # ------------------------------------------------------------------
+
+    def _build_lsh(self, seed: int) -> None:
+        """MinHash signatures of each feature set, bucketed per band"""
+        rng = np.random.default_rng(seed)
+        prime = np.uint64(_HASH_PRIME)
+        a = rng.integers(1, _HASH_PRIME, size=self.num_perm, dtype=np.uint64)[:, None]
+        b = rng.integers(0, _HASH_PRIME, size=self.num_perm, dtype=np.uint64)[:, None]
+
+        num_rows = len(self)
+        signatures = np.full((num_rows, self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for lo in range(0, num_rows, _SIGNATURE_CHUNK_ROWS):
+            hi = min(lo + _SIGNATURE_CHUNK_ROWS, num_rows)
+            start, stop = self.indptr[lo], self.indptr[hi]
+            if start == stop:
+                continue
+            # Hash every (permutation, non-zero) pair of the chunk, then take row minima
+            x = (self.indices[start:stop].astype(np.uint64) + np.uint64(1)) % prime
+            hashed = (a * x[None, :] + b) % prime
+            nonempty = lo + np.flatnonzero(np.diff(self.indptr[lo:hi + 1]) > 0)
+            signatures[nonempty] = np.minimum.reduceat(hashed, self.indptr[nonempty] - start, axis=1).T
+
+        rows_per_band = self.num_perm // self.bands
+        self.band_keys = []
+        self.band_rows = []
+        # Band keys in row order too, so lsh_candidates can look up a transcript's buckets
+        self._band_key_of = np.empty((num_rows, self.bands), dtype=np.uint64)
+        for band in range(self.bands):
+            chunk = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+            key = np.zeros(num_rows, dtype=np.uint64)
+            for col in range(rows_per_band):
+                key = key * np.uint64(1099511628211) + chunk[:, col]  # FNV-style mix, wraps mod 2^64
+            self._band_key_of[:, band] = key
+            order = np.argsort(key, kind="stable")
+            self.band_keys.append(key[order])
+            self.band_rows.append(order)
+
+    def lsh_candidates(self, rank: int) -> np.ndarray:
+        """Transcripts sharing at least one LSH band bucket with a transcript"""
+        found = []
+        for band in range(self.bands):
+            keys, rows = self.band_keys[band], self.band_rows[band]
+            key = self._band_key_of[rank, band]
+            lo, hi = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+            found.append(rows[lo:hi])
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
@@ -0,0 +1,280 @@
+"""
+Dataset Snapshot Module - Binary, memory-mapped copy of the transcript dataset
+The JSON file stays the source of truth; the snapshot is a derived, columnar
+cache that every process can map instead of re-parsing the JSON.
+
+Build once with:
+    python -m src.snapshot data/Conversational_Transcript_Dataset.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.turn_table import TurnTable
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Per-turn keys stored as columns; anything else goes into the turn-extra blob
+TURN_COLUMN_KEYS = ("speaker", "text")
+
+_ARRAYS = ("transcript_domain", "transcript_intent", "transcript_outcome",
+           "transcript_starts", "turn_numbers", "speaker_codes", "text_offsets",
+           "meta_offsets", "turn_extra_offsets")
+_BLOBS = ("text", "meta", "turn_extra")
+
+
+def snapshot_path(dataset_path) -> Path:
+    """Snapshot directory stored next to the dataset"""
+    dataset_path = Path(dataset_path)
+    return dataset_path.with_name(dataset_path.stem + ".snapshot")
+
+
+def _source_stat(dataset_path) -> dict:
+    stat = os.stat(dataset_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pack(chunks):
+    """Concatenate byte chunks into (blob, int64 offsets)"""
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    if chunks:
+        offsets[1:] = np.cumsum([len(c) for c in chunks])
+    return b"".join(chunks), offsets
+
+
+def build_snapshot(dataset_path, target: Optional[Path] = None) -> Path:
+    """
+    Convert the JSON dataset into a binary snapshot directory
+
+    Layout: manifest.json, one .npy file per column and three byte blobs
+    (turn text, per-transcript metadata JSON, per-turn extra keys JSON).
+
+    Args:
+        dataset_path: Path of the JSON dataset
+        target: Snapshot directory (default: next to the dataset)
+
+    Returns:
+        Path of the snapshot directory
+    """
+    dataset_path = Path(dataset_path)
+    target = Path(target) if target else snapshot_path(dataset_path)
+    stat_before = _source_stat(dataset_path)
+
+    with open(dataset_path, "r", encoding="utf-8") as f:
+        transcripts = json.load(f)["transcripts"]
+
+    table = TurnTable.from_transcripts(transcripts)
+
+    # Transcript metadata keeps its key order; conversation is re-attached on read
+    meta_chunks, extra_chunks = [], []
+    for t in transcripts:
+        meta = {k: (None if k == "conversation" else v) for k, v in t.items()}
+        meta_chunks.append(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        for turn in t["conversation"]:
+            extra = {k: v for k, v in turn.items() if k not in TURN_COLUMN_KEYS}
+            extra_chunks.append(json.dumps(extra, ensure_ascii=False).encode("utf-8") if extra else b"")
+
+    meta_blob, meta_offsets = _pack(meta_chunks)
+    extra_blob, extra_offsets = _pack(extra_chunks)
+
+    arrays = {
+        "transcript_domain": table.transcript_domain,
+        "transcript_intent": table.transcript_intent,
+        "transcript_outcome": table.transcript_outcome,
+        "transcript_starts": table.transcript_starts,
+        "turn_numbers": table.turn_numbers,
+        "speaker_codes": table.speaker_codes,
+        "text_offsets": table.text_offsets,
+        "meta_offsets": meta_offsets,
+        "turn_extra_offsets": extra_offsets,
+    }
+    blobs = {"text": table.text_buffer, "meta": meta_blob, "turn_extra": extra_blob}
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "source": {**stat_before, "sha256": _file_sha256(dataset_path)},
+        "num_transcripts": table.num_transcripts,
+        "num_turns": len(table),
+        "transcript_ids": table.transcript_ids,
+        "categories": table.categories,
+    }
+
+    # Write into a temporary directory, then swap it in
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", array)
+    for name, blob in blobs.items():
+        (tmp / f"{name}.bin").write_bytes(blob)
+    (tmp / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    if target.exists():
+        old = target.with_name(target.name + f".{os.getpid()}.old")
+        os.replace(target, old)
+        os.replace(tmp, target)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.replace(tmp, target)
+
+    logger.info(f"Wrote snapshot {target} ({table.num_transcripts} transcripts, {len(table)} turns)")
+    return target
+
+
+def _map_blob(path: Path):
+    """Read-only memory map of a blob file (empty files map to b'')"""
+    if path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SnapshotTranscripts(Sequence):
+    """
+    Read-only sequence of transcript dicts decoded on demand from a snapshot
+
+    Behaves like the list returned by load_transcripts, without holding
+    every transcript in memory.
+    """
+
+    def __init__(self, snapshot: "TranscriptSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.num_transcripts
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._snapshot.get_transcript(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript index out of range")
+        return self._snapshot.get_transcript(index)
+
+
+class TranscriptSnapshot:
+    """An opened, memory-mapped dataset snapshot"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / "manifest.json").read_text(encoding="utf-8"))
+        self.arrays = {name: np.load(self.directory / f"{name}.npy", mmap_mode="r")
+                       for name in _ARRAYS}
+        self.blobs = {name: _map_blob(self.directory / f"{name}.bin") for name in _BLOBS}
+
+        self.turn_table = TurnTable(
+            transcript_ids=self.manifest["transcript_ids"],
+            categories=self.manifest["categories"],
+            transcript_domain=self.arrays["transcript_domain"],
+            transcript_intent=self.arrays["transcript_intent"],
+            transcript_outcome=self.arrays["transcript_outcome"],
+            transcript_starts=self.arrays["transcript_starts"],
+            turn_numbers=self.arrays["turn_numbers"],
+            speaker_codes=self.arrays["speaker_codes"],
+            text_offsets=self.arrays["text_offsets"],
+            text_buffer=self.blobs["text"],
+        )
+        self.transcripts = SnapshotTranscripts(self)
+
+    @property
+    def num_transcripts(self) -> int:
+        return self.manifest["num_transcripts"]
+
+    @property
+    def source_sha256(self) -> str:
+        """SHA-256 of the JSON file the snapshot was built from"""
+        return self.manifest["source"]["sha256"]
+
+    def _blob_slice(self, blob: str, offsets: str, index: int) -> bytes:
+        start, end = self.arrays[offsets][index], self.arrays[offsets][index + 1]
+        return self.blobs[blob][start:end]
+
+    def get_metadata(self, position: int) -> dict:
+        """Transcript-level fields of a position, without decoding its turns"""
+        meta = json.loads(self._blob_slice("meta", "meta_offsets", position))
+        meta.pop("conversation", None)
+        return meta
+
+    def get_transcript(self, position: int) -> dict:
+        """Decode the transcript at a position into the JSON dict form"""
+        transcript = json.loads(self._blob_slice("meta", "meta_offsets", position))
+
+        table = self.turn_table
+        start, end = int(table.transcript_starts[position]), int(table.transcript_starts[position + 1])
+        conversation = []
+        for row in range(start, end):
+            turn = {
+                "speaker": table.categories["speaker"][table.speaker_codes[row]],
+                "text": table.get_text(row),
+            }
+            extra = self._blob_slice("turn_extra", "turn_extra_offsets", row)
+            if extra:
+                turn.update(json.loads(extra))
+            conversation.append(turn)
+
+        transcript["conversation"] = conversation
+        return transcript
+
+    def is_fresh(self, dataset_path) -> bool:
+        """True if the snapshot matches the current JSON file (or the JSON is gone)"""
+        if not Path(dataset_path).exists():
+            return True
+        source = self.manifest["source"]
+        return _source_stat(dataset_path) == {"size": source["size"], "mtime_ns": source["mtime_ns"]}
+
+
+def open_snapshot(dataset_path, directory: Optional[Path] = None) -> Optional[TranscriptSnapshot]:
+    """
+    Open the snapshot for a dataset if it exists and is up to date
+
+    Returns None (callers fall back to the JSON file) when the snapshot is
+    missing, unreadable, from another format version, or older than the JSON.
+    """
+    directory = Path(directory) if directory else snapshot_path(dataset_path)
+    if not (directory / "manifest.json").exists():
+        return None
+    try:
+        snapshot = TranscriptSnapshot(directory)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {directory}: {e}")
+        return None
+    if snapshot.manifest.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot {directory}: format version mismatch")
+        return None
+    if not snapshot.is_fresh(dataset_path):
+        logger.warning(f"Ignoring stale snapshot {directory}: dataset changed since it was built")
+        return None
+    return snapshot
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build a binary snapshot of the transcript dataset")
+    parser.add_argument("dataset", nargs="?", default="data/Conversational_Transcript_Dataset.json")
+    parser.add_argument("--output", help="Snapshot directory (default: next to the dataset)")
+    args = parser.parse_args()
+
+    path = build_snapshot(args.dataset, Path(args.output) if args.output else None)
+    print(f"Snapshot written to {path}")
@@ -0,0 +1,195 @@
+"""
+Transcript Index Module - Sorted secondary indexes over transcript attributes
+Serves filtered, cursor-paginated transcript listings without scanning the corpus
+"""
+
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.preprocess import label_outcome
+
+# Fields a listing can return, in output order
+LISTING_FIELDS = ("transcript_id", "domain", "intent", "reason_for_call",
+                  "conversation_length", "outcome")
+
+# Fields returned when a listing does not ask for specific ones
+DEFAULT_LISTING_FIELDS = LISTING_FIELDS[:5]
+
+# Attributes with a secondary index
+INDEXED_FIELDS = ("outcome", "domain", "intent")
+
+
+class InvalidCursor(ValueError):
+    """Raised for a pagination cursor that cannot be decoded"""
+
+
+def encode_cursor(transcript_id: str) -> str:
+    """Opaque cursor resuming a listing after this transcript id"""
+    return base64.urlsafe_b64encode(transcript_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Transcript id a cursor resumes after"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+class TranscriptIndex:
+    """
+    Transcript attributes in transcript_id order, plus one sorted posting
+    list per (attribute, value)
+
+    Every transcript has a rank (its position in transcript_id order).
+    Posting lists hold ranks in ascending order, so a listing resumes
+    from a cursor with one binary search and reads only as many entries
+    as it returns. Repeated ids are indexed once (first occurrence), and
+    transcripts without turns are left out of the outcome postings, as
+    they have no processed turns.
+    """
+
+    def __init__(self, transcript_ids: Sequence[str], domains: Sequence[str],
+                 intents: Sequence[str], outcomes: Sequence[str],
+                 lengths: Sequence[int], reasons: Sequence[str]):
+        first = {}
+        for position, tid in enumerate(transcript_ids):
+            first.setdefault(tid, position)
+        positions = sorted(first.values(), key=transcript_ids.__getitem__)
+
+        self.transcript_ids: List[str] = [transcript_ids[p] for p in positions]
+        self.reasons: List[str] = [reasons[p] for p in positions]
+        self.lengths = np.asarray([lengths[p] for p in positions], dtype=np.int64)
+
+        self.categories: Dict[str, List[str]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        for field, values in (("domain", domains), ("intent", intents), ("outcome", outcomes)):
+            lookup = {}
+            codes = np.fromiter((lookup.setdefault(values[p], len(lookup)) for p in positions),
+                                dtype=np.int32, count=len(positions))
+            self.categories[field] = list(lookup)
+            self.codes[field] = codes
+
+        self.postings: Dict[Tuple[str, str], np.ndarray] = {}
+        for field in INDEXED_FIELDS:
+            codes = self.codes[field]
+            eligible = self.lengths > 0 if field == "outcome" else np.ones(len(codes), dtype=bool)
+            for code, value in enumerate(self.categories[field]):
+                self.postings[(field, value)] = np.flatnonzero((codes == code) & eligible)
+
+    @classmethod
+    def from_transcripts(cls, transcripts) -> "TranscriptIndex":
+        """Build from transcript dicts"""
+        ids, domains, intents, outcomes, lengths, reasons = [], [], [], [], [], []
+        for t in transcripts:
+            ids.append(t.get("transcript_id"))
+            domains.append(t.get("domain", "Unknown"))
+            intents.append(t.get("intent", "Unknown"))
+            outcomes.append(label_outcome(t))
+            lengths.append(len(t.get("conversation", [])))
+            reasons.append(t.get("reason_for_call", ""))
+        return cls(ids, domains, intents, outcomes, lengths, reasons)
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "TranscriptIndex":
+        """Build from a dataset snapshot without decoding any turns"""
+        table = snapshot.turn_table
+        outcomes = [table.categories["outcome"][code] for code in table.transcript_outcome]
+        lengths = np.diff(table.transcript_starts)
+        domains, intents, reasons = [], [], []
+        for position in range(table.num_transcripts):
+            meta = snapshot.get_metadata(position)
+            domains.append(meta.get("domain", "Unknown"))
+            intents.append(meta.get("intent", "Unknown"))
+            reasons.append(meta.get("reason_for_call", ""))
+        return cls(table.transcript_ids, domains, intents, outcomes, lengths, reasons)
+
+    def __len__(self) -> int:
+        return len(self.transcript_ids)
+
+    def posting(self, field: str, value: str) -> np.ndarray:
+        """Ascending ranks of transcripts whose field equals value"""
+        return self.postings.get((field, value), np.empty(0, dtype=np.int64))
+
+    def count(self, field: str, value: str) -> int:
+        return len(self.posting(field, value))
+
+    def record(self, rank: int, fields: Sequence[str] = LISTING_FIELDS) -> dict:
+        """Listing entry of the transcript at a rank, restricted to fields"""
+        record = {}
+        for field in fields:
+            if field == "transcript_id":
+                record[field] = self.transcript_ids[rank]
+            elif field == "reason_for_call":
+                record[field] = self.reasons[rank]
+            elif field == "conversation_length":
+                record[field] = int(self.lengths[rank])
+            else:
+                record[field] = self.categories[field][self.codes[field][rank]]
+        return record
+
+    def query(self, filters: Dict[str, str], min_length: int = 0,
+              after: Optional[str] = None, limit: int = 100,
+              fields: Sequence[str] = DEFAULT_LISTING_FIELDS) -> dict:
+        """
+        One page of transcripts matching every filter, in transcript_id order
+
+        Args:
+            filters: Equality filters on INDEXED_FIELDS (e.g. {"outcome": "ESCALATED"})
+            min_length: Minimum number of turns
+            after: Transcript id to resume after (decoded cursor)
+            limit: Page size
+            fields: Fields of each returned record
+
+        Returns:
+            dict with 'items', 'total' (matching transcripts) and
+            'next_cursor' (None on the last page)
+        """
+        # Start from the smallest posting list; a single filter uses it as is,
+        # other predicates are checked against it with vectorized column lookups
+        if filters:
+            ordered = sorted(filters.items(), key=lambda item: self.count(*item))
+            matching = self.posting(*ordered[0])
+            rest = ordered[1:]
+        else:
+            matching = np.arange(len(self))
+            rest = []
+
+        if rest or min_length:
+            mask = np.ones(len(matching), dtype=bool)
+            for field, value in rest:
+                categories = self.categories[field]
+                code = categories.index(value) if value in categories else -1
+                mask &= self.codes[field][matching] == code
+                if field == "outcome":
+                    mask &= self.lengths[matching] > 0
+            if min_length:
+                mask &= self.lengths[matching] >= min_length
+            matching = matching[mask]
+
+        return self.page(matching, after=after, limit=limit, fields=fields)
+
+    def page(self, matching: np.ndarray, after: Optional[str] = None, limit: int = 100,
+             fields: Sequence[str] = DEFAULT_LISTING_FIELDS) -> dict:
+        """
+        One page of an ascending array of matching ranks (e.g. from a bitmap)
+
+        Returns the same dict as query.
+        """
+        start = 0
+        if after is not None:
+            start = int(np.searchsorted(matching, bisect_right(self.transcript_ids, after)))
+
+        page = matching[start:start + limit]
+        items = [self.record(int(rank), fields) for rank in page]
+        more = start + limit < len(matching)
+        return {
+            "items": items,
+            "total": int(len(matching)),
+            "next_cursor": encode_cursor(self.transcript_ids[int(page[-1])]) if more and len(page) else None,
+        }
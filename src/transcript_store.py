@@ -0,0 +1,182 @@
+"""
+Transcript Store Module - O(1) on-demand transcript retrieval
+Transcripts are located through an offset index (into the JSON file or a
+dataset snapshot), decoded only when requested, and kept in a small LRU.
+"""
+
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.load_data import iter_transcript_offsets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class TranscriptStore(ABC):
+    """
+    Base store: id → location lookup plus an LRU of decoded transcripts
+
+    Subclasses provide _locate(transcript_id), _read(location) and __len__.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _locate(self, transcript_id: str):
+        """Location of a transcript (None if unknown)"""
+
+    @abstractmethod
+    def _read(self, location) -> dict:
+        """Decode the transcript at a location"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of indexed transcripts"""
+
+    def __contains__(self, transcript_id: str) -> bool:
+        return self._locate(transcript_id) is not None
+
+    def __getitem__(self, transcript_id: str) -> dict:
+        transcript = self.get(transcript_id)
+        if transcript is None:
+            raise KeyError(transcript_id)
+        return transcript
+
+    def get(self, transcript_id: str) -> Optional[dict]:
+        """
+        Return the transcript dict for an id, or None if unknown
+
+        Callers must treat the returned dict as read-only: it is shared
+        with the LRU.
+        """
+        with self._lock:
+            transcript = self._lru.get(transcript_id)
+            if transcript is not None:
+                self._lru.move_to_end(transcript_id)
+                self.hits += 1
+                return transcript
+
+        location = self._locate(transcript_id)
+        if location is None:
+            return None
+        transcript = self._read(location)
+
+        with self._lock:
+            self.misses += 1
+            self._lru[transcript_id] = transcript
+            self._lru.move_to_end(transcript_id)
+            while len(self._lru) > self.cache_size:
+                self._lru.popitem(last=False)
+        return transcript
+
+    def cache_info(self) -> dict:
+        """LRU statistics"""
+        with self._lock:
+            return {
+                "size": len(self._lru),
+                "capacity": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class JsonTranscriptStore(TranscriptStore):
+    """
+    Reads single transcripts straight from the JSON dataset by byte offset
+
+    The (id → start, end) index is built with one streaming pass and saved
+    next to the dataset as <stem>.offsets.json; it is rebuilt when the
+    dataset's size or mtime changes.
+    """
+
+    def __init__(self, dataset_path, cache_size: int = DEFAULT_CACHE_SIZE,
+                 index_path: Optional[Path] = None):
+        super().__init__(cache_size)
+        self.dataset_path = Path(dataset_path)
+        self.index_path = Path(index_path) if index_path else offset_index_path(dataset_path)
+        self.offsets = self._load_or_build_index()
+
+    def _source_stat(self) -> dict:
+        stat = os.stat(self.dataset_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_or_build_index(self) -> Dict[str, Tuple[int, int]]:
+        source = self._source_stat()
+        if self.index_path.exists():
+            try:
+                saved = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if saved.get("source") == source:
+                    return {tid: (start, end) for tid, start, end in saved["offsets"]}
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable offset index {self.index_path}: {e}")
+
+        logger.info(f"Building transcript offset index for {self.dataset_path}")
+        offsets = {}
+        rows = []
+        for transcript_id, start, end in iter_transcript_offsets(self.dataset_path):
+            offsets.setdefault(transcript_id, (start, end))
+            rows.append([transcript_id, start, end])
+
+        tmp_path = self.index_path.with_name(self.index_path.name + f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({"source": source, "offsets": rows}), encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write offset index {self.index_path}: {e}")
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _locate(self, transcript_id: str):
+        return self.offsets.get(transcript_id)
+
+    def _read(self, location) -> dict:
+        start, end = location
+        with open(self.dataset_path, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+
+class SnapshotTranscriptStore(TranscriptStore):
+    """Decodes single transcripts from a memory-mapped dataset snapshot"""
+
+    def __init__(self, snapshot, cache_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(cache_size)
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.num_transcripts
+
+    def _locate(self, transcript_id: str):
+        return self.snapshot.turn_table.transcript_position(transcript_id)
+
+    def _read(self, location) -> dict:
+        return self.snapshot.get_transcript(location)
+
+
+def offset_index_path(dataset_path) -> Path:
+    """Offset index stored next to the dataset"""
+    dataset_path = Path(dataset_path)
+    return dataset_path.with_name(dataset_path.stem + ".offsets.json")
+
+
+def open_transcript_store(dataset_path, snapshot=None,
+                          cache_size: int = DEFAULT_CACHE_SIZE) -> TranscriptStore:
+    """Snapshot-backed store when a snapshot is open, JSON offsets otherwise"""
+    if snapshot is not None:
+        return SnapshotTranscriptStore(snapshot, cache_size)
+    return JsonTranscriptStore(dataset_path, cache_size)
@@ -0,0 +1,308 @@
+"""
+Turn Table Module - Columnar storage for processed conversation turns
+Compact alternative to the list-of-dicts produced by preprocess_transcripts
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.preprocess import label_outcome
+
+# Keys exposed by every row, in the same order as preprocess_transcripts
+TURN_FIELDS = ("transcript_id", "domain", "intent", "outcome",
+               "turn_number", "speaker", "text")
+
+# Extra keys exposed once a signal column is attached (see annotate_turns)
+SIGNAL_FIELDS = ("signals", "signal_confidences")
+
+
+class TurnRow(MutableMapping):
+    """
+    Dict-like view of a single row in a TurnTable
+
+    Reads are served from the table's columns. Writes (e.g. the "signals"
+    key added by early_warning) are stored on the table under the row
+    index, so they are seen by every later view of the same row, as with
+    the list-of-dicts turns.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TurnTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def _extra(self) -> Optional[dict]:
+        return self._table.row_extras.get(self._index)
+
+    @property
+    def index(self) -> int:
+        """Row position in the owning table"""
+        return self._index
+
+    def __getitem__(self, key):
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        if key not in self._table.row_fields:
+            raise KeyError(key)
+        return self._table.get_field(self._index, key)
+
+    def __setitem__(self, key, value):
+        self._table.row_extras.setdefault(self._index, {})[key] = value
+
+    def __delitem__(self, key):
+        extra = self._extra
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        del extra[key]
+        if not extra:
+            del self._table.row_extras[self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        fields = self._table.row_fields
+        yield from fields
+        extra = self._extra
+        if extra:
+            yield from (k for k in extra if k not in fields)
+
+    def __len__(self) -> int:
+        fields = self._table.row_fields
+        extra = self._extra
+        return len(fields) + (sum(1 for k in extra if k not in fields) if extra else 0)
+
+    def __contains__(self, key) -> bool:
+        extra = self._extra
+        return key in self._table.row_fields or (extra is not None and key in extra)
+
+    def __repr__(self):
+        return f"TurnRow({dict(self)!r})"
+
+
+class TurnTable:
+    """
+    Columnar representation of processed turns
+
+    Layout:
+    - Per transcript: id, and categorical codes for domain, intent, outcome
+    - Per turn: transcript position, turn number, speaker code, and
+      offsets into a single UTF-8 text buffer
+
+    Turns of a transcript are contiguous, so transcript_starts gives the
+    [start, end) row range of every transcript.
+    """
+
+    def __init__(self, transcript_ids: List[str],
+                 categories: Dict[str, List[str]],
+                 transcript_domain: np.ndarray,
+                 transcript_intent: np.ndarray,
+                 transcript_outcome: np.ndarray,
+                 transcript_starts: np.ndarray,
+                 turn_numbers: np.ndarray,
+                 speaker_codes: np.ndarray,
+                 text_offsets: np.ndarray,
+                 text_buffer: bytes):
+        self.transcript_ids = transcript_ids
+        self.categories = categories
+        self.transcript_domain = transcript_domain
+        self.transcript_intent = transcript_intent
+        self.transcript_outcome = transcript_outcome
+        self.transcript_starts = transcript_starts
+        self.turn_numbers = turn_numbers
+        self.speaker_codes = speaker_codes
+        self.text_offsets = text_offsets
+        self.text_buffer = text_buffer
+
+        # Row → transcript position (derived from transcript_starts)
+        counts = np.diff(transcript_starts)
+        self.transcript_codes = np.repeat(
+            np.arange(len(transcript_ids), dtype=np.int32), counts
+        )
+        self._position_by_id = None
+
+        # Optional per-turn signal column (SignalMatrix), see attach_signals
+        self.signal_matrix = None
+        self.row_fields = TURN_FIELDS
+
+        # Row index → keys written onto rows (sparse; see TurnRow)
+        self.row_extras: Dict[int, dict] = {}
+
+    @classmethod
+    def from_transcripts(cls, transcripts: List[dict]) -> "TurnTable":
+        """
+        Build a TurnTable from raw transcripts
+
+        Produces the same rows, in the same order, as preprocess_transcripts.
+        """
+        categories = {"domain": [], "intent": [], "outcome": [], "speaker": []}
+        lookups = {name: {} for name in categories}
+
+        def encode(name, value):
+            lookup = lookups[name]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories[name])
+                categories[name].append(value)
+            return code
+
+        transcript_ids = []
+        domains, intents, outcomes, starts = [], [], [], [0]
+        turn_numbers, speakers, offsets = [], [], [0]
+        buffer = bytearray()
+
+        for t in transcripts:
+            transcript_ids.append(t["transcript_id"])
+            domains.append(encode("domain", t.get("domain", "")))
+            intents.append(encode("intent", t.get("intent", "")))
+            outcomes.append(encode("outcome", label_outcome(t)))
+
+            for idx, turn in enumerate(t["conversation"]):
+                turn_numbers.append(idx + 1)
+                speakers.append(encode("speaker", turn["speaker"]))
+                buffer += turn["text"].encode("utf-8")
+                offsets.append(len(buffer))
+
+            starts.append(len(turn_numbers))
+
+        return cls(
+            transcript_ids=transcript_ids,
+            categories=categories,
+            transcript_domain=np.asarray(domains, dtype=_code_dtype(categories["domain"])),
+            transcript_intent=np.asarray(intents, dtype=_code_dtype(categories["intent"])),
+            transcript_outcome=np.asarray(outcomes, dtype=_code_dtype(categories["outcome"])),
+            transcript_starts=np.asarray(starts, dtype=np.int64),
+            turn_numbers=np.asarray(turn_numbers, dtype=np.int32),
+            speaker_codes=np.asarray(speakers, dtype=_code_dtype(categories["speaker"])),
+            text_offsets=np.asarray(offsets, dtype=np.int64),
+            text_buffer=bytes(buffer),
+        )
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.turn_numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TurnRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        return TurnRow(self, index)
+
+    def __iter__(self) -> Iterator[TurnRow]:
+        for i in range(len(self)):
+            yield TurnRow(self, i)
+
+    def get_text(self, index: int) -> str:
+        """Decode the text of a single turn"""
+        start, end = self.text_offsets[index], self.text_offsets[index + 1]
+        return self.text_buffer[start:end].decode("utf-8")
+
+    def get_field(self, index: int, field: str):
+        """Return a single field of a row, as preprocess_transcripts would"""
+        if field == "text":
+            return self.get_text(index)
+        if field == "turn_number":
+            return int(self.turn_numbers[index])
+        if field == "speaker":
+            return self.categories["speaker"][self.speaker_codes[index]]
+        if field == "signals" and self.signal_matrix is not None:
+            return self.signal_matrix.turn_signals(index)
+        if field == "signal_confidences" and self.signal_matrix is not None:
+            return dict(self.signal_matrix.turn_confidences(index))
+
+        position = self.transcript_codes[index]
+        if field == "transcript_id":
+            return self.transcript_ids[position]
+        if field == "domain":
+            return self.categories["domain"][self.transcript_domain[position]]
+        if field == "intent":
+            return self.categories["intent"][self.transcript_intent[position]]
+        if field == "outcome":
+            return self.categories["outcome"][self.transcript_outcome[position]]
+        raise KeyError(field)
+
+    def attach_signals(self, signal_matrix) -> None:
+        """
+        Attach a SignalMatrix as the table's signal column
+
+        Rows then expose 'signals' and 'signal_confidences' keys, the same
+        keys annotate_turns writes onto list-of-dict turns.
+        """
+        if signal_matrix is not None and len(signal_matrix) != len(self):
+            raise ValueError("signal matrix does not match table length")
+        self.signal_matrix = signal_matrix
+        self.row_fields = TURN_FIELDS if signal_matrix is None else TURN_FIELDS + SIGNAL_FIELDS
+
+    def to_dicts(self) -> List[dict]:
+        """Materialize the list-of-dicts form produced by preprocess_transcripts"""
+        return [dict(row) for row in self]
+
+    # ------------------------------------------------------------------
+    # Transcript access and vectorized helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def num_transcripts(self) -> int:
+        return len(self.transcript_ids)
+
+    def transcript_position(self, transcript_id: str) -> Optional[int]:
+        """Position of the first transcript with this id, or None"""
+        if self._position_by_id is None:
+            index = {}
+            for position, tid in enumerate(self.transcript_ids):
+                index.setdefault(tid, position)
+            self._position_by_id = index
+        return self._position_by_id.get(transcript_id)
+
+    def transcript_rows(self, transcript_id: str) -> List[TurnRow]:
+        """Rows of a transcript in turn order (empty if unknown)"""
+        position = self.transcript_position(transcript_id)
+        if position is None:
+            return []
+        start, end = self.transcript_starts[position], self.transcript_starts[position + 1]
+        return [TurnRow(self, i) for i in range(start, end)]
+
+    def category_code(self, field: str, value: str) -> int:
+        """Code of a categorical value, or -1 if it never occurs"""
+        try:
+            return self.categories[field].index(value)
+        except ValueError:
+            return -1
+
+    def outcome_mask(self, outcome: str) -> np.ndarray:
+        """Boolean mask over turns whose transcript has this outcome"""
+        code = self.category_code("outcome", outcome)
+        return self.transcript_outcome[self.transcript_codes] == code
+
+    def speaker_mask(self, speaker: str) -> np.ndarray:
+        """Boolean mask over turns spoken by this (case-insensitive) speaker"""
+        speaker = speaker.lower()
+        codes = [i for i, s in enumerate(self.categories["speaker"]) if s.lower() == speaker]
+        return np.isin(self.speaker_codes, codes)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and text buffer"""
+        arrays = (self.transcript_domain, self.transcript_intent, self.transcript_outcome,
+                  self.transcript_starts, self.turn_numbers, self.speaker_codes,
+                  self.text_offsets, self.transcript_codes)
+        return sum(a.nbytes for a in arrays) + len(self.text_buffer)
+
+    def __repr__(self):
+        return f"TurnTable({self.num_transcripts} transcripts, {len(self)} turns)"
+
+
+def _code_dtype(categories: List[str]):
+    """Smallest unsigned dtype able to hold every category code"""
+    if len(categories) <= np.iinfo(np.uint8).max:
+        return np.uint8
+    if len(categories) <= np.iinfo(np.uint16).max:
+        return np.uint16
+    return np.uint32
@@ -246,3 +246,46 @@ def create_transcript_index(transcripts):
         dict: Mapping of transcript_id to transcript
     """
     return {t["transcript_id"]: t for t in transcripts}
+
+
+def get_process_memory():
+    """
+    Report memory of the current process.
+    
+    On Linux, /proc/self/smaps_rollup splits resident memory into pages
+    shared with other processes (e.g. copy-on-write pages inherited from
+    a preloading gunicorn master) and pages private to this process.
+    
+    Returns:
+        dict: Memory figures in MB (keys present depend on the platform)
+    """
+    memory = {}
+    fields = {
+        "Rss": "rss_mb",
+        "Pss": "pss_mb",
+        "Shared_Clean": "shared_clean_mb",
+        "Shared_Dirty": "shared_dirty_mb",
+        "Private_Clean": "private_clean_mb",
+        "Private_Dirty": "private_dirty_mb",
+    }
+    
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    memory[fields[name]] = round(int(rest.split()[0]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    
+    if "rss_mb" not in memory:
+        try:
+            import resource
+            import sys
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+            memory["max_rss_mb"] = round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+        except (ImportError, OSError):
+            pass
+    
+    return memory
@@ -89,6 +89,27 @@ const API = {
         }
     },
 
+    /**
+     * Get every dashboard panel (stats, causes, signals, warnings, domains,
+     * intents) in one request, falling back to one request per panel
+     */
+    async getDashboard() {
+        try {
+            return await this.request('/dashboard');
+        } catch (error) {
+            console.warn('Dashboard bundle unavailable, loading panels separately');
+            const [stats, causes, signals, warnings, domains, intents] = await Promise.all([
+                this.getStats(),
+                this.getCauses(),
+                this.getSignals(),
+                this.getWarnings(),
+                this.getDomains(),
+                this.getIntents()
+            ]);
+            return { stats, causes, signals, warnings, domains, intents };
+        }
+    },
+
     /**
      * Get overall statistics
      */
@@ -84,23 +84,16 @@ class CausalChatApp {
     async loadData() {
         this.showLoading();
         try {
-            // Load all data in parallel with timeout
-            const results = await Promise.allSettled([
-                API.getStats(),
-                API.getCauses(),
-                API.getSignals(),
-                API.getWarnings(),
-                API.getDomains(),
-                API.getIntents()
-            ]);
-
-            // Extract results, using fallback values if any fail
-            const stats = results[0].status === 'fulfilled' ? results[0].value : {};
-            const causes = results[1].status === 'fulfilled' ? results[1].value : {};
-            const signals = results[2].status === 'fulfilled' ? results[2].value : {};
-            const warnings = results[3].status === 'fulfilled' ? results[3].value : {};
-            const domains = results[4].status === 'fulfilled' ? results[4].value : {};
-            const intents = results[5].status === 'fulfilled' ? results[5].value : {};
+            // Load all panels in a single request
+            const dashboard = await API.getDashboard();
+
+            // Use empty values for any missing panel
+            const stats = dashboard.stats || {};
+            const causes = dashboard.causes || {};
+            const signals = dashboard.signals || {};
+            const warnings = dashboard.warnings || {};
+            const domains = dashboard.domains || {};
+            const intents = dashboard.intents || {};
 
             // Store data
             this.data = { stats, causes, signals, warnings, domains, intents };
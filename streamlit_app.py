@@ -114,7 +114,7 @@ def load_backend():
     try:
         # Load data
         with st.spinner("Loading transcripts..."):
-            transcripts = load_transcripts()
+            transcripts = load_transcripts(use_snapshot=True)
             processed = preprocess_transcripts(transcripts)
             transcripts_dict = {t["transcript_id"]: t for t in transcripts}
         
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Endpoint tests for the cached read-only API
+Runs the Flask app on a synthetic dataset through the test client
+"""
+
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_chain_stats import make_transcripts
+from test_similarity_index import assert_top_k, brute_force_scores, brute_force_vectors
+
+DATA_DIR = Path(tempfile.mkdtemp(prefix="causal-api-test-"))
+atexit.register(shutil.rmtree, DATA_DIR, ignore_errors=True)
+DATASET = DATA_DIR / "transcripts.json"
+DATASET.write_text(json.dumps({"transcripts": make_transcripts(300)}))
+os.environ["DATASET_PATH"] = str(DATASET)
+
+import api
+
+# api may already have been imported by another test module
+api.DATASET_PATH = str(DATASET)
+api.app.config["TESTING"] = True
+
+
+def client():
+    """Test client of the loaded app"""
+    api.load_data()
+    return api.app.test_client()
+
+
+@contextmanager
+def data_not_ready(loading=True):
+    """Make the loaded app look like it is still loading, or failed to load"""
+    saved = (api._cache["load_error"], api.DATA_WAIT_TIMEOUT, api._loader_thread)
+    if loading:
+        api._data_ready.clear()
+        api._loader_thread = threading.current_thread()  # No background load starts
+        api.DATA_WAIT_TIMEOUT = 0.01
+    else:
+        api._cache["load_error"] = "dataset is corrupt"
+    try:
+        yield
+    finally:
+        api._cache["load_error"], api.DATA_WAIT_TIMEOUT, api._loader_thread = saved
+        api._data_ready.set()
+
+
+def assert_status(response, status):
+    assert response.status_code == status, (response.status_code, response.get_data(as_text=True)[:200])
+    return response.get_json()
+
+
+def test_transcript_lookup():
+    """/api/transcript/<id> serves a transcript from the store and 404s on unknown ids"""
+    c = client()
+    expected = make_transcripts(300)[42]
+    body = assert_status(c.get(f"/api/transcript/{expected['transcript_id']}"), 200)
+    assert body["data"]["transcript"] == expected
+    assert body["data"]["processed"]["transcript_id"] == expected["transcript_id"]
+
+    body = assert_status(c.get("/api/transcript/NOPE-%C3%9C"), 404)
+    assert body["success"] is False
+
+
+def test_ready():
+    """/api/ready is 200 once loaded and 503 while loading or after a failed load"""
+    c = client()
+    body = assert_status(c.get("/api/ready"), 200)
+    assert body["ready"] and body["transcripts"] == 300
+
+    with data_not_ready(loading=True):
+        response = c.get("/api/ready")
+        body = assert_status(response, 503)
+        assert body["status"] == "loading" and response.headers["Retry-After"]
+        response = c.get("/api/stats")
+        assert_status(response, 503)
+        assert response.headers["Retry-After"]
+
+    with data_not_ready(loading=False):
+        response = c.get("/api/ready")
+        body = assert_status(response, 503)
+        assert body["status"] == "failed" and "dataset is corrupt" in body["error"]
+        assert "Retry-After" not in response.headers
+        assert_status(c.get("/api/domains"), 503)
+
+    assert_status(c.get("/api/health"), 200)
+    assert_status(c.get("/api/ready"), 200)
+
+
+def test_etag_revalidation():
+    """Cached endpoints send a strong ETag and answer a matching If-None-Match with 304"""
+    c = client()
+    for url in ("/api/stats", "/api/causes", "/api/signals", "/api/warnings", "/api/domains",
+                "/api/intents", "/api/chain-stats?min_confidence=0", "/api/chain-stats/prefix",
+                "/api/chain-stats/mined?max_length=4&min_length=2"):
+        first = c.get(url)
+        body = assert_status(first, 200)
+        assert body["success"], url
+        etag = first.headers["ETag"]
+        assert not etag.startswith("W/"), url
+
+        again = c.get(url)
+        assert again.headers["ETag"] == etag and again.data == first.data, url
+        revalidated = c.get(url, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304 and not revalidated.data, url
+        stale = c.get(url, headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == 200 and stale.data == first.data, url
+
+    # Query parameters are part of the key
+    assert c.get("/api/chain-stats?min_confidence=0").headers["ETag"] != \
+        c.get("/api/chain-stats?min_confidence=0.9").headers["ETag"]
+
+    stats = assert_status(c.get("/api/stats"), 200)["data"]
+    assert stats["total_transcripts"] == len(api._cache["transcripts"])
+
+
+def test_failed_panels_are_not_cached():
+    """A panel that fails answers 500 and is recomputed on the next request"""
+    c = client()
+    original = api.analyze_causes
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("analysis failed")
+
+    api._response_cache.clear()
+    api.analyze_causes = broken
+    try:
+        for _ in range(2):
+            response = c.get("/api/causes")
+            body = assert_status(response, 500)
+            assert not body["success"] and "ETag" not in response.headers
+    finally:
+        api.analyze_causes = original
+
+    body = assert_status(c.get("/api/causes"), 200)
+    assert body["success"] and body["data"]["total_signals"] > 0
+
+
+def test_chain_stats_routes():
+    """Prefix, mined and transcript drill-down routes validate their parameters"""
+    c = client()
+    detector = api._cache["detector"]
+    chain_key = max(detector.chain_stats, key=lambda k: detector.chain_stats[k]["support"])
+    chain = ",".join(chain_key)
+
+    data = assert_status(c.get(f"/api/chain-stats/prefix?prefix={chain_key[0]}&top_k=5"), 200)["data"]
+    assert data["total_chains"] == detector.chain_table.count_prefix(chain_key[:1])
+    assert all(item["chain"][0] == chain_key[0] for item in data["chains"])
+    data = assert_status(c.get(f"/api/chain-stats/prefix?sequence={chain},nosuch"), 200)["data"]
+    assert data["longest_matches"][-1]["chain"] is None
+    assert assert_status(c.get("/api/chain-stats/prefix?prefix=nosuch"), 200)["data"]["total_chains"] == 0
+    assert_status(c.get("/api/chain-stats/prefix?top_k=0"), 400)
+    assert_status(c.get("/api/chain-stats/prefix?top_k=ten"), 400)
+
+    data = assert_status(c.get("/api/chain-stats/mined?max_length=5&min_length=3&max_gap=any"), 200)["data"]
+    assert all(3 <= len(item["chain"]) <= 5 for item in data["chains"])
+    for query in ("max_length=9", "max_gap=-1", "min_evidence=0", "top_k=x"):
+        assert_status(c.get(f"/api/chain-stats/mined?{query}"), 400)
+
+    # Pages follow next_cursor through every supporting transcript
+    seen, cursor = [], None
+    while True:
+        url = f"/api/chain-stats/transcripts?chain={chain}&limit=7"
+        data = assert_status(c.get(url + (f"&cursor={cursor}" if cursor else "")), 200)["data"]
+        seen += data["transcripts"]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == detector.chain_transcripts(chain_key)
+    assert len(seen) == data["support"]
+
+    assert_status(c.get("/api/chain-stats/transcripts"), 400)
+    assert_status(c.get(f"/api/chain-stats/transcripts?chain={chain}&limit=0"), 400)
+    assert_status(c.get(f"/api/chain-stats/transcripts?chain={chain}&cursor=not-a-cursor"), 400)
+    assert_status(c.get("/api/chain-stats/transcripts?chain=nosuch"), 404)
+
+
+def test_chain_prefix_ranking():
+    """/api/chain-stats/prefix ranks and matches chains like a scan of chain_stats"""
+    c = client()
+    detector = api._cache["detector"]
+    chain_stats = dict(detector.chain_stats)
+    alphabet = detector.chain_table.alphabet
+
+    prefixes = [()] + [(signal,) for signal in alphabet.names]
+    prefixes += sorted({chain_key[:2] for chain_key in chain_stats if len(chain_key) > 2})
+    for prefix in prefixes:
+        for top_k, min_evidence in ((5, 0), (1000, 0), (3, 20)):
+            under = [k for k, v in chain_stats.items()
+                     if k[:len(prefix)] == prefix and v["occurrences"] >= min_evidence]
+            best = sorted(under, key=lambda k: (-chain_stats[k]["confidence"],
+                                                -chain_stats[k]["occurrences"], alphabet.pack(k)))
+            url = f"/api/chain-stats/prefix?prefix={','.join(prefix)}&top_k={top_k}&min_evidence={min_evidence}"
+            data = assert_status(c.get(url), 200)["data"]
+            assert data["prefix"] == list(prefix)
+            assert data["total_chains"] == sum(k[:len(prefix)] == prefix for k in chain_stats)
+            assert data["chains"] == [api.format_chain(k, chain_stats[k]) for k in best[:top_k]]
+
+    sequence = list(max(chain_stats, key=len)) + ["nosuch"] + list(min(chain_stats, key=len))
+    data = assert_status(c.get(f"/api/chain-stats/prefix?sequence={','.join(sequence)}"), 200)["data"]
+    assert data["sequence"] == sequence
+    for start, match in enumerate(data["longest_matches"]):
+        length = 0
+        while start + length < len(sequence) and tuple(sequence[start:start + length + 1]) in chain_stats:
+            length += 1
+        expected = tuple(sequence[start:start + length])
+        assert match["start"] == start
+        assert match["chain"] == (api.format_chain(expected, chain_stats[expected]) if length else None)
+
+
+def test_mined_chains():
+    """/api/chain-stats/mined returns mine_chains filtered by length and ranked by confidence"""
+    c = client()
+    detector = api._cache["detector"]
+    cases = [  # (query, max_length, min_length, max_gap, min_evidence, top_k)
+        ("", 6, 4, 0, None, 50),
+        ("max_length=5&min_length=2&max_gap=2&top_k=1000", 5, 2, 2, None, 1000),
+        ("max_gap=any&min_evidence=20&top_k=7", 6, 4, None, 20, 7),
+    ]
+    for query, max_length, min_length, max_gap, min_evidence, top_k in cases:
+        mined = detector.mine_chains(min_evidence=min_evidence, max_length=max_length, max_gap=max_gap,
+                                     max_patterns=api.MAX_MINED_PATTERNS)
+        patterns = sorted((key for key in mined if len(key) >= min_length),
+                          key=lambda k: (-mined[k]["confidence"], -mined[k]["occurrences"], k))
+
+        data = assert_status(c.get(f"/api/chain-stats/mined?{query}"), 200)["data"]
+        assert data["filters_applied"] == {"max_length": max_length, "min_length": min_length,
+                                           "max_gap": "any" if max_gap is None else max_gap,
+                                           "min_evidence": min_evidence or detector.min_evidence}
+        assert data["total_patterns"] == len(patterns) > 0
+        assert data["chains"] == [dict(api.format_chain(k, mined[k]), examples=mined[k]["examples"])
+                                  for k in patterns[:top_k]]
+
+    for query in ("max_length=0", "top_k=1001", "max_gap=some", "min_evidence=x"):
+        assert_status(c.get(f"/api/chain-stats/mined?{query}"), 400)
+
+
+def test_similar():
+    """/api/similar ranks neighbours and validates top_k and mode"""
+    c = client()
+    transcript_id = api._cache["transcripts"][0]["transcript_id"]
+    for mode in ("exact", "lsh"):
+        data = assert_status(c.get(f"/api/similar/{transcript_id}?top_k=5&mode={mode}"), 200)["data"]
+        assert data["mode"] == mode and data["count"] == len(data["similar_cases"]) <= 5
+        assert transcript_id not in data["similar_cases"]
+        assert data["scores"] == sorted(data["scores"], reverse=True)
+
+    # Exact mode ranks like a brute-force cosine over the whole dataset
+    scores = brute_force_scores(brute_force_vectors(api._cache["transcripts"]), transcript_id)
+    data = assert_status(c.get(f"/api/similar/{transcript_id}?top_k=20"), 200)["data"]
+    assert_top_k(list(zip(data["similar_cases"], data["scores"])),
+                 {tid: round(score, 4) for tid, score in scores.items()}, 20)
+
+    for query in ("top_k=0", "top_k=101", "top_k=many", "mode=fuzzy"):
+        assert_status(c.get(f"/api/similar/{transcript_id}?{query}"), 400)
+    assert assert_status(c.get("/api/similar/NOPE"), 200)["data"]["similar_cases"] == []
+
+
+def test_explain_warm():
+    """/api/explain/warm precomputes explanations in the query engine's cache"""
+    c = client()
+    engine = api._cache["query_engine"]
+    cache = engine.explanation_cache
+    assert cache is api._explanation_cache
+    escalated = [t["transcript_id"] for t in api._cache["transcripts"]
+                 if api.label_outcome(t) == "ESCALATED"][:5]
+    misses = cache.misses
+    assert_status(c.get(f"/api/explain/{escalated[0]}"), 200)
+    assert_status(c.get(f"/api/explain/{escalated[0]}"), 200)
+    assert cache.misses == misses + 1  # Second view served from the engine's cache
+    assert_status(c.get("/api/explain/NOPE"), 404)
+
+    data = assert_status(c.post("/api/explain/warm", json={"transcript_ids": escalated}), 200)["data"]
+    assert data["computed"] == len(escalated) - 1 and data["cache"] == cache.cache_info()
+    # Warm again: everything is cached now
+    assert assert_status(c.post("/api/explain/warm", json={"transcript_ids": escalated}), 200)["data"]["computed"] == 0
+    assert_status(c.post("/api/explain/warm", json={}), 200)
+    assert_status(c.post("/api/explain/warm", json={"transcript_ids": "T1"}), 400)
+    assert_status(c.post("/api/explain/warm", json={"top_n": "many"}), 400)
+
+    # A rebuilt engine shares the cache and its views, but none of its entries
+    rebuilt = api.CausalQueryEngine(engine.detector, engine.transcripts, engine.processed_turns,
+                                    explanation_cache=cache)
+    assert rebuilt.warm_explanations(top_n=5) == len(cache.most_viewed(5)) > 0
+    assert rebuilt.explain_escalation(escalated[0]) is not engine.explain_escalation(escalated[0])
+
+
+def test_sqlite_response_cache():
+    """The SQLite backend is shared between processes, versioned and size-bounded"""
+    from src.response_cache import (CachedResponse, ResponseCache, SqliteResponseCache,
+                                    cache_key, make_etag, open_response_cache)
+
+    db_path = DATA_DIR / "responses.sqlite"
+    first = open_response_cache("sqlite", path=db_path, max_bytes=1000)
+    second = open_response_cache("sqlite", path=db_path, max_bytes=1000)
+    assert isinstance(first, SqliteResponseCache)
+
+    def entry(size):
+        body = b"x" * size
+        return CachedResponse(body, make_etag(body))
+
+    key = cache_key("get_stats", {}, "v1")
+    first.put(key, entry(100))
+    assert second.get(key) == first.get(key) == entry(100)
+
+    # Storing a new version drops every older one
+    newer = cache_key("get_stats", {}, "v2")
+    second.put(newer, entry(100))
+    assert first.get(key) is None and first.get(newer) is not None
+
+    # The oldest entries are evicted once max_bytes is exceeded
+    keys = [cache_key("get_chain_stats", {"top": str(i)}, "v2") for i in range(12)]
+    for k in keys:
+        first.put(k, entry(100))
+    info = second.cache_info()
+    assert info["bytes"] <= 1000 and second.get(keys[-1]) is not None
+    assert first.get(newer) is None and first.get(keys[0]) is None
+
+    # Unknown backends and unusable paths fall back to the memory cache
+    assert isinstance(open_response_cache("redis"), ResponseCache)
+    assert isinstance(open_response_cache("sqlite", path=DATA_DIR / "missing" / "x.sqlite"), ResponseCache)
+
+    # Responses cached by one worker are revalidated by another
+    c = client()
+    saved = api._response_cache
+    try:
+        api._response_cache = open_response_cache("sqlite", path=DATA_DIR / "shared.sqlite")
+        response = c.get("/api/domains")
+        assert_status(response, 200)
+        etag = response.headers["ETag"]
+        api._response_cache = open_response_cache("sqlite", path=DATA_DIR / "shared.sqlite")
+        assert c.get("/api/domains", headers={"If-None-Match": etag}).status_code == 304
+        assert api._response_cache.hits == 1 and api._response_cache.misses == 0
+    finally:
+        api._response_cache = saved
+
+
+def test_dashboard_bundle():
+    """/api/dashboard bundles every panel; a failing panel fails the whole bundle"""
+    c = client()
+    api._response_cache.clear()
+    first = c.get("/api/dashboard")
+    data = assert_status(first, 200)["data"]
+    assert set(data) == set(api.DASHBOARD_PANELS)
+    for name in ("stats", "causes", "signals", "warnings", "domains", "intents"):
+        assert data[name] == assert_status(c.get(f"/api/{name}"), 200)["data"], name
+    revalidated = c.get("/api/dashboard", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+    original = api.DASHBOARD_PANELS["domains"]
+
+    def broken():
+        raise RuntimeError("domains failed")
+
+    api._response_cache.clear()
+    api.DASHBOARD_PANELS["domains"] = broken
+    try:
+        response = c.get("/api/dashboard")
+        body = assert_status(response, 500)
+        assert body["errors"] == {"domains": "domains failed"}
+        assert "stats" in body["data"] and "ETag" not in response.headers
+    finally:
+        api.DASHBOARD_PANELS["domains"] = original
+
+    assert assert_status(c.get("/api/dashboard"), 200)["data"] == data
+
+
+def walk_listing(c, url, limit):
+    """Every item of a cursor-paginated listing, plus the last page"""
+    items, cursor = [], None
+    while True:
+        page_url = f"{url}&limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        data = assert_status(c.get(page_url), 200)["data"]
+        items += data.get("escalated_list", data.get("resolved_list"))
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return items, data
+
+
+def expected_listing(outcome, domain=None, intent=None, min_length=0):
+    """Brute-force listing of the loaded transcripts, in transcript_id order"""
+    return sorted(
+        t["transcript_id"] for t in api._cache["transcripts"]
+        if api.label_outcome(t) == outcome
+        and (domain is None or t["domain"] == domain)
+        and (intent is None or t["intent"] == intent)
+        and len(t["conversation"]) >= min_length
+    )
+
+
+def transcript_signals():
+    """Signal types found in any turn of each loaded transcript"""
+    found = {}
+    for turn in api._cache["processed"]:
+        found.setdefault(turn["transcript_id"], set()).update(api.get_turn_signals(turn))
+    return found
+
+
+def test_listing_pagination():
+    """/api/escalated and /api/resolved page with cursors, filters and field projection"""
+    c = client()
+    for outcome, url in (("ESCALATED", "/api/escalated?"), ("RESOLVED", "/api/resolved?")):
+        items, last = walk_listing(c, url, limit=13)
+        assert [item["transcript_id"] for item in items] == expected_listing(outcome)
+        assert last["total_matching"] == len(items)
+        assert set(items[0]) == set(api.DEFAULT_LISTING_FIELDS)
+
+    items, last = walk_listing(c, "/api/escalated?domain=Billing&min_length=8", limit=5)
+    assert [item["transcript_id"] for item in items] == expected_listing("ESCALATED", "Billing", min_length=8)
+    assert all(item["conversation_length"] >= 8 for item in items)
+    assert last["filters_applied"] == {"domain": "Billing", "intent": None, "min_length": 8, "signals": []}
+
+    items, _ = walk_listing(c, "/api/resolved?intent=Inquiry&fields=transcript_id,outcome", limit=50)
+    assert [item["transcript_id"] for item in items] == expected_listing("RESOLVED", intent="Inquiry")
+    assert all(set(item) == {"transcript_id", "outcome"} and item["outcome"] == "RESOLVED" for item in items)
+
+    for query in ("limit=0", "limit=1001", "limit=ten", "min_length=long",
+                  "fields=transcript_id,secret", "cursor=%21%21%21"):
+        assert_status(c.get(f"/api/escalated?{query}"), 400)
+
+
+def test_listing_signal_filters():
+    """Signal filters on the listings are resolved with the transcript bitmaps"""
+    c = client()
+    found = transcript_signals()
+    signal_types = api._cache["transcript_bitmaps"].values("signal")
+    assert len(signal_types) >= 2
+
+    for signals in [[s] for s in signal_types] + [signal_types[:2], signal_types]:
+        items, last = walk_listing(c, f"/api/escalated?signal={','.join(signals)}", limit=20)
+        expected = [tid for tid in expected_listing("ESCALATED") if set(signals) <= found.get(tid, set())]
+        assert [item["transcript_id"] for item in items] == expected, signals
+        assert last["filters_applied"]["signals"] == signals
+
+    signal = signal_types[0]
+    items, _ = walk_listing(c, f"/api/resolved?signal={signal}&domain=Tech&min_length=6", limit=9)
+    expected = [tid for tid in expected_listing("RESOLVED", "Tech", min_length=6) if signal in found.get(tid, set())]
+    assert [item["transcript_id"] for item in items] == expected
+
+    body = assert_status(c.get("/api/escalated?signal=nosuch"), 400)
+    assert body["allowed_signals"] == signal_types
+
+
+TESTS = [
+    ("Transcript lookup", test_transcript_lookup),
+    ("Readiness", test_ready),
+    ("ETag revalidation", test_etag_revalidation),
+    ("Failed panels", test_failed_panels_are_not_cached),
+    ("Chain stats routes", test_chain_stats_routes),
+    ("Chain prefix ranking", test_chain_prefix_ranking),
+    ("Mined chains", test_mined_chains),
+    ("Similar", test_similar),
+    ("Explain warm-up", test_explain_warm),
+    ("SQLite response cache", test_sqlite_response_cache),
+    ("Dashboard bundle", test_dashboard_bundle),
+    ("Listing pagination", test_listing_pagination),
+    ("Listing signal filters", test_listing_signal_filters),
+]
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("API ENDPOINT TESTS")
+    print("="*70)
+
+    results = []
+    for name, test_func in TESTS:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the compressed chain posting lists
+Both encodings must give back exactly the ranks they were built from
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.chain_postings import BLOCK_SIZE, PostingList, decode_varints, encode_varints
+
+
+def test_varint_round_trip():
+    """Varints round-trip at every byte-length boundary up to 2**32 - 1"""
+    edges = [0, 1, 127, 128, 255, (1 << 14) - 1, 1 << 14, (1 << 21) - 1, 1 << 21,
+             (1 << 28) - 1, 1 << 28, (1 << 32) - 1]
+    values = np.array(edges + list(np.random.default_rng(3).integers(0, 1 << 32, 1000)), dtype=np.int64)
+    data = encode_varints(values)
+    assert data.dtype == np.uint8 and len(data) == sum(max(1, -(-int(v).bit_length() // 7)) for v in values)
+    assert np.array_equal(decode_varints(data), values)
+    assert len(decode_varints(encode_varints(np.empty(0, dtype=np.int64)))) == 0
+
+
+def sample_rank_lists():
+    """(ranks, universe, expected encoding) of sparse, dense and edge-case lists"""
+    rng = np.random.default_rng(5)
+    cases = [(np.empty(0, dtype=np.int64), 10, "delta"),
+             (np.array([0]), 1, "delta"),
+             (np.array([(1 << 32) - 2]), 1 << 32, "delta")]
+    for size in (1, BLOCK_SIZE - 1, BLOCK_SIZE, BLOCK_SIZE + 1, 1000):
+        cases.append((np.sort(rng.choice(1_000_000, size, replace=False)), 1_000_000, "delta"))
+    for size in (2000, 5000):
+        cases.append((np.sort(rng.choice(8000, size, replace=False)), 8000, "bitmap"))
+    cases.append((np.arange(3000), 3000, "bitmap"))
+    return cases
+
+
+def test_round_trip_both_encodings():
+    """from_sorted picks the smaller encoding and to_array returns the ranks"""
+    for ranks, universe, encoding in sample_rank_lists():
+        postings = PostingList.from_sorted(ranks, universe)
+        assert postings.encoding == encoding, (len(ranks), universe, postings)
+        assert len(postings) == len(ranks)
+        assert np.array_equal(postings.to_array(), ranks)
+        if encoding == "bitmap":
+            assert postings.nbytes < encode_varints(np.diff(ranks, prepend=0)).nbytes
+
+
+def test_after_with_limits():
+    """after(rank, limit) equals filtering the full list, for any resume point"""
+    for ranks, universe, _ in sample_rank_lists():
+        postings = PostingList.from_sorted(ranks, universe)
+        resume = [-1, universe]
+        if len(ranks):
+            picks = ranks[np.linspace(0, len(ranks) - 1, 9).astype(int)]
+            resume += list(picks) + list(picks - 1) + list(picks + 1)
+        for rank in resume:
+            for limit in (None, 0, 1, 5, BLOCK_SIZE, BLOCK_SIZE + 3, 10_000):
+                expected = ranks[ranks > rank]
+                if limit is not None:
+                    expected = expected[:limit]
+                assert np.array_equal(postings.after(int(rank), limit), expected), (postings, rank, limit)
+
+        # Paging through the list visits every rank once
+        paged, rank = [], -1
+        while True:
+            page = postings.after(rank, 37)
+            if not len(page):
+                break
+            paged.extend(page.tolist())
+            rank = int(page[-1])
+        assert paged == ranks.tolist()
+
+
+TESTS = [
+    ("Varint round trip", test_varint_round_trip),
+    ("Round trip", test_round_trip_both_encodings),
+    ("After with limits", test_after_with_limits),
+]
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("CHAIN POSTING LIST TESTS")
+    print("="*70)
+
+    results = []
+    for name, test_func in TESTS:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the chain statistics engine
+Every way of computing chain_stats must reproduce the original
+per-transcript algorithm on the same corpus
+"""
+
+import json
+import math
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.causal_chains import CausalChainDetector
+from src.causal_model import Outcome, Signal, TemporalSignalSequence
+from src.preprocess import label_outcome, preprocess_transcripts
+from src.signal_extraction import extract_signals, get_signal_confidence
+
+CUSTOMER_LINES = [
+    "I am so frustrated with this", "this is ridiculous, again and again", "hello there",
+    "I want a refund", "I'm fed up and tired", "thanks", "can I talk to a supervisor",
+    "ok fine", "That is unacceptable!",
+]
+AGENT_LINES = [
+    "let me check that for you", "please hold one moment",
+    "sorry, I cannot do that due to our policy here", "sure, done",
+    "I'm sorry but it's not possible to change that now", "how can I help",
+    "processing now", "thanks for waiting", "I'm sorry, we won't allow that under the policy",
+]
+INTENTS = ["Escalation request", "Inquiry", "Complaint", "Report", "Request"]
+REASONS = ["billing error", "complaint about service", "asked for supervisor", "other"]
+
+
+def make_transcripts(count=400, seed=7, first_id=0):
+    """Deterministic synthetic transcripts that produce every signal type"""
+    rng = random.Random(seed)
+    transcripts = []
+    for i in range(first_id, first_id + count):
+        conversation = []
+        for k in range(rng.randint(2, 16)):
+            if k % 2 == 0:
+                conversation.append({"speaker": "Customer", "text": rng.choice(CUSTOMER_LINES)})
+            else:
+                conversation.append({"speaker": "Agent", "text": rng.choice(AGENT_LINES)})
+        transcripts.append({
+            "transcript_id": f"T{i:06d}",
+            "domain": rng.choice(["Billing", "Tech", "Account", "Refund"]),
+            "intent": rng.choice(INTENTS),
+            "reason_for_call": rng.choice(REASONS),
+            "conversation": conversation,
+        })
+    return transcripts
+
+
+def baseline_chain_stats(transcripts, processed_turns, min_evidence=5):
+    """
+    The original compute_chain_statistics: filter the turns of every
+    transcript, rebuild its signal sequence and count every chain
+    """
+    tracker = defaultdict(lambda: {"occurrences": 0, "escalated_count": 0,
+                                   "resolved_count": 0, "supporters": set()})
+    for transcript in transcripts:
+        transcript_id = transcript["transcript_id"]
+        turns = [t for t in processed_turns if t["transcript_id"] == transcript_id]
+        if not turns:
+            continue
+
+        outcome = Outcome(label_outcome(transcript).lower())
+        sequence = TemporalSignalSequence(transcript_id=transcript_id, outcome=outcome)
+        for turn in turns:
+            for signal_type in extract_signals(turn):
+                sequence.add_signal(Signal(
+                    type=signal_type,
+                    turn_number=turn["turn_number"],
+                    speaker=turn["speaker"],
+                    confidence=get_signal_confidence(turn, signal_type),
+                    text=turn["text"]
+                ))
+
+        for chain in sequence.get_chains_up_to_length(3):
+            stats = tracker[tuple(chain)]
+            stats["occurrences"] += 1
+            if outcome == Outcome.ESCALATED:
+                stats["escalated_count"] += 1
+            else:
+                stats["resolved_count"] += 1
+            stats["supporters"].add(transcript_id)
+
+    result = {}
+    for chain_key, stats in tracker.items():
+        if stats["occurrences"] < min_evidence:
+            continue
+        stats["confidence"] = stats["escalated_count"] / stats["occurrences"]
+        stats["confidence_interval"] = CausalChainDetector._wilson_ci(
+            stats["escalated_count"], stats["occurrences"])
+        result[chain_key] = stats
+    return result
+
+
+def assert_matches_baseline(chain_stats, expected):
+    """Counts and confidences must be identical; examples must be supporters"""
+    assert set(chain_stats) == set(expected), "chain keys differ from the baseline"
+    for chain_key, stats in expected.items():
+        actual = chain_stats[chain_key]
+        for field in ("occurrences", "escalated_count", "resolved_count", "confidence"):
+            assert actual[field] == stats[field], (chain_key, field, actual[field], stats[field])
+        assert actual["support"] == len(stats["supporters"]), (chain_key, "support")
+        # Intervals may be vectorized: allow rounding in the last place
+        for got, want in zip(actual["confidence_interval"], stats["confidence_interval"]):
+            assert math.isclose(got, want, rel_tol=0, abs_tol=1e-12), (chain_key, got, want)
+        assert set(actual["examples"]) <= stats["supporters"], (chain_key, "examples")
+        assert len(actual["examples"]) == min(10, len(stats["supporters"])), (chain_key, "examples")
+
+
+def test_single_pass_matches_baseline():
+    """compute_chain_statistics groups turns once and counts the same chains"""
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    expected = baseline_chain_stats(transcripts, turns)
+    assert expected, "synthetic corpus produced no chains"
+
+    detector = CausalChainDetector()
+    assert_matches_baseline(detector.compute_chain_statistics(transcripts, turns), expected)
+
+    # Turns in any order, and transcripts without turns, change nothing
+    shuffled = list(turns)
+    random.Random(1).shuffle(shuffled)
+    empty = {"transcript_id": "EMPTY", "intent": "Complaint", "conversation": []}
+    assert_matches_baseline(
+        detector.compute_chain_statistics(transcripts + [empty], shuffled), expected)
+
+
+def test_streaming_matches_baseline():
+    """compute_chain_statistics_streaming derives turns per transcript"""
+    transcripts = make_transcripts()
+    expected = baseline_chain_stats(transcripts, preprocess_transcripts(transcripts))
+
+    detector = CausalChainDetector()
+    assert_matches_baseline(
+        detector.compute_chain_statistics_streaming(iter(transcripts)), expected)
+
+    for min_evidence in (1, 20):
+        assert_matches_baseline(
+            detector.compute_chain_statistics_streaming(iter(transcripts), min_evidence=min_evidence),
+            baseline_chain_stats(transcripts, preprocess_transcripts(transcripts), min_evidence))
+
+
+def with_repeated_ids(transcripts, seed=11):
+    """
+    Shuffled transcripts plus copies under existing ids: with other turns,
+    without turns (before and after the copies with turns), and an id
+    that never has turns
+    """
+    rng = random.Random(seed)
+    copies = make_transcripts(40, seed=seed)
+    for i, copy in enumerate(copies):
+        copy["transcript_id"] = transcripts[i * 7]["transcript_id"]
+    ids = [transcripts[3]["transcript_id"], transcripts[5]["transcript_id"], "LATE", "NEVER", "NEVER"]
+    turnless = [{"transcript_id": transcript_id, "intent": "Escalation request", "conversation": []}
+                for transcript_id in ids]
+    late = dict(make_transcripts(1, seed=seed + 1)[0], transcript_id="LATE")
+
+    repeated = transcripts + copies + turnless[1:]
+    rng.shuffle(repeated)
+    return turnless[:1] + repeated + [late]
+
+
+def assert_same_chain_stats(detector, chain_stats, expected_detector, expected):
+    """Every chain entry and every supporting transcript list must be identical"""
+    assert set(chain_stats) == set(expected), "chain keys differ"
+    for chain_key, stats in expected.items():
+        assert chain_stats[chain_key] == stats, chain_key
+        supporters = expected_detector.chain_transcripts(chain_key)
+        assert detector.chain_transcripts(chain_key) == supporters, chain_key
+        if len(supporters) > 2:
+            assert detector.chain_transcripts(chain_key, after=supporters[1], limit=5) == supporters[2:7]
+
+
+def test_streaming_groups_repeated_ids():
+    """Repeated ids in a stream are grouped exactly as compute_chain_statistics groups them"""
+    transcripts = with_repeated_ids(make_transcripts(300))
+    turns = preprocess_transcripts(transcripts)
+    for min_evidence in (1, 5):
+        in_memory = CausalChainDetector()
+        expected = in_memory.compute_chain_statistics(transcripts, turns, min_evidence=min_evidence)
+        assert_matches_baseline(expected, baseline_chain_stats(transcripts, turns, min_evidence))
+
+        streaming = CausalChainDetector()
+        chain_stats = streaming.compute_chain_statistics_streaming(iter(transcripts), min_evidence=min_evidence)
+        assert_same_chain_stats(streaming, chain_stats, in_memory, expected)
+        assert "NEVER" not in streaming._rank_of and "LATE" in streaming._rank_of
+
+
+def test_add_then_remove_matches_baseline():
+    """add_transcripts / remove_transcripts update only the delta"""
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics(transcripts[:250], turns)
+    for start in range(250, len(transcripts), 50):
+        batch = transcripts[start:start + 50]
+        assert detector.add_transcripts(batch, turns) == len(batch)
+    assert_matches_baseline(detector.chain_stats, baseline_chain_stats(transcripts, turns))
+
+    removed = random.Random(3).sample([t["transcript_id"] for t in transcripts], 60)
+    assert detector.remove_transcripts(removed + ["NOT-COUNTED"]) == len(removed)
+    kept = [t for t in transcripts if t["transcript_id"] not in set(removed)]
+    assert_matches_baseline(detector.chain_stats, baseline_chain_stats(kept, turns))
+    for chain_key in detector.chain_stats:
+        assert not set(detector.chain_transcripts(chain_key)) & set(removed)
+
+    # Adding them back (with turns derived per transcript) restores the full statistics
+    detector.add_transcripts([t for t in transcripts if t["transcript_id"] in set(removed)])
+    assert_matches_baseline(detector.chain_stats, baseline_chain_stats(transcripts, turns))
+
+
+def test_counter_ranks_stay_ascending():
+    """ChainCounter keeps its ranks ascending when an earlier rank is added late"""
+    from src.chain_counters import ChainCounter
+
+    alive = np.ones(2000, dtype=bool)
+    counter = ChainCounter()
+    ranks = [5, 9, 2, 7, 9, 0] + list(range(10, 1000, 3)) + [1, 8, 1999, 4]
+    for rank in ranks:
+        counter.add(rank, rank, 1, rank % 2 == 0, alive)
+    expected = sorted(set(ranks))
+    assert counter.support == len(expected) and counter.occurrences == len(ranks)
+    assert counter.page(alive).tolist() == expected
+    assert counter.page(alive, after_rank=7, limit=4).tolist() == [8, 9, 10, 13]
+    alive[8] = False
+    assert counter.page(alive, after_rank=7, limit=4).tolist() == [9, 10, 13, 16]
+    counter.freeze(alive)
+    assert counter.ranks(alive).tolist() == [r for r in expected if r != 8]
+
+
+def test_repeated_ids_keep_supporters_ordered():
+    """Ids counted again (in a stream or through add_transcripts) keep chain_transcripts sorted"""
+    first = {"transcript_id": "A", "intent": "Inquiry",
+             "conversation": [{"speaker": "Customer", "text": "hello there"}]}
+    other = {"transcript_id": "B", "intent": "Complaint",
+             "conversation": [{"speaker": "Customer", "text": "I am so frustrated with this"}]}
+    again = dict(first, conversation=other["conversation"])
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics_streaming([first, other, again], min_evidence=1)
+    assert detector.chain_transcripts(("customer_frustration",)) == ["A", "B"]
+    assert detector.chain_transcripts(("customer_frustration",), after="A", limit=1) == ["B"]
+
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics(transcripts[:250], turns)
+    changed = [dict(transcripts[i], conversation=transcripts[i + 1]["conversation"]) for i in (10, 260, 120)]
+    batch = transcripts[250:300] + changed + [transcripts[120]]
+    assert detector.add_transcripts(batch) == len(batch)
+
+    latest = {t["transcript_id"]: t for t in transcripts[:300] + changed + [transcripts[120]]}
+    current = list(latest.values())
+    current_turns = preprocess_transcripts(current)
+    expected = baseline_chain_stats(current, current_turns)
+    assert_matches_baseline(detector.chain_stats, expected)
+    for chain_key, stats in expected.items():
+        supporters = detector.chain_transcripts(chain_key)
+        ranks = [detector._rank_of[tid] for tid in supporters]
+        assert ranks == sorted(set(ranks)) and set(supporters) == stats["supporters"], chain_key
+        if len(supporters) > 3:
+            assert detector.chain_transcripts(chain_key, after=supporters[2], limit=4) == supporters[3:7]
+
+
+def test_parallel_matches_baseline():
+    """compute_chain_statistics_parallel merges per-chunk partials in order"""
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+
+    serial = CausalChainDetector()
+    serial.compute_chain_statistics(transcripts, turns)
+    parallel = CausalChainDetector()
+    parallel.compute_chain_statistics_parallel(transcripts, turns, workers=2, chunk_size=37)
+
+    assert_matches_baseline(parallel.chain_stats, baseline_chain_stats(transcripts, turns))
+    # Identical to the serial run, down to key order and sampled examples
+    assert list(parallel.chain_stats) == list(serial.chain_stats)
+    assert dict(parallel.chain_stats) == dict(serial.chain_stats)
+    for chain_key in serial.chain_stats:
+        assert parallel.chain_transcripts(chain_key) == serial.chain_transcripts(chain_key)
+
+
+def test_sharded_merge_matches_baseline():
+    """Four shard partials written to disk merge into the single-node result"""
+    from src.corpus_aggregates import compute_corpus_aggregates
+    from src.partial_stats import compute_shard_partial, merge_partials, read_partial, write_partial
+    from src.signal_batch import annotate_turns, extract_signals_batch
+
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    single = CausalChainDetector()
+    single.compute_chain_statistics(transcripts, turns)
+
+    size = len(transcripts) // 4
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [write_partial(Path(tmp) / f"shard-{i}.npz",
+                               compute_shard_partial(transcripts[i * size:(i + 1) * size]),
+                               shard=str(i))
+                 for i in range(4)]
+        partials = [read_partial(path) for path in paths]
+    detector, signal_stats = merge_partials(partials)
+
+    assert_matches_baseline(detector.chain_stats, baseline_chain_stats(transcripts, turns))
+    assert list(detector.chain_stats) == list(single.chain_stats)
+    assert dict(detector.chain_stats) == dict(single.chain_stats)
+    for chain_key in single.chain_stats:
+        assert detector.chain_transcripts(chain_key) == single.chain_transcripts(chain_key)
+
+    signals = extract_signals_batch(turns)
+    annotate_turns(turns, signals)
+    assert signal_stats == json.loads(json.dumps(compute_corpus_aggregates(turns, signals)))
+
+    # Shards sampled with different seeds cannot be merged
+    partials[1] = dict(partials[1], seed=1)
+    try:
+        merge_partials(partials)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("partials with different seeds were merged")
+
+
+def test_columnar_matches_baseline():
+    """compute_chain_statistics_from_table reads packed codes from a TurnTable"""
+    from src.turn_table import TurnTable
+
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    expected = baseline_chain_stats(transcripts, turns)
+
+    serial = CausalChainDetector()
+    serial.compute_chain_statistics(transcripts, turns)
+    columnar = CausalChainDetector()
+    columnar.compute_chain_statistics_from_table(TurnTable.from_transcripts(transcripts))
+    assert_matches_baseline(columnar.chain_stats, expected)
+    assert dict(columnar.chain_stats) == dict(serial.chain_stats)
+
+    # A repeated transcript id sees the signals of every copy, as in the serial path
+    repeated = transcripts + transcripts[10:20]
+    serial.compute_chain_statistics(repeated, preprocess_transcripts(repeated))
+    columnar.compute_chain_statistics_from_table(TurnTable.from_transcripts(repeated))
+    assert dict(columnar.chain_stats) == dict(serial.chain_stats)
+
+
+def test_packed_table_queries_match_baseline():
+    """Packed keys round-trip and table queries agree with the plain statistics"""
+    from src.chain_table import pack_chain, unpack_chain
+
+    transcripts = make_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    expected = baseline_chain_stats(transcripts, turns, min_evidence=1)
+
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics(transcripts, turns, min_evidence=1)
+    table = detector.chain_table
+    alphabet = table.alphabet
+
+    for chain_key in expected:
+        key = alphabet.pack(chain_key)
+        assert alphabet.unpack(key) == chain_key
+        assert unpack_chain(pack_chain(alphabet.encode(chain_key))) == tuple(alphabet.encode(chain_key))
+        assert table.entry(table.find(chain_key)) == detector.chain_stats[chain_key]
+    assert alphabet.pack(("no_such_signal",)) is None
+
+    selected = {table.chain_key(row) for row in table.select(min_confidence=0.5, min_evidence=10)}
+    assert selected == {k for k, v in expected.items()
+                        if v["confidence"] >= 0.5 and v["occurrences"] >= 10}
+
+    for signal in alphabet.names:
+        under = {k: v for k, v in expected.items() if k[0] == signal}
+        assert table.count_prefix((signal,)) == len(under)
+        best = sorted(under, key=lambda k: (-under[k]["confidence"], -under[k]["occurrences"],
+                                            alphabet.pack(k)))[:5]
+        assert [table.chain_key(row) for row in table.top_k((signal,), k=5)] == best
+    assert table.count_prefix() == len(expected)
+    assert table.count_prefix(("no_such_signal",)) == 0
+
+
+def contained_patterns(sequence, max_length, max_gap):
+    """Every pattern of up to max_length items embedded in sequence, found exhaustively"""
+    found = set()
+
+    def grow(pattern, end):
+        found.add(pattern)
+        if len(pattern) == max_length:
+            return
+        stop = len(sequence) if max_gap is None else min(len(sequence), end + 2 + max_gap)
+        for position in range(end + 1, stop):
+            grow(pattern + (sequence[position],), position)
+
+    for start, item in enumerate(sequence):
+        grow((item,), start)
+    return found
+
+
+def brute_force_patterns(sequences, min_count, max_length, max_gap):
+    """{pattern: containing sequence indices} of every pattern in min_count sequences"""
+    containing = defaultdict(list)
+    for index, sequence in enumerate(sequences):
+        for pattern in contained_patterns(sequence, max_length, max_gap):
+            containing[pattern].append(index)
+    return {pattern: indices for pattern, indices in containing.items() if len(indices) >= min_count}
+
+
+def test_miner_matches_exhaustive_enumeration():
+    """mine_sequential_patterns finds exactly the frequent patterns, in depth-first order"""
+    from src.chain_miner import mine_sequential_patterns, mine_signal_patterns
+
+    rng = random.Random(3)
+    sequences = [[rng.randrange(4) for _ in range(rng.randint(0, 9))] for _ in range(60)]
+    sequences += [[1, 1, 1, 1, 1, 1], [2, 0, 0, 0, 0, 0, 0, 3]]  # Repeats and a long gap
+    for max_gap in (0, 1, 2, None):
+        for min_count, max_length in ((1, 4), (3, 6), (8, 8)):
+            mined = list(mine_sequential_patterns(sequences, min_count, max_length=max_length,
+                                                  max_gap=max_gap))
+            expected = brute_force_patterns(sequences, min_count, max_length, max_gap)
+            patterns = [pattern for pattern, _ in mined]
+            assert patterns == sorted(expected), (max_gap, min_count, max_length)
+            for pattern, indices in mined:
+                assert indices.tolist() == expected[pattern], (max_gap, pattern)
+
+            capped = list(mine_sequential_patterns(sequences, min_count, max_length=max_length,
+                                                   max_gap=max_gap, max_patterns=10))
+            assert [pattern for pattern, _ in capped] == patterns[:10]
+
+    assert list(mine_sequential_patterns([], 1)) == []
+    names = [["a", "b", "a"], ["b", "a"], ["c"]]
+    assert {p: i.tolist() for p, i in mine_signal_patterns(names, 2, max_gap=None)} == \
+        {("a",): [0, 1], ("b",): [0, 1], ("b", "a"): [0, 1]}
+
+
+def test_mine_chains_matches_exhaustive_enumeration():
+    """mine_chains counts each transcript containing a pattern once, split by outcome"""
+    transcripts = make_transcripts(150)
+    turns = preprocess_transcripts(transcripts)
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics(transcripts, turns, min_evidence=5)
+
+    sequences, escalated, ids = [], [], []
+    for transcript in transcripts:
+        transcript_turns = [t for t in turns if t["transcript_id"] == transcript["transcript_id"]]
+        if not transcript_turns:
+            continue
+        sequences.append([signal for turn in sorted(transcript_turns, key=lambda t: t["turn_number"])
+                          for signal in extract_signals(turn)])
+        escalated.append(label_outcome(transcript).lower() == Outcome.ESCALATED.value)
+        ids.append(transcript["transcript_id"])
+
+    for max_gap in (0, 1, 2, None):
+        mined = detector.mine_chains(min_evidence=5, max_length=5, max_gap=max_gap)
+        expected = brute_force_patterns(sequences, 5, 5, max_gap)
+        assert set(mined) == set(expected), max_gap
+        assert any(len(pattern) > 3 for pattern in mined)
+        for pattern, indices in expected.items():
+            stats = mined[pattern]
+            escalated_count = sum(escalated[i] for i in indices)
+            assert stats["occurrences"] == stats["support"] == len(indices), pattern
+            assert stats["escalated_count"] == escalated_count
+            assert stats["resolved_count"] == len(indices) - escalated_count
+            assert stats["confidence"] == escalated_count / len(indices)
+            assert stats["max_gap"] == max_gap
+            supporters = {ids[i] for i in indices}
+            assert set(stats["examples"]) <= supporters
+            assert len(stats["examples"]) == min(10, len(supporters))
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("CHAIN STATISTICS - REGRESSION TESTS")
+    print("="*70)
+
+    tests = [
+        ("Single pass", test_single_pass_matches_baseline),
+        ("Streaming", test_streaming_matches_baseline),
+        ("Streaming repeated ids", test_streaming_groups_repeated_ids),
+        ("Add then remove", test_add_then_remove_matches_baseline),
+        ("Counter ranks ascending", test_counter_ranks_stay_ascending),
+        ("Repeated ids keep supporters ordered", test_repeated_ids_keep_supporters_ordered),
+        ("Parallel", test_parallel_matches_baseline),
+        ("Sharded merge", test_sharded_merge_matches_baseline),
+        ("Columnar", test_columnar_matches_baseline),
+        ("Packed table queries", test_packed_table_queries_match_baseline),
+        ("Miner vs exhaustive enumeration", test_miner_matches_exhaustive_enumeration),
+        ("Mined chains vs exhaustive enumeration", test_mine_chains_matches_exhaustive_enumeration),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
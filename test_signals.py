@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for signal extraction
+Keyword matching must follow SIGNAL_CONFIG, including edits made at runtime
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from src.config import SIGNAL_CONFIG
+from src.preprocess import preprocess_transcripts
+import src.signal_cache as signal_cache
+from src.signal_batch import SIGNAL_TYPES, annotate_turns, extract_signals_batch
+from src.signal_extraction import (extract_signals, extract_signals_advanced,
+                                   extract_signals_with_confidence,
+                                   get_keyword_matcher, get_signal_confidence)
+from test_chain_stats import make_transcripts
+
+
+def test_keyword_edits_apply():
+    """Keyword lists edited in place or replaced take effect on the next call"""
+    agent_turn = {"speaker": "Agent", "text": "Let me consult the zebra registry"}
+    assert extract_signals(agent_turn) == []
+    matcher = get_keyword_matcher()
+    assert get_keyword_matcher() is matcher  # Unchanged config: compiled once
+
+    keywords = SIGNAL_CONFIG["agent_delay"]["keywords"]
+    keywords.append("zebra")
+    try:
+        assert extract_signals(agent_turn) == ["agent_delay"]
+        assert "agent_delay" in extract_signals_advanced(agent_turn)
+        assert get_signal_confidence(agent_turn, "agent_delay") > 0
+        assert get_keyword_matcher() is not matcher
+    finally:
+        keywords.remove("zebra")
+    assert extract_signals(agent_turn) == []
+    assert get_signal_confidence(agent_turn, "agent_delay") == 0
+
+    customer_turn = {"speaker": "Customer", "text": "This is outrageous"}
+    original = SIGNAL_CONFIG["frustration"]
+    SIGNAL_CONFIG["frustration"] = dict(original, keywords=["outrageous"])
+    try:
+        assert extract_signals(customer_turn) == ["customer_frustration"]
+        assert get_signal_confidence(customer_turn, "frustration") == 1.0
+    finally:
+        SIGNAL_CONFIG["frustration"] = original
+    assert extract_signals(customer_turn) == []
+
+
+def test_batch_matches_per_turn():
+    """extract_signals_batch rows equal per-turn extraction, for dicts and tables"""
+    transcripts = make_transcripts(80)
+    turns = preprocess_transcripts(transcripts)
+    table = preprocess_transcripts(transcripts, columnar=True)
+
+    matrix = extract_signals_batch(turns)
+    assert len(matrix) == len(turns) and matrix.presence.any()
+    for row, turn in enumerate(turns):
+        assert matrix.turn_signals(row) == extract_signals(turn)
+        assert matrix.turn_confidences(row) == extract_signals_with_confidence(turn)
+    from_table = extract_signals_batch(table)
+    assert np.array_equal(from_table.presence, matrix.presence)
+    assert np.array_equal(from_table.confidence, matrix.confidence)
+
+    only_delay = extract_signals_batch(turns, signal_types=["agent_delay"])
+    delay_col = SIGNAL_TYPES.index("agent_delay")
+    assert np.array_equal(only_delay.presence[:, delay_col], matrix.presence[:, delay_col])
+    assert only_delay.presence.sum() == only_delay.presence[:, delay_col].sum()
+
+    annotate_turns(turns, matrix)
+    assert all(turn["signals"] == matrix.turn_signals(row) for row, turn in enumerate(turns))
+
+
+def test_group_and_window_totals():
+    """group_counts and window_totals agree with per-transcript loops"""
+    table = preprocess_transcripts(make_transcripts(50), columnar=True)
+    matrix = extract_signals_batch(table)
+    turns = table.to_dicts()
+
+    per_group = matrix.group_counts(table.transcript_codes, len(table.transcript_ids))
+    for code, transcript_id in enumerate(table.transcript_ids):
+        expected = [0] * len(SIGNAL_TYPES)
+        for turn in turns:
+            if turn["transcript_id"] == transcript_id:
+                for signal in extract_signals(turn):
+                    expected[SIGNAL_TYPES.index(signal)] += 1
+        assert per_group[code].tolist() == expected
+    assert per_group.sum(axis=0).tolist() == list(matrix.counts().values())
+
+    window_size = 3
+    starts, totals = matrix.window_totals(table.transcript_starts, window_size)
+    expected_windows = []
+    for code in range(len(table.transcript_ids)):
+        begin, end = table.transcript_starts[code], table.transcript_starts[code + 1]
+        for start in range(begin, end - window_size + 1):
+            total = sum(len(extract_signals(turns[row])) for row in range(start, start + window_size))
+            expected_windows.append((start, total))
+    assert list(zip(starts.tolist(), totals.tolist())) == expected_windows
+
+
+def test_signal_cache_reuse():
+    """The .signals.npz cache is reused, and only stale columns are recomputed"""
+    transcripts = make_transcripts(40)
+    turns = preprocess_transcripts(transcripts)
+    calls = []
+    real_batch = signal_cache.extract_signals_batch
+
+    def recording_batch(batch_turns, signal_types=None):
+        calls.append(signal_types)
+        return real_batch(batch_turns, signal_types=signal_types)
+
+    signal_cache.extract_signals_batch = recording_batch
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            dataset_path = Path(tmp) / "transcripts.json"
+            dataset_path.write_text(json.dumps({"transcripts": transcripts}))
+            cache_path = signal_cache.signal_cache_path(dataset_path)
+            assert cache_path.name == "transcripts.signals.npz"
+
+            first = signal_cache.load_or_compute_signals(turns, dataset_path)
+            assert calls == [None] and cache_path.exists()
+            assert np.array_equal(first.presence, extract_signals_batch(turns).presence)
+
+            second = signal_cache.load_or_compute_signals(turns, dataset_path)
+            assert calls == [None]  # Cache hit: nothing extracted
+            assert np.array_equal(second.presence, first.presence)
+            assert np.array_equal(second.confidence, first.confidence)
+
+            keywords = SIGNAL_CONFIG["agent_delay"]["keywords"]
+            keywords.append("help")
+            try:
+                third = signal_cache.load_or_compute_signals(turns, dataset_path)
+                assert calls == [None, ["agent_delay"]]
+                expected = extract_signals_batch(turns)
+                assert np.array_equal(third.presence, expected.presence)
+                assert np.array_equal(third.confidence, expected.confidence)
+                assert not np.array_equal(third.presence, first.presence)
+                signal_cache.load_or_compute_signals(turns, dataset_path)
+                assert len(calls) == 2  # Rewritten cache carries the new hash
+            finally:
+                keywords.remove("help")
+
+            dataset_path.write_text(json.dumps({"transcripts": transcripts[:-1]}))
+            signal_cache.load_or_compute_signals(turns, dataset_path)
+            assert calls[-1] is None  # Different dataset contents: full extraction
+    finally:
+        signal_cache.extract_signals_batch = real_batch
+
+
+TESTS = [
+    ("Keyword edits", test_keyword_edits_apply),
+    ("Batch vs per-turn", test_batch_matches_per_turn),
+    ("Group and window totals", test_group_and_window_totals),
+    ("Signal cache reuse", test_signal_cache_reuse),
+]
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("SIGNAL EXTRACTION TESTS")
+    print("="*70)
+
+    results = []
+    for name, test_func in TESTS:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the dataset snapshot and the on-demand transcript stores
+Both must return exactly what the JSON dataset holds
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.preprocess import preprocess_transcripts
+from src.snapshot import SnapshotTranscripts, build_snapshot, open_snapshot, snapshot_path
+from src.transcript_store import (JsonTranscriptStore, SnapshotTranscriptStore,
+                                  open_transcript_store)
+from test_chain_stats import make_transcripts
+
+
+def sample_transcripts():
+    """Synthetic transcripts plus non-ASCII ids and text, extra keys and an empty conversation"""
+    transcripts = make_transcripts(30)
+    transcripts.append({
+        "transcript_id": "T-ÜNICODE-例", "domain": "Billing", "intent": "Complaint",
+        "reason_for_call": "billing error", "time_of_interaction": "2024-01-01",
+        "conversation": [{"speaker": "Customer", "text": "Ça ne marche pas 😠", "sentiment": -0.8},
+                         {"speaker": "Agent", "text": "please hold one moment"}],
+    })
+    transcripts.append({"transcript_id": "T-EMPTY", "intent": "Inquiry", "conversation": []})
+    return transcripts
+
+
+def write_dataset(directory, transcripts, ensure_ascii=True):
+    dataset_path = Path(directory) / "transcripts.json"
+    dataset_path.write_text(json.dumps({"transcripts": transcripts}, ensure_ascii=ensure_ascii, indent=1),
+                            encoding="utf-8")
+    return dataset_path
+
+
+def test_snapshot_round_trip():
+    """A built snapshot reopens with the same transcripts and turn table"""
+    transcripts = sample_transcripts()
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = write_dataset(tmp, transcripts, ensure_ascii=False)
+        assert open_snapshot(dataset_path) is None  # Not built yet
+
+        directory = build_snapshot(dataset_path)
+        assert directory == snapshot_path(dataset_path)
+        snapshot = open_snapshot(dataset_path)
+        assert snapshot is not None
+
+        assert isinstance(snapshot.transcripts, SnapshotTranscripts)
+        assert len(snapshot.transcripts) == len(transcripts)
+        assert list(snapshot.transcripts) == transcripts
+        assert snapshot.transcripts[-1] == transcripts[-1]
+        assert snapshot.transcripts[2:5] == transcripts[2:5]
+        assert snapshot.get_metadata(30)["time_of_interaction"] == "2024-01-01"
+        assert snapshot.turn_table.to_dicts() == preprocess_transcripts(transcripts)
+
+        build_snapshot(dataset_path)  # Rebuilding replaces the directory in place
+        assert list(open_snapshot(dataset_path).transcripts) == transcripts
+        assert [p.name for p in Path(tmp).iterdir() if p.name.endswith((".tmp", ".old"))] == []
+
+
+def test_stale_snapshot_falls_back_to_json():
+    """Editing the JSON after a build makes the snapshot stale; the JSON is read instead"""
+    transcripts = sample_transcripts()
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = write_dataset(tmp, transcripts)
+        build_snapshot(dataset_path)
+        assert open_snapshot(dataset_path) is not None
+
+        edited = transcripts[:-1] + [dict(transcripts[-1], intent="Complaint")]
+        write_dataset(tmp, edited)
+        stat = os.stat(dataset_path)
+        os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert open_snapshot(dataset_path) is None
+
+        store = open_transcript_store(dataset_path, open_snapshot(dataset_path))
+        assert isinstance(store, JsonTranscriptStore)
+        assert store["T-EMPTY"]["intent"] == "Complaint"
+
+
+def test_store_lookups():
+    """JSON offset and snapshot stores return the same transcripts, by any id"""
+    transcripts = sample_transcripts()
+    with tempfile.TemporaryDirectory() as tmp:
+        for ensure_ascii in (True, False):  # \u-escaped and raw UTF-8 ids
+            dataset_path = write_dataset(tmp, transcripts, ensure_ascii=ensure_ascii)
+            Path(tmp, "transcripts.offsets.json").unlink(missing_ok=True)
+            build_snapshot(dataset_path)
+            stores = [JsonTranscriptStore(dataset_path, cache_size=4),
+                      JsonTranscriptStore(dataset_path, cache_size=4),  # Reuses the saved index
+                      open_transcript_store(dataset_path, open_snapshot(dataset_path), cache_size=4)]
+            assert isinstance(stores[-1], SnapshotTranscriptStore)
+
+            for store in stores:
+                assert len(store) == len(transcripts)
+                for transcript in transcripts:
+                    assert transcript["transcript_id"] in store
+                    assert store.get(transcript["transcript_id"]) == transcript
+                assert store["T-ÜNICODE-例"]["conversation"][0]["sentiment"] == -0.8
+                assert "NOPE" not in store and store.get("NOPE") is None
+                try:
+                    store["NOPE"]
+                except KeyError:
+                    pass
+                else:
+                    raise AssertionError("missing id did not raise KeyError")
+
+                info = store.cache_info()
+                assert info["size"] == 4 and info["misses"] >= len(transcripts)
+                store.get("T-EMPTY")
+                assert store.cache_info()["hits"] == info["hits"] + 1
+
+
+TESTS = [
+    ("Snapshot round trip", test_snapshot_round_trip),
+    ("Stale snapshot", test_stale_snapshot_falls_back_to_json),
+    ("Store lookups", test_store_lookups),
+]
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("SNAPSHOT AND TRANSCRIPT STORE TESTS")
+    print("="*70)
+
+    results = []
+    for name, test_func in TESTS:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar turn table
+TurnTable rows must behave like the list-of-dicts turns of preprocess_transcripts
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.causal_chains import CausalChainDetector
+from src.causal_query_engine import CausalQueryEngine
+from src.preprocess import preprocess_transcripts
+from src.turn_table import TurnTable
+from test_chain_stats import make_transcripts
+
+
+def sample_transcripts():
+    """Synthetic transcripts plus edge cases: non-ASCII text, no turns, a repeated id"""
+    transcripts = make_transcripts(60)
+    transcripts.append({
+        "transcript_id": "T-ÜNICODE", "domain": "Billing", "intent": "Complaint",
+        "reason_for_call": "billing error",
+        "conversation": [{"speaker": "Customer", "text": "Ça ne marche pas — I am so frustrated 😠"},
+                         {"speaker": "Agent", "text": "please hold one moment"}],
+    })
+    transcripts.append({"transcript_id": "T-EMPTY", "intent": "Inquiry", "conversation": []})
+    transcripts.append(dict(transcripts[3], conversation=transcripts[3]["conversation"][:2]))
+    return transcripts
+
+
+def test_columnar_preprocess_matches_dicts():
+    """preprocess_transcripts(columnar=True) holds exactly the dict turns"""
+    transcripts = sample_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    table = preprocess_transcripts(transcripts, columnar=True)
+
+    assert isinstance(table, TurnTable) and len(table) == len(turns)
+    assert table.to_dicts() == turns
+    for index in (0, len(turns) // 2, -1):
+        assert dict(table[index]) == turns[index]
+    assert [dict(row) for row in table[5:9]] == turns[5:9]
+    assert [dict(row) for row in table.transcript_rows("T-ÜNICODE")] == \
+        [turn for turn in turns if turn["transcript_id"] == "T-ÜNICODE"]
+    assert table.transcript_rows("T-EMPTY") == [] and table.transcript_rows("NOPE") == []
+
+
+def test_row_writes_persist():
+    """Keys written on a TurnRow are seen by every later view of the row"""
+    table = preprocess_transcripts(make_transcripts(10), columnar=True)
+
+    table[3]["risk"] = 0.75
+    table[3]["speaker"] = "Supervisor"  # Overrides the column for this row only
+    row = table[3]
+    assert row["risk"] == 0.75 and row["speaker"] == "Supervisor"
+    assert "risk" in row and len(row) == len(dict(row)) == len(table[4]) + 1
+    assert list(table)[3]["risk"] == 0.75
+    assert table.to_dicts()[3]["risk"] == 0.75
+    assert "risk" not in table[4] and table[4]["speaker"] in ("Customer", "Agent")
+
+    del table[3]["risk"]
+    del table[3]["speaker"]
+    assert "risk" not in table[3] and table[3]["speaker"] in ("Customer", "Agent")
+    assert not table.row_extras
+    try:
+        del table[3]["risk"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("deleting a missing key did not raise KeyError")
+
+
+def test_query_engine_reads_table_rows_lazily():
+    """The query engine indexes a TurnTable by transcript and explains as with dicts"""
+    transcripts = sample_transcripts()
+    turns = preprocess_transcripts(transcripts)
+    table = preprocess_transcripts(transcripts, columnar=True)
+    detector = CausalChainDetector()
+    detector.compute_chain_statistics(transcripts, turns, min_evidence=2)
+    by_id = {t["transcript_id"]: t for t in transcripts}
+
+    from_dicts = CausalQueryEngine(detector, by_id, turns)
+    from_table = CausalQueryEngine(detector, by_id, table)
+    assert all(isinstance(entry[0], int) for entry in from_table.turn_index.values())
+    for transcript_id in list(by_id)[:20] + ["T-ÜNICODE", "T-EMPTY", "T000003", "NOPE"]:
+        expected = [dict(turn) for turn in from_dicts._transcript_turns(transcript_id)]
+        assert [dict(turn) for turn in from_table._transcript_turns(transcript_id)] == expected
+        a = from_dicts.explain_escalation(transcript_id)
+        b = from_table.explain_escalation(transcript_id)
+        assert (a is None) == (b is None), transcript_id
+        if a is not None:
+            assert a.causal_chain == b.causal_chain
+            assert a.evidence_quotes == b.evidence_quotes and a.confidence == b.confidence
+
+
+TESTS = [
+    ("Columnar preprocess", test_columnar_preprocess_matches_dicts),
+    ("Row writes", test_row_writes_persist),
+    ("Lazy engine rows", test_query_engine_reads_table_rows_lazily),
+]
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print("TURN TABLE TESTS")
+    print("="*70)
+
+    results = []
+    for name, test_func in TESTS:
+        try:
+            test_func()
+            print(f"✅ {name}")
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {name}: {e!r}")
+            results.append(False)
+
+    print("="*70)
+    print(f"Results: {sum(results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -54,13 +54,22 @@ except ImportError as e:
 flask_env = os.getenv('FLASK_ENV', 'production')
 logger.info(f"Creating Flask app with environment: {flask_env}")
 
+# Shared-data mode: build everything here, in the gunicorn master
+# (preload_app), and let forked workers share it copy-on-write
+preload_data = os.getenv('PRELOAD_DATA', 'false').lower() == 'true'
+
 try:
-    app = create_app(flask_env)
+    app = create_app(flask_env, background_load=not preload_data)
     logger.info(f"Flask app created successfully (Debug: {app.debug})")
 except Exception as e:
     logger.error(f"Failed to create Flask app: {e}")
     sys.exit(1)
 
+if preload_data and __name__ != '__main__':
+    from api import preload_shared_data
+    logger.info("Preloading shared data before workers fork...")
+    preload_shared_data()
+
 # Verify app is properly configured
 if not app:
     logger.error("Flask app creation returned None")